@@ -0,0 +1,104 @@
+"""
+ssd.py 시작 비용(time-to-first-command) 측정.
+
+    python bench_startup.py [--runs N] [--budget-ms MS]
+
+빈 임시 데이터 디렉토리에서 아래를 각각 N 번 실행하고, 프로세스 시작부터 종료까지 걸린 시간의
+중앙값 / p90 을 ms 로 출력합니다.
+
+    interpreter : python -c pass (인터프리터 자체 시작 비용, 기준선)
+    import ssd  : ssd 모듈 import 까지
+    W (script)  : python ssd.py W (스크립트는 .pyc 를 쓰지 않아 매번 컴파일)
+    R / W / F   : SSDDriver 와 같이 python -m ssd 로 명령 하나
+    W (fork)    : ForkServerSSDDriver 와 같이 미리 import 해 둔 launcher 에서 fork (fork 가 있는 OS 만)
+
+명령의 중앙값에서 기준선을 뺀 값이 budget 을 넘으면 exit code 1 로 끝납니다.
+PYTHONDONTWRITEBYTECODE 는 지우고 한 번씩 먼저 실행해 .pyc 가 있는 상태로 잽니다.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import ssd_config as config
+
+SSD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ssd.py")
+BUDGET_CASES = ("W", "R", "F")
+DEFAULT_RUNS = 30
+DEFAULT_BUDGET_MS = 25.0
+
+
+def _time_process(args: list[str], env: dict, runs: int) -> list[float]:
+    subprocess.run(args, env=env, check=True)  # warm-up (.pyc 생성, 데이터 파일 생성)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def _time_forkserver(args: list[str], env: dict, runs: int) -> list[float]:
+    from ssd_forkserver import ForkServer
+
+    server = ForkServer(env, os.path.dirname(SSD_PATH))
+    try:
+        server.run(args)  # warm-up (launcher 의 preload 포함)
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            server.run(args)
+            samples.append((time.perf_counter() - start) * 1000)
+        return sorted(samples)
+    finally:
+        server.close()
+
+
+def _summary(samples: list[float]) -> tuple[float, float]:
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ssd.py 시작 비용 측정")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="명령 하나가 인터프리터 기준선보다 더 써도 되는 시간 (중앙값)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        config.DATA_DIR = data_dir
+        env = config.as_env()
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        env["PYTHONPATH"] = os.path.dirname(SSD_PATH)
+
+        cases = [
+            ("interpreter", [sys.executable, "-c", "pass"]),
+            ("import ssd", [sys.executable, "-c", "import ssd"]),
+            ("W (script)", [sys.executable, SSD_PATH, "W", "3", "0x00000003"]),
+            ("W", [sys.executable, "-m", "ssd", "W", "3", "0x00000003"]),
+            ("R", [sys.executable, "-m", "ssd", "R", "3"]),
+            ("F", [sys.executable, "-m", "ssd", "F"]),
+        ]
+
+        results = {name: _summary(_time_process(cmd, env, args.runs)) for name, cmd in cases}
+        if hasattr(os, 'fork'):
+            results["W (fork)"] = _summary(_time_forkserver(["W", "3", "0x00000003"], env, args.runs))
+
+    baseline = results["interpreter"][0]
+    print(f"{'case':<12} {'median':>8} {'p90':>8} {'over':>8}")
+    over_budget = []
+    for name, (median, p90) in results.items():
+        print(f"{name:<12} {median:8.2f} {p90:8.2f} {median - baseline:8.2f}")
+        if name in BUDGET_CASES and median - baseline > args.budget_ms:
+            over_budget.append(name)
+
+    print(f"budget: {args.budget_ms:.1f} ms over interpreter ({config.NAND_BACKEND} backend)")
+    if over_budget:
+        print(f"over budget: {' '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import zlib
+
+import ssd_config as config
+from file_handler import fsync_dir
+
+JOURNAL_FILE_NAME = "journal.log"
+
+
+class CommandJournal:
+    """
+    Command Buffer 용 append-only write-ahead log.
+
+    버퍼에 들어온 명령 하나당 레코드 한 줄을 덧붙입니다.
+
+        <op> <arg1> <arg2> <crc32>\\n      예) W 3 0x00000001 5f1d2a3b
+
+    crc32 가 맞지 않거나 줄이 잘린 레코드(쓰는 도중 종료)가 나오면
+    그 뒤는 버리고 앞부분까지만 복구합니다.
+    flush 로 버퍼가 비워지면 clear(), 레코드가 쌓이면 compact() 로 현재 버퍼만 남깁니다.
+
+    durability 가 'strict' 면 append 마다, 'flush' 면 clear/compact 때만 fsync 합니다.
+    compact 는 tmp 파일을 rename 하므로 버퍼 디렉토리도 fsync 합니다.
+
+    프로세스가 정상 종료하면 mark_clean() 으로 그때의 저널 size / mtime 을 <저널>.clean 에 남깁니다.
+    다음 시작 때 저널이 그대로면(clean_state()) 슬롯 파일 검사 같은 복구 작업을 건너뜁니다.
+    """
+
+    def __init__(self, dirname: str, filename: str = JOURNAL_FILE_NAME, durability: str = config.DURABILITY_NONE):
+        self._dirname = dirname
+        self._filename = os.path.join(dirname, filename)
+        self._record_count = 0
+        self._fsync_append = durability == config.DURABILITY_STRICT
+        self._fsync_rewrite = durability != config.DURABILITY_NONE
+        self._fsync_count = 0
+        self._clean_filename = self._filename + '.clean'
+
+    @property
+    def fsync_count(self) -> int:
+        return self._fsync_count
+
+    def _fsync(self, f):
+        f.flush()
+        os.fsync(f.fileno())
+        self._fsync_count += 1
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def record_count(self) -> int:
+        return self._record_count
+
+    @staticmethod
+    def encode(op: str, arg1, arg2) -> str:
+        payload = f"{op} {arg1} {arg2}"
+        return f"{payload} {zlib.crc32(payload.encode('utf-8')):08x}\n"
+
+    @staticmethod
+    def decode(line: str) -> tuple | None:
+        if not line.endswith('\n'):
+            return None
+        payload, _, crc = line[:-1].rpartition(' ')
+        try:
+            if int(crc, 16) != zlib.crc32(payload.encode('utf-8')):
+                return None
+        except ValueError:
+            return None
+        fields = payload.split(' ')
+        if len(fields) != 3:
+            return None
+        return tuple(fields)
+
+    def append(self, op: str, arg1, arg2):
+        with open(self._filename, 'a', encoding='utf-8', newline='') as f:
+            f.write(self.encode(op, arg1, arg2))
+            if self._fsync_append:
+                self._fsync(f)
+        self._record_count += 1
+
+    def replay(self) -> list[tuple]:
+        """저널의 유효한 레코드를 (op, arg1, arg2) 목록으로 돌려줍니다."""
+        records = []
+        try:
+            with open(self._filename, 'r', encoding='utf-8', newline='') as f:
+                for line in f:
+                    record = self.decode(line)
+                    if record is None:
+                        break  # 잘린/손상된 꼬리 레코드
+                    records.append(record)
+        except FileNotFoundError:
+            pass
+        self._record_count = len(records)
+        return records
+
+    def compact(self, records: list[tuple]):
+        """저널을 주어진 레코드만 담도록 원자적으로(tmp + rename) 다시 씁니다."""
+        os.makedirs(self._dirname, exist_ok=True)
+        tmp_filename = self._filename + '.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(self.encode(*record) for record in records)
+            if self._fsync_rewrite:
+                self._fsync(f)
+        os.replace(tmp_filename, self._filename)
+        if self._fsync_rewrite:
+            fsync_dir(self._dirname)  # rename 까지 디스크에 남아야 새 저널이 유지됨
+            self._fsync_count += 1
+        self._record_count = len(records)
+
+    def _stat(self) -> tuple[int, int]:
+        try:
+            stat = os.stat(self._filename)
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_size, stat.st_mtime_ns
+
+    def mark_clean(self, canonical: bool):
+        """
+        지금의 저널 상태를 clean-shutdown 표시로 남깁니다.
+        canonical 이면 저널 레코드가 버퍼 명령과 하나씩 같아서, 다시 정리하지 않고 그대로 버퍼에 올릴 수 있습니다.
+        """
+        size, mtime_ns = self._stat()
+        with open(self._clean_filename, 'w', encoding='utf-8') as f:
+            f.write(f"{size} {mtime_ns} {int(canonical)}\n")
+
+    def clean_state(self) -> bool | None:
+        """
+        마지막 mark_clean() 이후 저널이 바뀌지 않았으면 그때의 canonical 값, 아니면 None.
+        append 는 size 를, compact / clear 는 size 나 mtime 을 바꾸므로 종료 표시 뒤의 변경(비정상 종료 포함)은 모두 걸립니다.
+        """
+        try:
+            with open(self._clean_filename, 'r', encoding='utf-8') as f:
+                size, mtime_ns, canonical = (int(field) for field in f.read().split())
+        except (OSError, ValueError):
+            return None
+        if (size, mtime_ns) != self._stat():
+            return None
+        return bool(canonical)
+
+    def clear(self):
+        os.makedirs(self._dirname, exist_ok=True)
+        with open(self._filename, 'w') as f:
+            if self._fsync_rewrite:
+                self._fsync(f)
+        self._record_count = 0
@@ -10,13 +10,35 @@ class FileHandler(ABC):
     def read(self) -> str:
         pass
 
+def fsync_file(filename: str):
+    """이미 기록한 파일 내용을 디스크에 반영합니다."""
+    with open(filename, 'ab') as f:
+        os.fsync(f.fileno())
+
+
+def fsync_dir(dirname: str):
+    """rename 같은 디렉토리 항목 변경을 디스크에 반영합니다. 디렉토리를 열 수 없는 OS(Windows)에서는 생략합니다."""
+    try:
+        fd = os.open(dirname, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class SimpleFileHandler(FileHandler):
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, fsync: bool = False):
         self._filename = filename
+        self._fsync = fsync
 
     def write(self, data: str):
         with open(self._filename, 'w', encoding='utf-8') as f:
             f.write(data)
+            if self._fsync:
+                f.flush()
+                os.fsync(f.fileno())
 
     def read(self) -> str:
         with open(self._filename, 'r', encoding='utf-8') as f:
@@ -34,14 +56,100 @@ class FileDecorator(FileHandler):
         return self._wrapped_handler.read()
 
 class MultilineFileWriter(FileDecorator):
+    """
+    한 줄에 하나씩 값을 저장하는 파일 핸들러.
+
+    모든 줄이 '0xXXXXXXXX\n' 처럼 RECORD_SIZE 바이트로 고정돼 있으면
+    레코드 단위(seek + read/write)로 해당 줄만 접근합니다.
+    레이아웃이 깨진 파일은 기존처럼 전체 줄을 읽고/쓰는 방식으로 처리합니다.
+    """
+    RECORD_SIZE = 11  # '0x' + 8자리 hex + '\n'
+
     def write_lines(self, lines: list):
-        with open(self._wrapped_handler._filename, 'w', encoding='utf-8') as f:
+        # newline='' : 플랫폼과 무관하게 레코드 길이를 RECORD_SIZE로 유지
+        with open(self._wrapped_handler._filename, 'w', encoding='utf-8', newline='') as f:
             f.writelines(line + '\n' for line in lines)
 
+    def fill_lines(self, line: str, count: int, chunk_lines: int = 65536):
+        """같은 줄을 count 번 기록합니다. 큰 파일도 chunk 단위로 나눠 씁니다."""
+        chunk = (line + '\n') * chunk_lines
+        with open(self._wrapped_handler._filename, 'w', encoding='utf-8', newline='') as f:
+            for _ in range(count // chunk_lines):
+                f.write(chunk)
+            f.write((line + '\n') * (count % chunk_lines))
+
     def read_all_lines(self) -> list:
         with open(self._wrapped_handler._filename, 'r', encoding='utf-8') as f:
             lines = [line.rstrip('\n') for line in f.readlines()]
             return lines
 
     def read_specific_line(self, line_number: int) -> str:
-        return self.read_all_lines()[line_number].strip()
\ No newline at end of file
+        record = self.read_record(line_number)
+        if record is not None:
+            return record
+        return self.read_all_lines()[line_number].strip()
+
+    def read_record(self, index: int) -> str | None:
+        """index 번째 레코드만 읽습니다. 고정 길이 레이아웃이 아니면 None"""
+        if index < 0:
+            return None
+        with open(self._wrapped_handler._filename, 'rb') as f:
+            f.seek(index * self.RECORD_SIZE)
+            data = f.read(self.RECORD_SIZE)
+        if not self._is_record(data):
+            return None
+        return data[:-1].decode('utf-8')
+
+    def read_records(self, index: int, count: int) -> list | None:
+        """index 부터 count 개 레코드를 한 번에 읽습니다. 고정 길이 레이아웃이 아니면 None"""
+        if index < 0:
+            return None
+        with open(self._wrapped_handler._filename, 'rb') as f:
+            f.seek(index * self.RECORD_SIZE)
+            data = f.read(count * self.RECORD_SIZE)
+        records = [data[i:i + self.RECORD_SIZE] for i in range(0, len(data), self.RECORD_SIZE)]
+        if len(records) != count or not all(self._is_record(record) for record in records):
+            return None
+        return [record[:-1].decode('utf-8') for record in records]
+
+    def write_record(self, index: int, value: str):
+        self.write_records(index, [value])
+
+    def write_records(self, index: int, values: list):
+        """index 부터 연속된 레코드들을 한 번의 write로 덮어씁니다."""
+        if not values:
+            return
+        payload = ''.join(value + '\n' for value in values).encode('utf-8')
+        if index >= 0 and len(payload) == len(values) * self.RECORD_SIZE:
+            with open(self._wrapped_handler._filename, 'r+b') as f:
+                if self._is_aligned(f, index, len(values)):
+                    f.seek(index * self.RECORD_SIZE)
+                    f.write(payload)
+                    return
+
+        # 레이아웃이 깨진 파일: 전체를 다시 씁니다
+        lines = self.read_all_lines()
+        lines[index:index + len(values)] = values
+        self.write_lines(lines)
+
+    def _is_aligned(self, f, index: int, count: int) -> bool:
+        size = os.fstat(f.fileno()).st_size
+        end = (index + count) * self.RECORD_SIZE
+        if size % self.RECORD_SIZE != 0 or end > size:
+            return False
+
+        # 대상 구간의 앞/뒤 레코드 경계가 실제 줄 경계와 일치하는지 확인
+        start = index * self.RECORD_SIZE
+        f.seek(start - 1 if start else 0)
+        head = f.read(self.RECORD_SIZE + (1 if start else 0))
+        if start and head[:1] != b'\n':
+            return False
+        if not self._is_record(head[-self.RECORD_SIZE:]):
+            return False
+        f.seek(end - self.RECORD_SIZE)
+        return self._is_record(f.read(self.RECORD_SIZE))
+
+    def _is_record(self, data: bytes) -> bool:
+        return (len(data) == self.RECORD_SIZE
+                and data.endswith(b'\n')
+                and b'\n' not in data[:-1])
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+데몬 / in-process 모드에서 버퍼를 overflow 나 F 가 아닐 때도 비우는 flush 스케줄러.
+
+CommandInvoker 를 감싸지 않고 stats() 를 주기적으로(tick) 살펴서 아래 조건 중 하나가 맞으면 flush 합니다.
+
+    idle      : 마지막 명령 이후 idle_ms 동안 새 명령이 없음
+    age       : 버퍼가 비어 있지 않은 지(또는 마지막 flush 이후) max_age_ms 가 지남
+    read_miss : 최근 Read(MISS_WINDOW 개 이상) 중 NAND 로 간 비율이 miss_rate 이상
+                tick 마다 (reads, read_hits) 를 기록해 두고, 최근 MISS_WINDOW 개 이상 Read 를 덮는 가장 짧은 구간으로 셉니다
+
+다음 burst 가 오기 전의 빈 시간에 flush 해 두면 그 burst 의 명령이 flush 비용을 치르지 않습니다.
+시각은 ms 가 아니라 clock() 의 초 단위 값이며, 테스트에서는 clock 을 바꿔 끼우고 tick() 을 직접 부릅니다.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import ssd_config as config
+
+MISS_WINDOW = 32
+MISS_POLL_INTERVAL = 0.1  # read_miss 만 켜져 있을 때의 tick 주기 (초): 쉬는 데몬이 초당 수십 번 깨지 않도록
+
+
+class FlushScheduler:
+    def __init__(self, invoker, idle_ms: int = 0, max_age_ms: int = 0, miss_rate: float = 0.0,
+                 clock=time.monotonic, lock=None):
+        self._invoker = invoker
+        self._idle = idle_ms / 1000
+        self._max_age = max_age_ms / 1000
+        self._miss_rate = miss_rate
+        self._clock = clock
+        self._lock = lock or nullcontext()  # 명령 처리와 같은 lock 을 쓰면 flush 가 명령 사이에 끼지 않음
+        self._stop = threading.Event()
+        self._thread = None
+
+        now = clock()
+        self._activity = None     # 마지막으로 본 (writes, reads)
+        self._last_active = now
+        self._flushes = None      # 마지막으로 본 invoker flush 횟수
+        self._dirty_since = None  # 버퍼가 비어 있지 않게 된 시각
+        self._read_samples = deque([(0, 0)])  # tick 마다의 (reads, read_hits): 맨 앞이 miss 비율을 셀 구간의 시작
+        self.triggered = {'idle': 0, 'age': 0, 'read_miss': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._idle or self._max_age or self._miss_rate)
+
+    def tick(self) -> str | None:
+        """조건을 확인하고, flush 했으면 그 이유를 돌려줍니다."""
+        with self._lock:
+            reason = self._observe(self._invoker.stats())
+            if reason is None:
+                return None
+            self._invoker.flush()
+            self.triggered[reason] += 1
+            self._observe(self._invoker.stats())
+            return reason
+
+    def _observe(self, stats: dict) -> str | None:
+        now = self._clock()
+        activity = (stats['writes'], stats['reads'])
+        if activity != self._activity:
+            self._activity = activity
+            self._last_active = now
+        if self._flushes is not None and stats['flushes'] != self._flushes:
+            # flush 가 있었으면 나이와 miss 비율을 그 시점부터 다시 셈 (flush 전 Read 는 지금 버퍼와 무관)
+            self._dirty_since = None
+            self._read_samples = deque([(stats['reads'], stats['read_hits'])])
+        self._flushes = stats['flushes']
+        self._sample_reads(stats['reads'], stats['read_hits'])
+        if not stats['buffered']:
+            self._dirty_since = None
+            return None
+        if self._dirty_since is None:
+            self._dirty_since = now
+
+        if self._idle and now - self._last_active >= self._idle:
+            return 'idle'
+        if self._max_age and now - self._dirty_since >= self._max_age:
+            return 'age'
+        base_reads, base_hits = self._read_samples[0]
+        reads = stats['reads'] - base_reads
+        misses = reads - (stats['read_hits'] - base_hits)
+        if self._miss_rate and reads >= MISS_WINDOW and misses / reads >= self._miss_rate:
+            return 'read_miss'
+        return None
+
+    def _sample_reads(self, reads: int, read_hits: int) -> None:
+        """구간을 뒤로 밀어도 MISS_WINDOW 개 이상 Read 가 남는 동안 오래된 기록을 버립니다 (sliding window)."""
+        if self._read_samples[-1] != (reads, read_hits):
+            self._read_samples.append((reads, read_hits))
+        while len(self._read_samples) > 1 and reads - self._read_samples[1][0] >= MISS_WINDOW:
+            self._read_samples.popleft()
+
+    def start(self, interval: float = None) -> None:
+        """interval 초마다 tick() 하는 백그라운드 스레드를 시작합니다."""
+        if interval is None:
+            timers = [t for t in (self._idle, self._max_age) if t]
+            interval = min(timers) / 4 if timers else MISS_POLL_INTERVAL
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="ssd-flush-scheduler", daemon=True)
+        self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.tick()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def start_flush_scheduler(invoker, lock=None) -> FlushScheduler | None:
+    """설정(SSD_FLUSH_IDLE_MS / SSD_FLUSH_MAX_AGE_MS / SSD_FLUSH_MISS_RATE)에 조건이 있으면 스케줄러를 시작합니다."""
+    scheduler = FlushScheduler(invoker, config.FLUSH_IDLE_MS, config.FLUSH_MAX_AGE_MS, config.FLUSH_MISS_RATE,
+                               lock=lock)
+    if not scheduler.enabled:
+        return None
+    scheduler.start()
+    return scheduler
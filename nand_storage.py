@@ -0,0 +1,475 @@
+import mmap
+import os
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from file_handler import SimpleFileHandler, MultilineFileWriter, fsync_file
+
+BLANK_VALUE = 0x00000000
+MAX_VALUE = 0xFFFFFFFF
+ERASE_CHUNK = 1 << 16  # 큰 erase 도 이 LBA 수 단위로 나눠 써서 메모리를 LBA 수에 비례해 쓰지 않음
+
+
+class NandStorage(ABC):
+    """
+    SSD 가 사용하는 NAND 저장소 인터페이스.
+    값은 항상 정수(uint32)로 주고받고, hex 문자열은 read_hex()에서만 만듭니다.
+    """
+    # 텍스트 호환 백엔드만 MultilineFileWriter 를 가집니다
+    file_handler = None
+
+    def __init__(self, filename: str, size: int):
+        self._filename = filename
+        self._size = size
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def exists(self) -> bool:
+        return os.path.exists(self._filename)
+
+    @abstractmethod
+    def format(self):
+        """모든 LBA 를 BLANK 로 채운 새 이미지를 만듭니다."""
+        pass
+
+    @abstractmethod
+    def is_valid(self, full: bool = False) -> bool:
+        """
+        이미지가 올바른 포맷인지 확인합니다.
+        full=False 면 백엔드가 가진 캐시로 전체 검사를 생략할 수 있습니다.
+        """
+        pass
+
+    def is_known_valid(self) -> bool:
+        """
+        파일을 하나도 바꾸지 않고 확인할 수 있는 범위에서 이미지가 올바른지 봅니다.
+        확인할 수 없으면 False 이고, 호출자는 is_valid() 를 쓰는 일반 경로로 돌아갑니다.
+        """
+        return False
+
+    @abstractmethod
+    def read(self, lba: int) -> int:
+        pass
+
+    @abstractmethod
+    def write(self, lba: int, value: int):
+        pass
+
+    @abstractmethod
+    def erase(self, lba: int, size: int):
+        pass
+
+    @abstractmethod
+    def read_all(self) -> list[int]:
+        pass
+
+    def read_hex(self, lba: int) -> str:
+        return f"0x{self.read(lba):08X}"
+
+    def read_range(self, lba: int, count: int) -> list[int]:
+        """연속된 count 개 LBA 값을 한 번에 읽습니다. 백엔드는 순차 읽기 한 번으로 구현합니다."""
+        return [self.read(lba + offset) for offset in range(count)]
+
+    def write_range(self, lba: int, values: list[int]):
+        """연속된 LBA 에 값을 한 번에 씁니다. 백엔드는 순차 쓰기 한 번으로 구현합니다."""
+        for offset, value in enumerate(values):
+            self.write(lba + offset, value)
+
+    def write_runs(self, runs: list[tuple[int, list[int]]]):
+        """(시작 LBA, 값 목록) 구간들을 LBA 순서대로 씁니다. flush 가 버퍼 전체를 한 번에 반영할 때 씁니다."""
+        for lba, values in runs:
+            self.write_range(lba, values)
+
+    def sync(self):
+        """지금까지의 변경 내용을 디스크에 반영(fsync)합니다."""
+        if self.exists():
+            fsync_file(self._filename)
+
+    def checkpoint(self):
+        """flush 가 끝날 때 부릅니다. 백엔드가 메모리에 모아 둔 부가 정보(검증 캐시 등)를 파일에 남깁니다."""
+        pass
+
+    def close(self):
+        pass
+
+    def export_lines(self) -> list[str]:
+        return [f"0x{value:08X}" for value in self.read_all()]
+
+
+class ValidationCache:
+    """
+    마지막으로 검증/기록한 NAND 파일의 상태를 sidecar(JSON) 파일에 남깁니다.
+    size, mtime 이 그대로면 그 사이 외부에서 파일을 고치지 않았다고 보고
+    시작할 때 전체 검사를 생략합니다.
+
+        size / mtime_ns : 마지막 clean write 직후 NAND 파일의 stat
+        generation      : clean write 횟수
+        checksum        : 레코드별 crc32 의 XOR (write 마다 증분 갱신)
+
+    NAND 파일의 timestamp 는 건드리지 않으므로, 파일 시스템의 mtime 해상도 안에서 크기가 같게 고친
+    외부 수정은 구분하지 못합니다. 그런 경우는 전체 검사(SSD_FULL_VERIFY, verify_checksum)로 확인합니다.
+    """
+
+    def __init__(self, filename: str, target_filename: str):
+        self._filename = filename
+        self._target_filename = target_filename
+
+    @staticmethod
+    def record_checksum(lba: int, value: str) -> int:
+        return zlib.crc32(f"{lba}:{value}".encode('utf-8'))
+
+    def load(self) -> dict | None:
+        try:
+            with open(self._filename, 'r', encoding='utf-8') as f:
+                return self._parse(f.read())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _parse(text: str) -> dict:
+        # json 모듈은 import 만으로 수 ms 가 걸리므로(re 포함) save() 가 쓰는 {"키": 정수, ...} 는 직접 읽고,
+        # 그 밖의 형태일 때만 json 으로 읽습니다
+        try:
+            return {key.strip().strip('"'): int(value)
+                    for key, value in (item.split(':') for item in text.strip().strip('{}').split(','))}
+        except ValueError:
+            import json
+            return json.loads(text)
+
+    def load_clean(self) -> dict | None:
+        """NAND 파일의 stat 이 기록과 같으면 기록을 돌려줍니다 (다르거나 없으면 None)."""
+        meta = self.load()
+        if meta is None or file_stat(self._target_filename) != (meta.get('size'), meta.get('mtime_ns')):
+            return None
+        return meta
+
+    def is_clean(self) -> bool:
+        return self.load_clean() is not None
+
+    def save(self, stat: tuple[int, int], checksum: int, generation: int):
+        meta = {
+            'size': stat[0],
+            'mtime_ns': stat[1],
+            'generation': generation,
+            'checksum': checksum,
+        }
+        with open(self._filename, 'w', encoding='utf-8') as f:
+            f.write('{' + ', '.join(f'"{key}": {value}' for key, value in meta.items()) + '}')  # json.dump 와 같은 내용
+
+    def invalidate(self):
+        if os.path.exists(self._filename):
+            os.remove(self._filename)
+
+
+def file_stat(filename: str) -> tuple[int, int] | None:
+    """(size, mtime_ns), 파일이 없으면 None"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class TextNandStorage(NandStorage):
+    """
+    ssd_nand.txt 포맷('0xXXXXXXXX' 한 줄씩)을 유지하는 호환 백엔드.
+    format 이 모든 줄을 써야 하므로(LBA 개수에 비례) 작은 장치용이고, 큰 장치는 binary / mmap 을 씁니다
+    (ssd_config.TEXT_MAX_LBA_COUNT).
+    write 마다 바뀌는 검증 캐시 내용(stat, checksum, generation)은 메모리에만 두고,
+    .meta 파일은 flush(sync / checkpoint) 나 close 때 한 번 씁니다.
+    """
+
+    def __init__(self, filename: str, size: int):
+        super().__init__(filename, size)
+        self.file_handler = MultilineFileWriter(SimpleFileHandler(filename))
+        self._cache = ValidationCache(filename + '.meta', filename)
+        # 이 프로세스에서 검증(또는 format)을 통과한 뒤 외부 수정 없이 써 왔는지 여부
+        self._clean = False
+        self._stat = None        # 마지막으로 검증 / 기록한 직후 NAND 파일의 (size, mtime_ns)
+        self._checksum = 0
+        self._generation = 0
+        self._dirty = False      # .meta 에 아직 남기지 않은 clean write 가 있는지
+        self._invalidated = False
+
+    def _mark_clean(self, checksum: int, generation: int):
+        self._clean = True
+        self._invalidated = False
+        self._stat = file_stat(self._filename)
+        self._checksum = checksum
+        self._generation = generation
+
+    def format(self):
+        blank = f"0x{BLANK_VALUE:08X}"
+        self.file_handler.fill_lines(blank, self._size)
+        checksum = 0
+        for lba in range(self._size):
+            checksum ^= ValidationCache.record_checksum(lba, blank)
+        self._mark_clean(checksum, 0)
+        self._cache.save(self._stat, checksum, 0)
+        self._dirty = False
+
+    def is_valid(self, full: bool = False) -> bool:
+        meta = None if full else self._cache.load_clean()
+        if meta is not None:
+            self._mark_clean(meta['checksum'], meta['generation'])
+            return True
+        try:
+            lines = [line for line in self.file_handler.read_all_lines() if line.strip()]
+        except IOError:
+            return False
+        if len(lines) != self._size:
+            return False
+        if not all(is_valid_hex(line) for line in lines):
+            return False
+
+        meta = self._cache.load()
+        self._mark_clean(self._checksum_of(lines), meta['generation'] if meta else 0)
+        self._cache.save(self._stat, self._checksum, self._generation)
+        self._dirty = False
+        return True
+
+    def is_known_valid(self) -> bool:
+        # is_valid() 와 달리 전체 검사 후 .meta 를 다시 쓰지 않고 캐시만 봅니다
+        return self._cache.is_clean()
+
+    def verify_checksum(self) -> bool:
+        """파일 내용이 마지막 clean write 때의 checksum 과 같은지 전체를 읽어 확인합니다."""
+        meta = self._cache.load()
+        if meta is None:
+            return False
+        return self._checksum_of(self.file_handler.read_all_lines()) == meta['checksum']
+
+    def _checksum_of(self, lines: list) -> int:
+        checksum = 0
+        for lba, line in enumerate(lines):
+            checksum ^= ValidationCache.record_checksum(lba, line)
+        return checksum
+
+    def _write_records(self, lba: int, values: list):
+        self._write_record_runs([(lba, values)])
+
+    def _write_record_runs(self, runs: Iterable[tuple[int, list]]):
+        # 마지막 기록 이후 외부에서 파일이 바뀌었다면 증분 갱신으로 덮어쓰면 안 됩니다
+        self._clean = self._clean and file_stat(self._filename) == self._stat
+        delta = 0
+        for lba, values in runs:
+            old_values = self.file_handler.read_records(lba, len(values)) if self._clean else None
+            self.file_handler.write_records(lba, values)
+            if old_values is None:
+                # 검증되지 않았거나 레이아웃이 깨진 파일 → 다음 시작 때 전체 검사
+                self._clean = False
+                continue
+            for offset, (old, new) in enumerate(zip(old_values, values)):
+                delta ^= ValidationCache.record_checksum(lba + offset, old)
+                delta ^= ValidationCache.record_checksum(lba + offset, new)
+        if not self._clean:
+            if not self._invalidated:
+                self._cache.invalidate()  # clean 이 깨지면 .meta 는 한 번만 지움
+                self._invalidated = True
+            self._dirty = False
+            return
+        # 구간이 여러 개여도 검증 캐시는 한 번만 갱신 (.meta 는 checkpoint 때 씀)
+        self._mark_clean(self._checksum ^ delta, self._generation + 1)
+        self._dirty = True
+
+    def checkpoint(self):
+        if self._dirty:
+            self._cache.save(self._stat, self._checksum, self._generation)
+            self._dirty = False
+
+    def sync(self):
+        super().sync()
+        self.checkpoint()  # 파일 내용을 디스크에 반영한 뒤에 그 상태를 기록
+
+    def close(self):
+        self.checkpoint()
+
+    def read_hex(self, lba: int) -> str:
+        # 파일에 기록된 문자열을 그대로 돌려줍니다 (검증은 호출자 몫)
+        return self.file_handler.read_specific_line(lba)
+
+    def read(self, lba: int) -> int:
+        return int(self.read_hex(lba), 16)
+
+    def read_range(self, lba: int, count: int) -> list[int]:
+        records = self.file_handler.read_records(lba, count)
+        if records is None:  # 고정 길이 레코드가 아니면 줄 단위로
+            records = self.file_handler.read_all_lines()[lba:lba + count]
+        return [int(record, 16) for record in records]
+
+    def write(self, lba: int, value: int):
+        self._write_records(lba, [f"0x{value:08X}"])
+
+    def write_range(self, lba: int, values: list[int]):
+        self._write_records(lba, [f"0x{value:08X}" for value in values])
+
+    def write_runs(self, runs: list[tuple[int, list[int]]]):
+        self._write_record_runs([(lba, [f"0x{value:08X}" for value in values]) for lba, values in runs])
+
+    def erase(self, lba: int, size: int):
+        blank = f"0x{BLANK_VALUE:08X}"
+        self._write_record_runs((start, [blank] * min(ERASE_CHUNK, lba + size - start))
+                                for start in range(lba, lba + size, ERASE_CHUNK))
+
+    def read_all(self) -> list[int]:
+        return [int(line, 16) for line in self.file_handler.read_all_lines()]
+
+
+class BinaryNandStorage(NandStorage):
+    """LBA 하나를 little-endian uint32 로 저장하는 고정 크기 이미지 백엔드"""
+    VALUE_SIZE = 4
+    _FORMAT = struct.Struct('<I')
+
+    def format(self):
+        # truncate 로 크기만 잡으면 0 으로 채워진(=BLANK) 이미지가 됩니다
+        with open(self._filename, 'wb') as f:
+            f.truncate(self._size * self.VALUE_SIZE)
+
+    def is_valid(self, full: bool = False) -> bool:
+        # 모든 4 byte 값이 유효한 uint32 이므로 크기만 맞으면 됩니다
+        try:
+            return os.path.getsize(self._filename) == self._size * self.VALUE_SIZE
+        except OSError:
+            return False
+
+    def is_known_valid(self) -> bool:
+        return self.is_valid()
+
+    def read(self, lba: int) -> int:
+        with open(self._filename, 'rb') as f:
+            f.seek(lba * self.VALUE_SIZE)
+            return self._FORMAT.unpack(f.read(self.VALUE_SIZE))[0]
+
+    def read_range(self, lba: int, count: int) -> list[int]:
+        with open(self._filename, 'rb') as f:
+            f.seek(lba * self.VALUE_SIZE)
+            data = f.read(count * self.VALUE_SIZE)
+        return [value for (value,) in self._FORMAT.iter_unpack(data)]
+
+    def write(self, lba: int, value: int):
+        with open(self._filename, 'r+b') as f:
+            f.seek(lba * self.VALUE_SIZE)
+            f.write(self._FORMAT.pack(value))
+
+    def write_range(self, lba: int, values: list[int]):
+        with open(self._filename, 'r+b') as f:
+            f.seek(lba * self.VALUE_SIZE)
+            f.write(struct.pack(f'<{len(values)}I', *values))
+
+    def write_runs(self, runs: list[tuple[int, list[int]]]):
+        with open(self._filename, 'r+b') as f:  # 구간마다 파일을 다시 열지 않음
+            for lba, values in runs:
+                f.seek(lba * self.VALUE_SIZE)
+                f.write(struct.pack(f'<{len(values)}I', *values))
+
+    def erase(self, lba: int, size: int):
+        with open(self._filename, 'r+b') as f:
+            f.seek(lba * self.VALUE_SIZE)
+            for start in range(lba, lba + size, ERASE_CHUNK):
+                f.write(bytes(min(ERASE_CHUNK, lba + size - start) * self.VALUE_SIZE))
+
+    def read_all(self) -> list[int]:
+        with open(self._filename, 'rb') as f:
+            data = f.read(self._size * self.VALUE_SIZE)
+        return [value for (value,) in self._FORMAT.iter_unpack(data)]
+
+
+class MmapNandStorage(BinaryNandStorage):
+    """
+    BinaryNandStorage 와 같은 이미지를 공유 메모리 매핑(MAP_SHARED)으로 다루는 백엔드.
+    read/write/erase 는 매핑에 직접 접근하므로 시스템 콜이 없고,
+    sync() 에서만 msync 로 디스크에 반영합니다.
+    여러 ssd.py 프로세스가 같은 이미지를 동시에 매핑해도 변경 내용이 공유됩니다.
+    """
+
+    def __init__(self, filename: str, size: int):
+        super().__init__(filename, size)
+        self._map = None
+
+    def _mapping(self) -> mmap.mmap:
+        if self._map is None:
+            with open(self._filename, 'r+b') as f:
+                self._map = mmap.mmap(f.fileno(), self._size * self.VALUE_SIZE, access=mmap.ACCESS_WRITE)
+        return self._map
+
+    def exists(self) -> bool:
+        return self._map is not None or super().exists()
+
+    def format(self):
+        self.close()
+        super().format()
+
+    def read(self, lba: int) -> int:
+        return self._FORMAT.unpack_from(self._mapping(), lba * self.VALUE_SIZE)[0]
+
+    def read_range(self, lba: int, count: int) -> list[int]:
+        start = lba * self.VALUE_SIZE
+        with memoryview(self._mapping()) as view:
+            return [value for (value,) in self._FORMAT.iter_unpack(view[start:start + count * self.VALUE_SIZE])]
+
+    def write(self, lba: int, value: int):
+        self._FORMAT.pack_into(self._mapping(), lba * self.VALUE_SIZE, value)
+
+    def write_range(self, lba: int, values: list[int]):
+        struct.pack_into(f'<{len(values)}I', self._mapping(), lba * self.VALUE_SIZE, *values)
+
+    def write_runs(self, runs: list[tuple[int, list[int]]]):
+        for lba, values in runs:
+            self.write_range(lba, values)
+
+    def erase(self, lba: int, size: int):
+        mapping = self._mapping()
+        for start in range(lba, lba + size, ERASE_CHUNK):
+            offset = start * self.VALUE_SIZE
+            length = min(ERASE_CHUNK, lba + size - start) * self.VALUE_SIZE
+            mapping[offset:offset + length] = bytes(length)
+
+    def read_all(self) -> list[int]:
+        return [value for (value,) in self._FORMAT.iter_unpack(self._mapping())]
+
+    def sync(self):
+        if self._map is not None:
+            self._map.flush()  # msync
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+NAND_BACKENDS = {
+    'text': TextNandStorage,
+    'binary': BinaryNandStorage,
+    'mmap': MmapNandStorage,
+}
+
+
+def create_nand_storage(backend: str, filename: str, size: int) -> NandStorage:
+    try:
+        storage_cls = NAND_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown NAND backend: {backend}")
+    return storage_cls(filename, size)
+
+
+def export_text(storage: NandStorage, filename: str):
+    """어떤 백엔드든 ssd_nand.txt 와 같은 텍스트 포맷으로 내보냅니다."""
+    MultilineFileWriter(SimpleFileHandler(filename)).write_lines(storage.export_lines())
+
+
+def is_valid_hex(value: str) -> bool:
+    if not value.startswith(('0x', '0X')) or len(value) != 10:
+        return False
+    try:
+        int_value = int(value, 16)
+    except ValueError:
+        return False
+    return BLANK_VALUE <= int_value <= MAX_VALUE
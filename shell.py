@@ -1,10 +1,10 @@
 import shlex
-import subprocess
 import random
 import os
 import sys
 
-from ssd_driver import SSDDriver
+import ssd_config as config
+from ssd_driver import create_ssd_driver
 from logger import Logger
 from decorators import trace
 from utils import get_class_and_method_name
@@ -23,17 +23,17 @@ READ_ERROR = ERROR
 
 ERASE_SUCCESS = SUCCESS
 ERASE_ERROR = ERROR
-MAX_ERASE_SIZE = 10
 
 
 class TestShellApp:
     def __init__(self, ssd_driver=None):
         if ssd_driver == None:
-            ssd_driver = SSDDriver()
+            ssd_driver = create_ssd_driver()
 
         self._ssd_driver = ssd_driver
         self._ssd_output_cache = None
         self._is_runner = False
+        self._driver_closed = False
 
     @trace(logger)
     def read(self, address: str):
@@ -52,9 +52,14 @@ class TestShellApp:
 
     @trace(logger)
     def full_read(self):
-        for address in range(0, 100):
-            if self.read(address=str(address)) == READ_ERROR:
-                return READ_ERROR
+        values = self._ssd_driver.run_ssd_range_read(start="0", count=str(config.LBA_COUNT))
+        if values is None or len(values) != config.LBA_COUNT:
+            logger.print(get_class_and_method_name(), "read error while run_ssd_range_read.")
+            return READ_ERROR
+        for address, value in enumerate(values):
+            self._ssd_output_cache = value
+            if not self._is_runner:
+                print(f'[Read] LBA {str(address).zfill(2)} : {value}')
         return READ_SUCCESS
 
     @trace(logger)
@@ -72,9 +77,10 @@ class TestShellApp:
         if formatted_value == None:
             return WRITE_ERROR
 
-        for address in range(0, 100):
-            if self._ssd_driver.run_ssd_write(address=str(address), value=formatted_value) == WRITE_ERROR:
-                return WRITE_ERROR
+        status = self._ssd_driver.run_ssd_fill(start="0", count=str(config.LBA_COUNT),
+                                               pattern="const", arg=formatted_value)
+        if status == WRITE_ERROR:
+            return WRITE_ERROR
         return WRITE_SUCCESS
 
     @trace(logger)
@@ -94,7 +100,7 @@ class TestShellApp:
         low, high = sorted((int(start_lba), int(end_lba)))
 
         low = max(0, low)
-        high = min(99, high)
+        high = min(config.LBA_COUNT - 1, high)
 
         # Erase size 계산
         size = high - low + 1
@@ -103,24 +109,27 @@ class TestShellApp:
         status = self._erase_in_chunks(start_lba=low, size=size)
         return status
 
-    @trace(logger)
-    def _erase_chunk(self, start_lba: int, size: int):
-        status = self._ssd_driver.run_ssd_erase(address=str(start_lba), lba_size=str(size))
-        # end = start + size - 1
-        # print(f'[Erase] LBA {start:02d} ~ {end:02d}')
-        return status
-
     @trace(logger)
     def _erase_in_chunks(self, start_lba: int, size: int):
-        """MAX_ERASE_SIZE 단위로 잘라서 _erase_chunk 호출."""
-        for offset in range(0, size, MAX_ERASE_SIZE):
-            chunk_size = min(MAX_ERASE_SIZE, size - offset)
-            chunk_start = start_lba + offset
-            status = self._erase_chunk(chunk_start, chunk_size)
-            if status == ERROR:
-                return ERASE_ERROR
+        """config.MAX_ERASE_SIZE 단위로 잘라서 한 번의 batch 로 erase (0 이면 명령 하나)."""
+        if self._ssd_driver.run_ssd_batch(self._erase_commands(start_lba, size)) == ERROR:
+            return ERASE_ERROR
         return ERASE_SUCCESS
 
+    def _erase_commands(self, start_lba: int, size: int) -> list:
+        max_erase_size = config.MAX_ERASE_SIZE or max(size, 1)  # 0 이면 제한 없음
+        return [['E', start_lba + offset, min(max_erase_size, size - offset)]
+                for offset in range(0, size, max_erase_size)]
+
+    @trace(logger)
+    def _run_batch_and_compare(self, commands: list, expected_values: list):
+        """commands 를 한 번에 수행하고 R 결과가 expected_values 와 같은지 확인."""
+        if self._ssd_driver.run_ssd_batch(commands) == ERROR:
+            return ERROR
+        if self._ssd_driver.get_ssd_outputs() != expected_values:
+            return ERROR
+        return SUCCESS
+
     @trace(logger)
     def _read_and_compare(self, address: str, written_value: str):
         read_status = self.read(address)
@@ -135,11 +144,11 @@ class TestShellApp:
 
     @trace(logger)
     def full_write_and_read_compare(self):
-        for block in range(0, 100, 5):
+        for block in range(0, config.LBA_COUNT, 5):
             write_value = "0x12345678"
-            for address in range(block, block + 5):
+            for address in range(block, min(block + 5, config.LBA_COUNT)):
                 self.write(str(address), write_value)
-            for address in range(block, block + 5):
+            for address in range(block, min(block + 5, config.LBA_COUNT)):
                 if self._read_and_compare(str(address), write_value) == False:
                     return ERROR
         return SUCCESS
@@ -159,38 +168,37 @@ class TestShellApp:
 
     @trace(logger)
     def write_read_aging(self):
+        last_lba = config.LBA_COUNT - 1
+        commands, expected_values = [], []
         for iter in range(200):
             value = random.randint(0, 0xFFFFFFFF)
             write_value = f"0x{value:08X}"
-            self.write("0", write_value)
-            self.write("99", write_value)
-
-            if self._read_and_compare("0", write_value) == False:
-                return ERROR
-            if self._read_and_compare("99", write_value) == False:
-                return ERROR
-        return SUCCESS
+            commands += [['W', 0, write_value], ['W', last_lba, write_value], ['R', 0], ['R', last_lba]]
+            expected_values += [write_value, write_value]
+        return self._run_batch_and_compare(commands, expected_values)
+
+    def _erase_write_commands(self):
+        commands = self._erase_commands(0, 3)
+        expected_values = []
+        for x in range(2, config.LBA_COUNT - 3, 2):
+            commands += [['W', x, "0x12345678"], ['W', x, "0xAABBCCDD"]]
+            commands += self._erase_commands(x, 3)
+            commands += [['R', x + i] for i in range(3)]
+            expected_values += ["0x00000000"] * 3
+        return commands, expected_values
 
     @trace(logger)
     def erase_write_test(self):
-        self.erase_range("0", "2")
-        for x in range(2, 97, 2):
-            self.write(str(x), "0x12345678")
-            self.write(str(x), "0xaabbccdd")
-
-            self.erase(str(x), "3")
-
-            for i in range(3):
-                if not self._read_and_compare(str(x + i), "0x00000000"):
-                    return ERROR
+        return self._run_batch_and_compare(*self._erase_write_commands())
 
     @trace(logger)
     def erase_write_aging(self):
+        commands, expected_values = [], []
         for iter in range(30):
-            ret = self.erase_write_test()
-            if ret == ERROR:
-                return ERROR
-        return SUCCESS
+            iter_commands, iter_expected_values = self._erase_write_commands()
+            commands += iter_commands
+            expected_values += iter_expected_values
+        return self._run_batch_and_compare(commands, expected_values)
 
     @trace(logger)
     def flush(self):
@@ -199,8 +207,16 @@ class TestShellApp:
 
     @trace(logger)
     def exit(self):
+        self.close()
         raise SystemExit(0)
 
+    def close(self):
+        # 상주 자식 프로세스 / 데몬 연결 / 백그라운드 flush 를 가진 드라이버는 끝낼 때 정리 (한 번만)
+        close = getattr(self._ssd_driver, 'close', None)
+        if close is not None and not self._driver_closed:
+            self._driver_closed = True
+            close()
+
     @trace(logger)
     def help(self):
         print("\n".join(checker.COMMAND_DESCRIPTION))
@@ -208,11 +224,14 @@ class TestShellApp:
 
     @trace(logger)
     def run(self):
-        if len(sys.argv) > 1:
-            script_file = sys.argv[1]
-            self.run_runner(script_file)
-        else:
-            self.run_shell()
+        try:
+            if len(sys.argv) > 1:
+                script_file = sys.argv[1]
+                self.run_runner(script_file)
+            else:
+                self.run_shell()
+        finally:
+            self.close()
         return
 
     @trace(logger)
@@ -305,7 +324,7 @@ class TestShellApp:
     def range_resize(self, address: str, lba_size: str):
         start, size = int(address), int(lba_size)
         if size > 0:
-            max_blocks = 100 - start
+            max_blocks = config.LBA_COUNT - start
             block_count = min(size, max_blocks)
             erase_start = start
 
@@ -1,6 +1,7 @@
 import shlex
 import subprocess
 
+import ssd_config as config
 from logger import Logger
 from decorators import trace
 from utils import get_class_and_method_name
@@ -80,11 +81,11 @@ def is_valid_address(address: str):
         logger.print(get_class_and_method_name(), "정수형으로 변환할 수 없는 경우 (예: '0.5')")
         return False  # 정수형으로 변환할 수 없는 경우 (예: "0.5")
 
-    if 0 <= address_int <= 99:
+    if 0 <= address_int < config.LBA_COUNT:
         return True
     else:
-        logger.print(get_class_and_method_name(), "유효한 범위(0~99)를 벗어난 경우")
-        return False  # 유효한 범위(0~99)를 벗어난 경우
+        logger.print(get_class_and_method_name(), f"유효한 범위(0~{config.LBA_COUNT - 1})를 벗어난 경우")
+        return False  # 유효한 범위(0~LBA_COUNT-1)를 벗어난 경우
 
 
 def is_valid_size(lba_size):
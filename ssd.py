@@ -1,24 +1,43 @@
-import glob
 import os
+import struct
 import sys
-from pathlib import Path
-import re
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
 
 from abc import ABC, abstractmethod
-from file_handler import SimpleFileHandler, MultilineFileWriter
-
-# ssd.py 파일이 있는 디렉토리 내 (프로젝트 루트) 절대 경로
-_PROJECT_ROOT = Path(__file__).resolve().parent
-BUFFER_DIR = str(_PROJECT_ROOT / "buffer")  # ← 여기만 변경
-OUTPUT_FILE = str(_PROJECT_ROOT / "ssd_output.txt")
-TARGET_FILE = str(_PROJECT_ROOT / "ssd_nand.txt")
+import ssd_config as config
+from command_journal import CommandJournal
+from file_handler import SimpleFileHandler
+from nand_storage import NandStorage, create_nand_storage, export_text, is_valid_hex
+
+# 데이터 디렉토리 (기본: ssd.py 파일이 있는 프로젝트 루트) 절대 경로
+# 명령마다 새 프로세스가 뜨므로 시작 비용이 큰 모듈(pathlib, threading, random, heapq)은 쓰는 곳에서 import 합니다
+_PROJECT_ROOT = os.path.realpath(config.DATA_DIR)
+BUFFER_DIR = os.path.join(_PROJECT_ROOT, "buffer")  # ← 여기만 변경
+OUTPUT_FILE = os.path.join(_PROJECT_ROOT, "ssd_output.txt")
+TARGET_FILE = os.path.join(_PROJECT_ROOT, "ssd_nand.txt")
+TARGET_IMAGE_FILE = os.path.join(_PROJECT_ROOT, "ssd_nand.bin")
+
+# NAND 저장 백엔드: 'text'(ssd_nand.txt 호환) / 'binary'(ssd_nand.bin) / 'mmap'(ssd_nand.bin 매핑)
+NAND_BACKEND = config.NAND_BACKEND
+NAND_FILES = {
+    'text': TARGET_FILE,
+    'binary': TARGET_IMAGE_FILE,
+    'mmap': TARGET_IMAGE_FILE,
+}
 
 BLANK_STRING = "0x00000000"
 ERROR_STRING = 'ERROR'
-SSD_SIZE = 100
+SSD_SIZE = config.LBA_COUNT
 MIN_VALUE = 0x00000000
 MAX_VALUE = 0xFFFFFFFF
-MAX_COMMANDS = 5
+MAX_COMMANDS = config.BUFFER_DEPTH
+# erase 명령 한 번의 최대 크기, 0 이면 제한 없음(장치 전체를 명령 하나로 erase)
+MAX_ERASE_SIZE = config.MAX_ERASE_SIZE or SSD_SIZE
+# 저널 레코드가 이보다 많이 쌓이면 현재 버퍼 내용만 남도록 다시 씀
+MAX_JOURNAL_RECORDS = MAX_COMMANDS * 4
+# FILL 이 NAND 에 한 번에 쓰는 LBA 수 (메모리 사용량 제한)
+FILL_CHUNK_SIZE = 65536
 
 
 class SSD:
@@ -26,81 +45,57 @@ class SSD:
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
-            cls._instance = super().__new__(cls, *args, **kwargs)
+            cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, storage: NandStorage | None = None):
         if not hasattr(self, 'initialized'):
             self.initialized = True
-            self._target_file_handler = MultilineFileWriter(SimpleFileHandler(TARGET_FILE))
-            self._output_file_handler = SimpleFileHandler(OUTPUT_FILE)
+            if storage is None:
+                storage = create_nand_storage(NAND_BACKEND, NAND_FILES[NAND_BACKEND], SSD_SIZE)
+            self._storage = storage
+            # 텍스트 백엔드일 때만 ssd_nand.txt 핸들러가 존재합니다 (호환용)
+            self._target_file_handler = storage.file_handler
+            self._output_file_handler = SimpleFileHandler(
+                OUTPUT_FILE, fsync=config.DURABILITY == config.DURABILITY_STRICT)
+            self._pending = None  # begin_batch() ~ end_batch() 사이에 모아 두는 LBA -> 값 (Write)
+            self._pending_erases = None  # 같은 구간에 모아 두는 Erase (시작 LBA, 크기)
             self.init_target_file()
-            self.init_command_buffer()
+            # 버퍼 디렉토리는 CommandInvoker 가 한 번 살펴보고 없을 때만 만듭니다
 
     def init_command_buffer(self):
-        buffer_dir = BUFFER_DIR
-        os.makedirs(buffer_dir, exist_ok=True)  # 이미 있어도 에러 안 나게
-
-        # 2. 파일 생성
-        for i in range(1, 6):
-            # 해당 i로 시작하는 파일이 이미 존재하는지 확인
-            exists = any(
-                filename.startswith(f"{i}_")
-                for filename in os.listdir(buffer_dir)
-            )
-
-            if not exists:
-                file_path = os.path.join(buffer_dir, f"{i}_empty")
-                with open(file_path, "w") as f:
-                    f.write("")
+        # 버퍼 내용은 CommandInvoker 가 BUFFER_DIR 의 저널로 관리합니다
+        os.makedirs(BUFFER_DIR, exist_ok=True)  # 이미 있어도 에러 안 나게
 
     def init_target_file(self):
-        # SSD init시에 nand.txt파일이 올바른 포멧인지 확인합니다
-        if os.path.exists(TARGET_FILE) and self._target_validation():
+        # SSD init시에 NAND 이미지가 올바른 포멧인지 확인합니다
+        if self._storage.exists() and self._target_validation():
             return
-        # 파일이 없으면 100개의 BLANK VALUE 생성
-        self._target_file_handler.write_lines([BLANK_STRING for _ in range(SSD_SIZE)])
+        # 파일이 없으면 SSD_SIZE 개의 BLANK VALUE 생성
+        self._storage.format()
         return
 
     def read(self, address: int) -> int:
         if not self._check_lda_validation(address):
             return 1
 
-        read_value = self._target_file_handler.read_specific_line(address)
+        read_value = self._storage.read_hex(address)
         if not self._value_validation(read_value):
             return 1
         self._output_file_handler.write(read_value)
         return 0
 
-    def _target_validation(self, filename=TARGET_FILE) -> bool:
-        try:
-            with open(filename, 'r') as f:
-                lines = f.readlines()
-
-                # 모든 라인에서 개행 문자를 제거한 후 유효한 라인만 필터링합니다.
-                sanitized_lines = [line.rstrip('\n') for line in lines if line.strip()]
-
-                # 개행 문자를 제거한 라인 수가 SSD_SIZE와 일치하는지 확인합니다.
-                if len(sanitized_lines) != SSD_SIZE:
-                    return False
+    def _target_validation(self, full: bool = None) -> bool:
+        if full is None:
+            full = config.FULL_VERIFY
+        return self._storage.is_valid(full=full)
 
-                for line in sanitized_lines:
-                    if not self._value_validation(line):
-                        return False
-        except IOError:
-            return False
-        return True
+    def verify(self) -> bool:
+        """검증 캐시를 무시하고 NAND 전체를 검사합니다."""
+        return self._target_validation(full=True)
 
     def _value_validation(self, read_value):
-        if not read_value.startswith(('0x', '0X')) or len(read_value) != 10:
-            self._output_file_handler.write(ERROR_STRING)
-            return False
-        try:
-            read_value_hex = int(read_value, 16)
-        except ValueError:
-            self._output_file_handler.write(ERROR_STRING)
-            return False
-        if read_value_hex < MIN_VALUE or read_value_hex > MAX_VALUE:
+        if not is_valid_hex(read_value):
             self._output_file_handler.write(ERROR_STRING)
             return False
         return True
@@ -114,16 +109,19 @@ class SSD:
             return False
         return True
 
-    def write(self, address: int, value: str) -> None:
+    def write(self, address: int, value: str | int) -> None:
         if not isinstance(address, int) or not (0 <= address < SSD_SIZE):
             self._output_file_handler.write(ERROR_STRING)
             return
-        lines = self._target_file_handler.read_all_lines()
-        lines[address] = value  # 실제 업데이트 추가
-        self._target_file_handler.write_lines(lines)
+        if isinstance(value, str):
+            value = int(value, 16)
+        if self._pending is not None:
+            self._pending[address] = value
+            return
+        self._storage.write(address, value)  # 해당 LBA 만 갱신
 
     def erase(self, address: int, size: int) -> None:  # erase 메서드 추가 (old 기반)
-        if not isinstance(address, int) or not isinstance(size, int) or size > 10:
+        if not isinstance(address, int) or not isinstance(size, int) or size > MAX_ERASE_SIZE:
             self._output_file_handler.write(ERROR_STRING)
             return
 
@@ -134,277 +132,649 @@ class SSD:
         if size == 0:
             return
 
-        lines = self._target_file_handler.read_all_lines()
-        for i in range(address, address + size):
-            lines[i] = BLANK_STRING
-        self._target_file_handler.write_lines(lines)
+        if self._pending is not None:
+            # Erase 는 구간 그대로 모으고, 앞서 모은 Write 중 지워질 LBA 만 버림 (LBA 마다 항목을 만들지 않음)
+            end = address + size
+            if len(self._pending) < size:
+                for lba in [lba for lba in self._pending if address <= lba < end]:
+                    del self._pending[lba]
+            else:
+                for lba in range(address, end):
+                    self._pending.pop(lba, None)
+            self._pending_erases.append((address, size))
+            return
+        self._storage.erase(address, size)
 
-    def _read_from_nand(self, lba: int) -> str:
-        if not os.path.exists(TARGET_FILE):
-            self._initialize_nand()
+    def begin_batch(self) -> None:
+        """이후 write / erase 를 NAND 에 바로 쓰지 않고 메모리에 모읍니다 (같은 LBA 는 마지막 값만 남음)."""
+        if self._pending is None:
+            self._pending = {}
+            self._pending_erases = []
 
-        with open(TARGET_FILE, 'r') as f:
-            lines = f.readlines()
+    def end_batch(self) -> None:
+        """
+        모은 Erase 구간을 합쳐 먼저 지우고, Write 는 LBA 순으로 정렬해 연속 구간마다 한 번씩 씁니다.
+        Erase 보다 앞선 Write 는 erase() 에서 이미 버렸으므로, 남은 Write 는 모두 Erase 뒤에 써도 됩니다.
+        """
+        pending, self._pending = self._pending, None
+        erases, self._pending_erases = self._pending_erases, None
+        for address, size in _merge_erases(erases or []):
+            self._storage.erase(address, size)
+        if pending:
+            self._storage.write_runs(_coalesce_runs(pending))
+
+    def write_range(self, address: int, values: list[int]) -> None:
+        if not isinstance(address, int) or not (0 <= address and address + len(values) <= SSD_SIZE):
+            self._output_file_handler.write(ERROR_STRING)
+            return
+        self._storage.write_range(address, values)
 
-        if len(lines) < SSD_SIZE:
-            lines += [BLANK_STRING + '\n'] * (SSD_SIZE - len(lines))
+    def _read_from_nand(self, lba: int) -> str:
+        if not self._storage.exists():
+            self._initialize_nand()
 
         if 0 <= lba < SSD_SIZE:
-            value = lines[lba].strip()
-            if re.match(r'^0x[0-9A-F]{8}$', value):
-                return value
+            try:
+                return f"0x{self._storage.read(lba):08X}"
+            except (ValueError, IndexError, struct.error):
+                pass
         return BLANK_STRING
 
+    def _read_range_from_nand(self, lba: int, count: int) -> list[str]:
+        if not self._storage.exists():
+            self._initialize_nand()
+
+        try:
+            values = self._storage.read_range(lba, count)
+            if len(values) == count:
+                return [f"0x{value:08X}" for value in values]
+        except (ValueError, IndexError, struct.error):
+            pass
+        # 손상된 레코드가 섞여 있으면 LBA 단위 규칙(_read_from_nand)을 따름
+        return [self._read_from_nand(lba + offset) for offset in range(count)]
+
     def _initialize_nand(self):
-        with open(TARGET_FILE, 'w') as f:
-            for _ in range(SSD_SIZE):
-                f.write(BLANK_STRING + '\n')
+        self._storage.format()
+
+    def sync(self):
+        """flush 시점에만 NAND 변경 내용을 영구 반영합니다 (mmap 백엔드는 msync)."""
+        self._storage.sync()
+
+    def checkpoint(self):
+        """fsync 없이, 백엔드가 메모리에 모아 둔 검증 캐시만 파일에 남깁니다."""
+        self._storage.checkpoint()
+
+    def export(self, filename: str):
+        """현재 NAND 내용을 ssd_nand.txt 포맷으로 내보냅니다."""
+        export_text(self._storage, filename)
+
+
+def _merge_erases(erases: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """(시작 LBA, 크기) Erase 목록에서 겹치거나 맞닿은 구간을 합쳐 시작 LBA 순으로 돌려줍니다."""
+    merged: list[list[int]] = []
+    for start, size in sorted(erases):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], start + size)
+        else:
+            merged.append([start, start + size])
+    return [(start, end - start) for start, end in merged]
+
+
+def _coalesce_runs(values: dict[int, int]) -> list[tuple[int, list[int]]]:
+    """LBA -> 값 dict 를 (시작 LBA, 연속된 값 목록) 구간 목록으로 묶습니다."""
+    runs: list[tuple[int, list[int]]] = []
+    for lba in sorted(values):
+        if runs and runs[-1][0] + len(runs[-1][1]) == lba:
+            runs[-1][1].append(values[lba])
+        else:
+            runs.append((lba, [values[lba]]))
+    return runs
 
 
 class Command(ABC):
+    """
+    버퍼에 쌓이는 명령. 깊은 버퍼 / batch 모드에서 명령이 많이 만들어지므로
+    __slots__ 와 정수 필드만 쓰고, 생성자에서는 파일을 건드리지 않습니다 (저널 기록은 Invoker 몫).
+    seq / last_access 는 CommandBuffer 가 채웁니다.
+    """
+    __slots__ = ('ssd', 'address', 'seq', 'last_access')
+
     @abstractmethod
     def execute(self):
         pass
 
-    def set_path(self, file_path: str):
-        self.path = file_path
-
-    def rename_buffer(self, buffer_num, cmd, address, size):
-        path = f'{buffer_num}_{cmd}_{address}_{size}'
-        self.set_path(path)
-        for filename in os.listdir(BUFFER_DIR):
-            if filename.startswith(f'{buffer_num}'):
-                old_path = os.path.join(BUFFER_DIR, filename)
-                new_path = os.path.join(BUFFER_DIR, path)
-                os.rename(old_path, new_path)
-                # print(f"Renamed {filename} -> {}2_string")
-                break  # ✅ 하나만 처리하고 끝냄
+    @abstractmethod
+    def to_record(self) -> tuple:
+        """저널에 기록할 (op, arg1, arg2) 레코드"""
+        pass
 
 
 class ReadCommand(Command):
+    __slots__ = ()
+
     def __init__(self, ssd: SSD, address: int):
         self.ssd = ssd
-        self._address = address
+        self.address = address
 
     def execute(self):
         self.ssd.read(self.address)
 
-    @property
-    def address(self):
-        return self._address
-
-    @address.setter
-    def address(self, address):
-        self._address = address
+    def to_record(self) -> tuple:
+        # Read 는 버퍼에 쌓이지 않으므로 저널에 남지 않음 (레코드 형식만 맞춤)
+        return 'R', self.address, '-'
 
 
 class WriteCommand(Command):
-    def __init__(self, ssd: SSD, address: int, value: str, buffer_num: int):
+    # data: 쓸 값(정수), lowercase: 받은 hex 가 소문자였는지 (출력할 때 같은 표기로 돌려줌)
+    __slots__ = ('data', 'lowercase')
+
+    def __init__(self, ssd: SSD, address: int, value: str | int):
         self.ssd = ssd
-        self._address = address
-        self._value = value
-        self.rename_buffer(buffer_num, 'W', address, value)
+        self.address = int(address)  # 버퍼 인덱스(LBA dict) 키는 정수
+        if isinstance(value, int):
+            self.data, self.lowercase = value, False
+        else:
+            self.data, self.lowercase = int(value, 16), value[2:] != value[2:].upper()
 
     def execute(self):
-        self.ssd.write(self.address, self.value)
-
-    @property
-    def address(self):
-        return self._address
+        self.ssd.write(self.address, self.data)
 
-    @address.setter
-    def address(self, address):
-        self._address = address
+    def to_record(self) -> tuple:
+        return 'W', self.address, self.value
 
     @property
-    def value(self):
-        return self._value
-
-    @value.setter
-    def value(self, value):
-        self._value = value
+    def value(self) -> str:
+        """hex 문자열은 출력(Read 결과, 저널, 슬롯 이름)할 때만 만듭니다."""
+        return f"0x{self.data:08x}" if self.lowercase else f"0x{self.data:08X}"
 
 
 class EraseCommand(Command):
-    def __init__(self, ssd: SSD, address: int, size: int, buffer_num: int):
+    __slots__ = ('size',)
+
+    def __init__(self, ssd: SSD, address: int, size: int):
         self.ssd = ssd
-        self._address = address
-        self._size = size  # 오타 수정
-        self.rename_buffer(buffer_num, 'E', address, size)
+        self.address = int(address)
+        self.size = int(size)
 
     def execute(self):
-        self.ssd.erase(self.address, self.size)  # 인자 전달 추가
+        self.ssd.erase(self.address, self.size)
 
-    @property
-    def address(self):
-        return self._address
+    def to_record(self) -> tuple:
+        return 'E', self.address, self.size
 
-    @address.setter
-    def address(self, address):
-        self._address = address
 
-    @property
-    def size(self):
-        return self._size
+class CommandBuffer:
+    """
+    Command Buffer 에 쌓인 Write / Erase 명령 목록.
 
-    @size.setter
-    def size(self, size):
-        self._size = size
+    명령 순서는 삽입 순서(seq)로 유지하고, 조회용 인덱스를 함께 관리합니다.
+        • Write : LBA -> 명령 dict + 정렬된 LBA 목록 (같은 LBA 의 Write 는 하나만 남음)
+        • Erase : 정렬된 시작 LBA 목록 (버퍼 안의 Erase 는 크기가 1 이상이고 서로 겹치지 않음)
+        • 0x00000000 Write : 정렬된 LBA 목록 (compaction 이 가장 가까운 0 명령을 찾을 때 사용)
+    그래서 fast_read / ignore / merge 가 버퍼 깊이와 무관하게 O(log n) 으로 동작합니다.
+    """
 
+    def __init__(self):
+        self._commands: dict[int, Command] = {}  # seq -> 명령 (dict 순서 = 명령 순서)
+        self._next_seq = 0
+        self._writes: dict[int, WriteCommand] = {}
+        self._write_lbas: list[int] = []
+        self._erases: dict[int, EraseCommand] = {}  # 시작 LBA -> 명령
+        self._erase_starts: list[int] = []
+        self._blank_write_lbas: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
 
-class CommandInvoker:
-    def __init__(self, ssd: SSD):
-        self._commands = []
-        self._ssd = ssd
+    def __iter__(self):
+        return iter(self._commands.values())
+
+    def __getitem__(self, index: int) -> Command:
+        if index < 0:
+            index += len(self._commands)
+        if not 0 <= index < len(self._commands):
+            raise IndexError("command buffer index out of range")
+        return next(islice(self._commands.values(), index, None))
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def append(self, cmd: Command) -> None:
+        cmd.seq = cmd.last_access = self._next_seq
+        self._next_seq += 1
+        self._commands[cmd.seq] = cmd
+        if isinstance(cmd, WriteCommand):
+            self._writes[cmd.address] = cmd
+            insort(self._write_lbas, cmd.address)
+            if _is_blank(cmd.data):
+                insort(self._blank_write_lbas, cmd.address)
+        else:
+            self._index_erase(cmd, cmd.address)
+
+    def extend(self, cmds: list[Command]) -> None:
+        for cmd in cmds:
+            self.append(cmd)
+
+    def remove(self, cmd: Command) -> None:
+        del self._commands[cmd.seq]
+        if isinstance(cmd, WriteCommand):
+            del self._writes[cmd.address]
+            del self._write_lbas[bisect_left(self._write_lbas, cmd.address)]
+            if _is_blank(cmd.data):
+                del self._blank_write_lbas[bisect_left(self._blank_write_lbas, cmd.address)]
+        else:
+            del self._erases[cmd.address]
+            del self._erase_starts[bisect_left(self._erase_starts, cmd.address)]
+
+    def touch(self, cmd: Command) -> None:
+        """cmd 가 방금 쓰였다고(fast read 적중) 기록합니다. coldest flush 정책이 참고합니다."""
+        cmd.last_access = self._next_seq
+        self._next_seq += 1
+
+    def resize_erase(self, cmd: EraseCommand, address: int, size: int) -> None:
+        """버퍼 안 Erase 의 범위를 바꿉니다 (명령 순서는 유지)."""
+        if address != cmd.address:
+            self._index_erase(cmd, address)
+            del self._erases[cmd.address]
+            del self._erase_starts[bisect_left(self._erase_starts, cmd.address)]
+        cmd.address = address
+        cmd.size = size
+
+    def _index_erase(self, cmd: EraseCommand, address: int) -> None:
+        # 시작 LBA 가 같은 Erase 를 덮어쓰면 앞의 Erase 가 인덱스에서 사라지므로, 호출하는 쪽이 먼저 합치거나 지워야 함
+        if address in self._erases:
+            raise ValueError(f"erase already buffered at LBA {address}")
+        self._erases[address] = cmd
+        insort(self._erase_starts, address)
+
+    def write_at(self, lba: int) -> WriteCommand | None:
+        return self._writes.get(lba)
+
+    def erase_at(self, lba: int) -> EraseCommand | None:
+        idx = bisect_right(self._erase_starts, lba) - 1
+        if idx < 0:
+            return None
+        cmd = self._erases[self._erase_starts[idx]]
+        return cmd if lba < cmd.address + cmd.size else None
+
+    def latest_at(self, lba: int) -> Command | None:
+        """lba 에 마지막으로 영향을 준 명령 (없으면 None)."""
+        write, erase = self.write_at(lba), self.erase_at(lba)
+        if write is None or erase is None:
+            return write or erase
+        return write if write.seq > erase.seq else erase
+
+    def writes_in(self, start: int, end: int) -> list[WriteCommand]:
+        low, high = bisect_left(self._write_lbas, start), bisect_left(self._write_lbas, end)
+        return [self._writes[lba] for lba in self._write_lbas[low:high]]
+
+    def erases_touching(self, start: int, end: int) -> list[EraseCommand]:
+        """[start, end) 와 겹치거나 맞닿은 Erase 를 시작 LBA 순으로 돌려줍니다."""
+        idx = bisect_left(self._erase_starts, start)
+        while idx > 0 and self._erases[self._erase_starts[idx - 1]].address + \
+                self._erases[self._erase_starts[idx - 1]].size >= start:
+            idx -= 1
+        touching = []
+        while idx < len(self._erase_starts) and self._erase_starts[idx] <= end:
+            touching.append(self._erases[self._erase_starts[idx]])
+            idx += 1
+        return touching
+
+    def erases_in(self, start: int, end: int) -> list[EraseCommand]:
+        """[start, end) 와 겹치는 Erase (맞닿기만 한 Erase 는 제외)."""
+        return [cmd for cmd in self.erases_touching(start, end) if cmd.address < end and start < cmd.address + cmd.size]
+
+    def blank_writes_in(self, start: int, end: int) -> int:
+        """[start, end) 안의 0x00000000 Write 개수."""
+        return bisect_left(self._blank_write_lbas, end) - bisect_left(self._blank_write_lbas, start)
+
+    def blank_start_before(self, lba: int) -> int | None:
+        """
+        lba 왼쪽으로 Write 만 이어지다 처음 만나는 0 명령(Erase / 0x00000000 Write)의 시작 LBA.
+        그 사이에 버퍼가 모르는 LBA 가 있으면(첫 번째 틈) None 입니다.
+        """
+        idx = bisect_left(self._erase_starts, lba) - 1
+        erase = self._erases[self._erase_starts[idx]] if idx >= 0 else None
+        idx = bisect_left(self._blank_write_lbas, lba) - 1
+        zero = self._blank_write_lbas[idx] if idx >= 0 else None
+        if erase is not None and (zero is None or erase.address > zero):
+            start, end = erase.address, erase.address + erase.size
+        elif zero is not None:
+            start, end = zero, zero + 1
+        else:
+            return None
+        return start if self._all_written(end, lba) else None
+
+    def blank_end_after(self, lba: int) -> int | None:
+        """lba 부터 오른쪽으로 Write 만 이어지다 처음 만나는 0 명령의 끝 LBA (첫 번째 틈에서 멈추면 None)."""
+        idx = bisect_left(self._erase_starts, lba)
+        erase = self._erases[self._erase_starts[idx]] if idx < len(self._erase_starts) else None
+        idx = bisect_left(self._blank_write_lbas, lba)
+        zero = self._blank_write_lbas[idx] if idx < len(self._blank_write_lbas) else None
+        if erase is not None and (zero is None or erase.address < zero):
+            start, end = erase.address, erase.address + erase.size
+        elif zero is not None:
+            start, end = zero, zero + 1
+        else:
+            return None
+        return end if self._all_written(lba, start) else None
 
-        if not os.path.isdir(BUFFER_DIR):
-            self.init_command_buffer()
-            return
+    def _all_written(self, start: int, end: int) -> bool:
+        """[start, end) 의 모든 LBA 에 버퍼 Write 가 있는지 (Write LBA 는 중복이 없으므로 개수로 판단)."""
+        return bisect_left(self._write_lbas, end) - bisect_left(self._write_lbas, start) == end - start
 
-        for filename in os.listdir(BUFFER_DIR):
-            # file_path = os.path.join(BUFFER_DIR, filename)
-            cmd_arg = filename.split('_')
-            cmd = cmd_arg[1]
-            if cmd == 'empty':
-                break
+    def overlaps(self, start: int, end: int) -> bool:
+        return bool(self.writes_in(start, end) or self.erases_in(start, end))
+
+
+def _is_blank(value: int) -> bool:
+    return value == MIN_VALUE
+
+
+def _is_noop(cmd: Command) -> bool:
+    return isinstance(cmd, EraseCommand) and cmd.size == 0
 
-            arg1 = cmd_arg[2]
-            arg2 = cmd_arg[3]
 
-            if cmd_arg[1] == "W":
-                self.add_command(WriteCommand(ssd, int(arg1), arg2, self.num_commands() + 1))
-            elif cmd_arg[1] == "E":
-                self.add_command(EraseCommand(ssd, int(arg1), int(arg2), self.num_commands() + 1))
-            elif cmd_arg[1] == "F":
-                self.flush()
+def _erase_chunk_count(start: int, end: int) -> int:
+    """[start, end) 를 erase 하는 데 필요한 명령 수 (MAX_ERASE_SIZE 단위)."""
+    return max(1, -(-(end - start) // MAX_ERASE_SIZE))
+
+
+class CommandInvoker:
+    def __init__(self, ssd: SSD, buffer_dir: str = None, durability: str = None,
+                 flush_policy: str = None, flush_size: int = None):
+        self._commands = CommandBuffer()
+        self._ssd = ssd
+        self._buffer_dir = buffer_dir or BUFFER_DIR
+        # none: fsync 없음 / flush: flush 때 한 번에 fsync / strict: 명령마다 저널 fsync
+        self._durability = durability or config.DURABILITY
+        self._journal = CommandJournal(self._buffer_dir, durability=self._durability)
+        # 버퍼가 가득 찼을 때 내보낼 명령: all / oldest / coldest (flush_size 개)
+        self._flush_policy = flush_policy or config.FLUSH_POLICY
+        self._flush_size = max(1, flush_size or config.FLUSH_SIZE)
+        self._flush_count = 0
+        self._nand_sync_count = 0
+        self._received = 0      # 버퍼로 들어온 Write / Erase
+        self._absorbed = 0      # 그중 NAND 에 가지 않고 버퍼에서 사라진 명령
+        self._evicted = 0       # 버퍼에서 NAND 로 내보낸 명령
+        self._reads = 0
+        self._read_hits = 0     # 버퍼에서 바로 답한 Read
+
+        self._in_sync = True    # 저널 레코드가 버퍼 명령과 하나씩 같은지 (clean-shutdown 표시에 남김)
+        self._recover()
+
+    def _recover(self) -> None:
+        # 지난번에 정상 종료했고 그 뒤로 저널이 그대로면 디렉토리 검사 / 슬롯 파일 이전을 건너뜀
+        self._clean_start = self._journal.clean_state()
+        if self._clean_start is None:
+            try:
+                names = os.listdir(self._buffer_dir)
+            except FileNotFoundError:
+                self.init_command_buffer()
+                return
+            self._migrate_slot_files(names)
+
+        # 저널에 남은 명령을 순서대로 다시 버퍼에 쌓아 이전 상태를 복구
+        records = self._journal.replay()
+        self._replay(records, canonical=bool(self._clean_start))
+
+        # 복구 도중 flush 가 일어났다면(버퍼 깊이 변경 등) 저널을 현재 버퍼로 맞춤
+        if self._journal.record_count != len(records):
+            self._compact_journal()
+
+    def _replay(self, records: list[tuple], canonical: bool = False) -> None:
+        for cmd, arg1, arg2 in records:
+            if cmd == "W":
+                command = WriteCommand(self._ssd, int(arg1), arg2)
+            elif cmd == "E":
+                command = EraseCommand(self._ssd, int(arg1), int(arg2))
             else:
                 print(f"Unknown command: {cmd}")
                 sys.exit(1)
+            if _is_noop(command):
+                continue  # 이전 버전이 남긴 크기 0 Erase
+            if canonical and len(self._commands) < MAX_COMMANDS:
+                self._commands.append(command)  # 이미 정리된 버퍼 그대로: ignore / compaction 생략
+            else:
+                self._buffer_command(command)
 
-    def _sync_buffer_files(self) -> None:
-        os.makedirs(BUFFER_DIR, exist_ok=True)
-        for f in os.listdir(BUFFER_DIR):
-            os.remove(os.path.join(BUFFER_DIR, f))
-        for i in range(1, 6):
-            open(os.path.join(BUFFER_DIR, f"{i}_empty"), "w").close()
-        for idx, cmd in enumerate(self._commands, 1):
-            if isinstance(cmd, WriteCommand):
-                cmd.rename_buffer(idx, 'W', cmd.address, cmd.value)
-            elif isinstance(cmd, EraseCommand):
-                cmd.rename_buffer(idx, 'E', cmd.address, cmd.size)
+    def _migrate_slot_files(self, names: list[str]) -> None:
+        """예전 버전이 남긴 슬롯 파일(1_W_3_0x..., 2_empty)을 저널로 옮깁니다."""
+        slot_files = [f for f in names if f.split('_')[0].isdigit()]
+        for filename in sorted(slot_files, key=_slot_number):
+            cmd_arg = filename.split('_')
+            if cmd_arg[1] in ("W", "E"):
+                self._journal.append(cmd_arg[1], cmd_arg[2], cmd_arg[3])
+            os.remove(os.path.join(self._buffer_dir, filename))
 
-    def add_command(self, cmd: Command) -> None:
-        # self.ignore_cmd(cmd) #신규 커맨드 대비해 지울수 있는 기존 커맨드 제거
+    def _compact_journal(self) -> None:
+        self._journal.compact([cmd.to_record() for cmd in self._commands])
+        self._in_sync = True
 
+    def add_command(self, cmd: Command) -> None:
         # Read 명령은 버퍼에 쌓지 않고 즉시 수행
         if isinstance(cmd, ReadCommand):
             cmd.execute()
             return
+        if _is_noop(cmd):
+            return  # 크기 0 Erase 는 아무 LBA 도 바꾸지 않으므로 버퍼에도 저널에도 남기지 않음
+
+        self._received += 1
+        buffered, evicted = len(self._commands), self._evicted
+        self._buffer_command(cmd)
+        self._absorbed += buffered + 1 - len(self._commands) - (self._evicted - evicted)
+
+        # 명령 하나당 저널에 한 줄 append, 무시/병합으로 쌓인 레코드는 주기적으로 정리
+        self._journal.append(*cmd.to_record())
+        if self._journal.record_count > MAX_JOURNAL_RECORDS:
+            self._compact_journal()
+
+    def _buffer_command(self, cmd: Command) -> None:
+        # 신규 커맨드 대비해 지울수 있는 기존 커맨드 제거 (지우거나 범위를 줄이면 저널 레코드와 달라짐)
+        if self.ignore_cmd(cmd):
+            self._in_sync = False
+
+        # 정리 결과가 버퍼에 들어가지 않을 때만 flush (기존 명령에 흡수되는 명령은 flush 를 일으키지 않음)
+        removed, added = self._compact(cmd)
+        while self._commands and len(self._commands) - len(removed) + len(added) > MAX_COMMANDS:
+            self._flush_full_buffer()
+            removed, added = self._compact(cmd)  # 남은 명령 기준으로 다시 계산
+
+        for old in removed:
+            self._commands.remove(old)
+        self._commands.extend(added)
+        if removed or added != [cmd]:
+            self._in_sync = False  # 저널에는 cmd 가 그대로 append 되므로 버퍼와 달라짐
+
+    def _compact(self, cmd: Command) -> tuple[list[Command], list[Command]]:
+        """
+        cmd 를 받을 때 버퍼에서 뺄 명령과 버퍼 끝에 붙일 명령을 계산합니다 (버퍼는 바꾸지 않음).
+        ─────────────────────────────────────
+        • 겹치거나 맞닿은 Erase 는 항상 하나로 합침 (MAX_ERASE_SIZE 단위로 나눔)
+        • 양쪽으로 Write 만 이어지다 만나는 가장 가까운 0 명령(Erase / 0x00000000 Write)까지를
+          Erase 하나 + 0 이 아닌 Write 로 다시 표현했을 때 명령 수가 줄면 그렇게 바꿈
+            – 0x00000000 Write 는 Erase 에 흡수
+            – Write 로 채워진 틈을 사이에 둔 Erase 는 하나로 합침
+        버퍼는 명령마다 이렇게 정리되어 있으므로 가장 가까운 0 명령 너머나 첫 번째 틈 너머는 보지 않습니다
+        (이웃은 bisect 인덱스로 찾으므로 연속 구간이 길어도 명령 하나당 O(log n)).
+        Erase 범위 안에 남는 Write 는 Erase 뒤에 다시 붙여서 실행 순서를 지킵니다.
+        """
+        buffer = self._commands
+        if isinstance(cmd, WriteCommand):
+            if buffer.erase_at(cmd.address) is not None:
+                # Erase 안의 Write: 0 이면 이미 Erase 된 값, 아니면 Erase 뒤에 그대로 붙임
+                return ([], []) if _is_blank(cmd.data) else ([], [cmd])
+            start, end = cmd.address, cmd.address + 1
+            absorbed = []
+            cmd_cost = 1 if _is_blank(cmd.data) else 0  # 0 이 아닌 Write 는 어느 쪽으로 표현해도 남음
+        else:
+            start, end, absorbed = self._touching_erases(cmd.address, cmd.address + cmd.size)
+            cmd_cost = _erase_chunk_count(start, end) if absorbed else 1
+
+        left, right = buffer.blank_start_before(start), buffer.blank_end_after(end)
+        if cmd_cost or (left is not None and right is not None):
+            low = start if left is None else left
+            high = end if right is None else right
+            span_erases = [e for e in buffer.erases_in(low, high) if e not in absorbed]
+            # 지금 규칙대로 붙였을 때 구간 안의 0 명령 수 (0 이 아닌 Write 수는 양쪽이 같음)
+            current_cost = cmd_cost + len(span_erases) + buffer.blank_writes_in(low, high)
+            if _erase_chunk_count(low, high) < current_cost:
+                removed, added = self._erase_with_writes(cmd, low, high)
+                return span_erases + absorbed + removed, added
+
+        if isinstance(cmd, WriteCommand) or not absorbed:
+            return [], [cmd]
+        removed, added = self._erase_with_writes(cmd, start, end)
+        return absorbed + removed, added
+
+    def _touching_erases(self, start: int, end: int) -> tuple[int, int, list[EraseCommand]]:
+        """[start, end) 와 겹치거나 맞닿은 Erase 를 더 늘어나지 않을 때까지 모아 합친 범위를 돌려줍니다."""
+        touching = self._commands.erases_touching(start, end)
+        while touching:
+            merged_start = min(start, touching[0].address)
+            merged_end = max(end, touching[-1].address + touching[-1].size)
+            if (merged_start, merged_end) == (start, end):
+                break
+            start, end = merged_start, merged_end
+            touching = self._commands.erases_touching(start, end)
+        return start, end, touching
 
-        self.ignore_cmd(cmd)  # 신규 커맨드 대비해 지울수 있는 기존 커맨드 제거
-
-        if len(self._commands) >= MAX_COMMANDS:
+    def _erase_with_writes(self, cmd: Command, start: int, end: int) -> tuple[list[Command], list[Command]]:
+        """
+        [start, end) 를 Erase 명령(MAX_ERASE_SIZE 단위)으로 바꿀 때 버퍼에서 뺄 Write 와 붙일 명령.
+        범위 안의 Write 는 Erase 뒤로 옮기고, 0x00000000 Write 는 Erase 와 같으므로 버립니다.
+        """
+        removed = sorted(self._commands.writes_in(start, end), key=lambda c: c.seq)
+        added: list[Command] = [
+            EraseCommand(cmd.ssd, chunk_start, min(MAX_ERASE_SIZE, end - chunk_start))
+            for chunk_start in range(start, end, MAX_ERASE_SIZE)
+        ]
+        added += [old for old in removed if not _is_blank(old.data)]
+        if isinstance(cmd, WriteCommand) and not _is_blank(cmd.data):
+            added.append(cmd)
+        return removed, added
+
+    def _flush_full_buffer(self) -> None:
+        """버퍼가 가득 찼을 때 호출됩니다. flush 정책이 고른 명령만 그 자리에서 NAND 로 내보냅니다."""
+        selected = self._select_flush()
+        if len(selected) == len(self._commands):
             self.flush()
-
-        if isinstance(cmd, EraseCommand):
-            merged = self._merge_erase_if_possible(cmd)
-            if merged:
-                self._commands.extend(merged)
-            else:
-                self._commands.append(cmd)
+            return
+        for cmd in selected:
+            self._commands.remove(cmd)
+        self._evicted += len(selected)
+        self._apply(selected)
+        self._compact_journal()
+        self._flush_count += 1
+
+    def _select_flush(self) -> list[Command]:
+        """
+        flush 정책에 따라 내보낼 명령을 명령 순서대로 고릅니다.
+            • all     : 버퍼 전체
+            • oldest  : 가장 오래된 flush_size 개
+            • coldest : 마지막으로 쓰이거나 읽힌 지 가장 오래된 flush_size 개
+        Erase 안의 Write 를 내보낼 때는 그 Erase 도 함께 내보냅니다 (남은 Erase 가 나중에 덮어쓰지 않도록).
+        """
+        commands = list(self._commands)
+        if self._flush_policy == config.FLUSH_ALL or self._flush_size >= len(commands):
+            return commands
+        if self._flush_policy == config.FLUSH_OLDEST:
+            return commands[:self._flush_size]
+
+        import heapq
+        selected = {cmd.seq: cmd for cmd in heapq.nsmallest(self._flush_size, commands, key=lambda c: c.last_access)}
+        for cmd in list(selected.values()):
+            if isinstance(cmd, WriteCommand):
+                erase = self._commands.erase_at(cmd.address)
+                if erase is not None:
+                    selected[erase.seq] = erase
+        return [selected[seq] for seq in sorted(selected)]
+
+    def _apply(self, commands) -> None:
+        # 명령을 순서대로 메모리에서 적용한 뒤, 바뀐 LBA 만 LBA 순서의 연속 구간으로 한 번에 씀
+        self._ssd.begin_batch()
+        try:
+            for cmd in commands:
+                cmd.execute()
+        finally:
+            self._ssd.end_batch()
+        # group commit: 모든 명령을 반영한 뒤 NAND 를 한 번만 fsync (저널은 그 다음에 비움)
+        self._persist()
+
+    def _persist(self) -> None:
+        """flush / fill 이 끝날 때 NAND 를 fsync 하고(durability 가 none 이 아니면) 검증 캐시를 남깁니다."""
+        if self._durability != config.DURABILITY_NONE:
+            self._ssd.sync()
+            self._nand_sync_count += 1
         else:
-            self._commands.append(cmd)
-
-        self._sync_buffer_files()
-
-    def _merge_erase_if_possible(self, incoming_cmd: EraseCommand) -> list[EraseCommand] | None:
-        # range of the new (incoming) erase request
-        incoming_start_addr = incoming_cmd.address
-        incoming_end_addr = incoming_start_addr + incoming_cmd.size
-
-        # track commands that will be removed because they merge with the incoming one
-        indices_to_remove: list[int] = []
-
-        # running merged range (will expand if we find overlaps/adjacency)
-        merged_start_addr = incoming_start_addr
-        merged_end_addr = incoming_end_addr
-
-        for idx, queued_cmd in enumerate(self._commands):
-            if not isinstance(queued_cmd, EraseCommand):
-                continue
-
-            queued_start_addr = queued_cmd.address
-            queued_end_addr = queued_start_addr + queued_cmd.size
-
-            # overlap or directly adjacent?
-            has_overlap_or_adjacent = (
-                    queued_end_addr == merged_start_addr
-                    or merged_end_addr == queued_start_addr
-                    or (queued_start_addr <= merged_start_addr < queued_end_addr)
-                    or (merged_start_addr <= queued_start_addr < merged_end_addr)
-            )
-
-            if has_overlap_or_adjacent:
-                merged_start_addr = min(merged_start_addr, queued_start_addr)
-                merged_end_addr = max(merged_end_addr, queued_end_addr)
-                indices_to_remove.append(idx)
-
-        # nothing merged → caller should append the incoming command as-is
-        if not indices_to_remove:
-            return None
-
-        # drop all commands that we merged with
-        for idx in reversed(indices_to_remove):
-            del self._commands[idx]
-
-        # create replacement commands (split into chunks ≤ 10 lines each)
-        total_merged_size = merged_end_addr - merged_start_addr
-        replacement_cmds: list[EraseCommand] = []
-        current_addr = merged_start_addr
-        remaining_size = total_merged_size
-
-        while remaining_size > 0:
-            chunk_size = min(10, remaining_size)
-            replacement_cmds.append(
-                EraseCommand(incoming_cmd.ssd, current_addr, chunk_size, 0)
-            )
-            current_addr += chunk_size
-            remaining_size -= chunk_size
-
-        return replacement_cmds
+            self._ssd.checkpoint()
 
     def flush(self):
-        for cmd in self._commands:
-            cmd.execute()
+        self._evicted += len(self._commands)
+        self._apply(self._commands)
         self._commands.clear()
         self.init_command_buffer()
+        self._flush_count += 1
+
+    def close(self) -> None:
+        """
+        진행 중인 작업을 마무리하고, 다음 시작 때 복구 작업을 건너뛸 수 있도록 clean-shutdown 표시를 남깁니다.
+        저널이 버퍼와 달라졌으면 먼저 지금 버퍼로 다시 써서, 다음 시작이 지금과 똑같은 버퍼를 그대로 올리게 합니다.
+        """
+        if not self._in_sync:
+            self._compact_journal()
+        self._journal.mark_clean(self._in_sync)
+
+    def stats(self) -> dict:
+        return {
+            'durability': self._durability,
+            'buffered': len(self._commands),
+            'flushes': self._flush_count,
+            'nand_syncs': self._nand_sync_count,
+            'journal_fsyncs': self._journal.fsync_count,
+            'flush_policy': self._flush_policy,
+            'writes': self._received,
+            'absorbed': self._absorbed,
+            'absorb_rate': _rate(self._absorbed, self._received),
+            'reads': self._reads,
+            'read_hits': self._read_hits,
+            'hit_rate': _rate(self._read_hits, self._reads),
+            'clean_start': self._clean_start is not None,
+        }
+
+    def fill(self, start: int, count: int, values) -> None:
+        """
+        start 부터 count 개 LBA 에 values 를 버퍼를 거치지 않고 NAND 에 바로 씁니다.
+        범위와 겹치는 버퍼 명령이 있으면 먼저 flush 해서 (이미 받은 명령 -> fill) 순서를 지킵니다.
+        """
+        if self._commands.overlaps(start, start + count):
+            self.flush()
+
+        values = iter(values)
+        for chunk_start in range(start, start + count, FILL_CHUNK_SIZE):
+            chunk_size = min(FILL_CHUNK_SIZE, start + count - chunk_start)
+            self._ssd.write_range(chunk_start, list(islice(values, chunk_size)))
+        self._persist()
 
     def num_commands(self):
         return len(self._commands)
 
     def init_command_buffer(self):
-        buffer_dir = BUFFER_DIR
-        os.makedirs(buffer_dir, exist_ok=True)  # 이미 있어도 에러 안 나게
-
-        # 2. 파일 생성
-        for i in range(1, 6):
-            prefix_pattern = os.path.join(buffer_dir, f"{i}_*")
-            matched_files = glob.glob(prefix_pattern)
-
-            target_path = os.path.join(buffer_dir, f"{i}_empty")
-
-            if matched_files:
-                # 첫 번째로 매칭된 파일만 이름 변경
-                os.rename(matched_files[0], target_path)
-            else:
-                # 파일 새로 생성
-                with open(target_path, "w") as f:
-                    f.write("")
+        # 버퍼를 비운 상태로 저널 초기화 (디렉토리가 없으면 생성)
+        self._journal.clear()
+        self._in_sync = True
 
     def get_buffer(self):
-        return self._commands
+        return list(self._commands)
+
+    def slot_names(self) -> list[str]:
+        """버퍼 상태를 예전 슬롯 파일 이름 형식(1_W_3_0x..., 2_empty)으로 보여줍니다."""
+        names = [f"{idx}_{cmd}_{arg1}_{arg2}"
+                 for idx, (cmd, arg1, arg2) in enumerate((c.to_record() for c in self._commands), 1)]
+        names += [f"{idx}_empty" for idx in range(len(self._commands) + 1, MAX_COMMANDS + 1)]
+        return names
 
-    def ignore_cmd(self, new_cmd: Command):
+    def ignore_cmd(self, new_cmd: Command) -> bool:
         """
         중복·무효 명령 제거 및 Erase 축소
         ─────────────────────────────────────
@@ -417,56 +787,47 @@ class CommandInvoker:
         • Erase
             – 범위에 포함된 모든 Write 제거
             – 자신이 완전히 감싸는 이전 Erase 제거
+        버퍼의 명령을 하나라도 지우거나 줄였으면 True 를 돌려줍니다.
         """
 
-        def erange(cmd):
-            return range(cmd.address, cmd.address + cmd.size)
-
-        removed = []
+        buffer = self._commands
+        changed = False
         # ───── Write 추가 시 ─────
         if isinstance(new_cmd, WriteCommand):
             w = new_cmd.address
-            for idx, old in enumerate(self._commands):
-                # ① 같은 LBA Write 제거
-                if isinstance(old, WriteCommand) and old.address == w:
-                    removed.append(idx)
-
-                # ② 포함 Erase 축소 / 제거
-                elif isinstance(old, EraseCommand) and w in erange(old):
-                    if w == old.address:  # 앞쪽 잘라내기
-                        old.address += 1
-                        old.size -= 1
-                    elif w == old.address + old.size - 1:  # 뒤쪽 잘라내기
-                        old.size -= 1
-
-                    # 파일명 갱신
-                    if old.size > 0:
-                        slot = old.path.split("_")[0]  # '2'
-                        new_name = f"{slot}_E_{old.address}_{old.size}"
-                        if new_name != old.path:
-                            os.rename(os.path.join(BUFFER_DIR, old.path),
-                                      os.path.join(BUFFER_DIR, new_name))
-                            old.path = new_name
-                    else:
-                        removed.append(idx)
+            # ① 같은 LBA Write 제거
+            old = buffer.write_at(w)
+            if old is not None:
+                buffer.remove(old)
+                changed = True
+
+            # ② 포함 Erase 축소 / 제거
+            old = buffer.erase_at(w)
+            if old is not None:
+                if w == old.address:  # 앞쪽 잘라내기
+                    buffer.resize_erase(old, old.address + 1, old.size - 1)
+                    changed = True
+                elif w == old.address + old.size - 1:  # 뒤쪽 잘라내기
+                    buffer.resize_erase(old, old.address, old.size - 1)
+                    changed = True
+
+                if old.size == 0:
+                    buffer.remove(old)
 
         # ───── Erase 추가 시 ─────
         elif isinstance(new_cmd, EraseCommand):
-            n_rng = erange(new_cmd)
-            for idx, old in enumerate(self._commands):
-                # ③ 범위에 포함된 Write 제거
-                if isinstance(old, WriteCommand) and old._address in n_rng:
-                    removed.append(idx)
-
-                # ④ 완전히 포함되는 Erase 제거
-                elif isinstance(old, EraseCommand):
-                    o_rng = erange(old)
-                    if o_rng.start >= n_rng.start and o_rng.stop <= n_rng.stop:
-                        removed.append(idx)
-
-        # 실제 제거(뒤에서부터)
-        for i in sorted(removed, reverse=True):
-            self._commands.pop(i)
+            start, end = new_cmd.address, new_cmd.address + new_cmd.size
+            # ③ 범위에 포함된 Write 제거
+            for old in buffer.writes_in(start, end):
+                buffer.remove(old)
+                changed = True
+
+            # ④ 완전히 포함되는 Erase 제거
+            for old in buffer.erases_touching(start, end):
+                if old.address >= start and old.address + old.size <= end:
+                    buffer.remove(old)
+                    changed = True
+        return changed
 
     # def fast_read(self, lba: int) -> str:
     #     # 최근 명령어 우선으로 역순 스캔
@@ -482,41 +843,309 @@ class CommandInvoker:
     #
     #     return self._ssd._read_from_nand(lba)  # 실제 NAND 읽기로 후퇴
 
+    def _buffers(self) -> list[CommandBuffer]:
+        """fast read 가 조회할 버퍼 목록 (최신 버퍼부터)."""
+        return [self._commands]
+
     def fast_read(self, lba: int) -> str:
-        for cmd in reversed(self._commands):
-            if isinstance(cmd, WriteCommand) and cmd._address == lba:
-                return cmd._value
-            if isinstance(cmd, EraseCommand):
-                if cmd._address <= lba < cmd._address + cmd._size:
-                    return BLANK_STRING
+        self._reads += 1
+        for buffer in self._buffers():
+            cmd = buffer.latest_at(lba)
+            if cmd is None:
+                continue
+            self._read_hits += 1
+            buffer.touch(cmd)
+            return cmd.value if isinstance(cmd, WriteCommand) else BLANK_STRING
         return self._ssd._read_from_nand(lba)
 
+    def fast_read_range(self, start: int, count: int) -> list[str]:
+        """start 부터 count 개 LBA 를 fast_read 와 같은 규칙으로 읽습니다 (NAND 는 한 번만 읽음)."""
+        end = start + count
+        buffers = self._buffers()
+        values = self._ssd._read_range_from_nand(start, count)
+        for buffer in reversed(buffers):
+            cmds = buffer.writes_in(start, end) + buffer.erases_touching(start, end)
+            # 오래된 명령부터 덮어써서 가장 최근 명령이 남도록
+            for cmd in sorted(cmds, key=lambda c: c.seq):
+                if isinstance(cmd, WriteCommand):
+                    values[cmd.address - start] = cmd.value
+                else:
+                    low, high = max(start, cmd.address), min(end, cmd.address + cmd.size)
+                    if low < high:
+                        values[low - start:high - start] = [BLANK_STRING] * (high - low)
+        return values
+
+
+class AsyncCommandInvoker(CommandInvoker):
+    """
+    버퍼가 가득 차면 flush 를 백그라운드 스레드에 맡기는 Invoker (데몬 / in-process 드라이버용).
+
+    가득 찬 버퍼는 flushing 버퍼로 넘어가고, 새 명령은 빈 버퍼에 쌓입니다 (double buffering).
+        • fast read : 현재 버퍼 → flushing 버퍼 → NAND 순서로 조회
+        • 두 버퍼가 모두 찼을 때만 앞선 flush 가 끝날 때까지 기다림 (backpressure)
+        • 저널에는 두 버퍼의 명령이 모두 남아 있다가, 백그라운드 flush 가 끝나면 현재 버퍼만 남김
+    F(flush) / FILL 은 백그라운드 flush 를 기다린 뒤 기존처럼 동기로 수행합니다.
+    명령은 한 스레드(또는 lock 으로 직렬화된 여러 스레드)에서 들어온다고 가정합니다.
+    """
+
+    def __init__(self, ssd: SSD, buffer_dir: str = None, durability: str = None,
+                 flush_policy: str = None, flush_size: int = None):
+        import threading  # CLI 한 번 실행에는 필요 없으므로 여기서 import
+        self._cond = threading.Condition()
+        self._flushing: CommandBuffer | None = None
+        self._flush_error: BaseException | None = None
+        self._closing = False
+        self._flusher: threading.Thread | None = None
+        with self._cond:  # 저널 복구 중에도 버퍼가 가득 차면 flush 가 넘어감
+            super().__init__(ssd, buffer_dir, durability, flush_policy, flush_size)
+
+    def add_command(self, cmd: Command) -> None:
+        with self._cond:
+            super().add_command(cmd)
+
+    def _flush_full_buffer(self) -> None:
+        self._wait_for_flush()
+        selected = self._select_flush()
+        self._evicted += len(selected)
+        self._in_sync = False  # 저널에는 flushing 버퍼의 명령도 남아 있음
+        if len(selected) == len(self._commands):
+            self._flushing, self._commands = self._commands, CommandBuffer()
+        else:
+            self._flushing = CommandBuffer()
+            for cmd in selected:
+                self._commands.remove(cmd)
+                self._flushing.append(cmd)
+        if self._flusher is None:
+            import threading
+            self._flusher = threading.Thread(target=self._flush_worker, name="ssd-flusher", daemon=True)
+            self._flusher.start()
+        self._cond.notify_all()
+
+    def _wait_for_flush(self) -> None:
+        """self._cond 를 잡은 상태에서 백그라운드 flush 가 끝날 때까지 기다립니다."""
+        while self._flushing is not None:
+            self._cond.wait()
+        if self._flush_error is not None:
+            error, self._flush_error = self._flush_error, None
+            raise error
+
+    def _flush_worker(self) -> None:
+        while True:
+            with self._cond:
+                while self._flushing is None and not self._closing:
+                    self._cond.wait()
+                if self._flushing is None:
+                    return
+                commands = self._flushing
+
+            error = None
+            try:
+                self._apply(commands)
+            except BaseException as e:  # 다음 명령을 받는 쪽에서 다시 올림
+                error = e
+
+            with self._cond:
+                self._flushing = None
+                if error is None:
+                    self._compact_journal()  # 반영된 명령은 저널에서 제거
+                    self._flush_count += 1
+                self._flush_error = error
+                self._cond.notify_all()
+
+    def _compact_journal(self) -> None:
+        self._journal.compact([cmd.to_record() for buffer in reversed(self._buffers()) for cmd in buffer])
+        self._in_sync = self._flushing is None
+
+    def _buffers(self) -> list[CommandBuffer]:
+        if self._flushing is None:
+            return [self._commands]
+        return [self._commands, self._flushing]
+
+    def flush(self):
+        with self._cond:
+            self._wait_for_flush()
+            super().flush()
+
+    def fill(self, start: int, count: int, values) -> None:
+        with self._cond:
+            self._wait_for_flush()  # 백그라운드 flush 가 fill 값을 덮어쓰지 않도록
+            super().fill(start, count, values)
+
+    def fast_read(self, lba: int) -> str:
+        with self._cond:
+            return super().fast_read(lba)
+
+    def fast_read_range(self, start: int, count: int) -> list[str]:
+        with self._cond:
+            return super().fast_read_range(start, count)
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = super().stats()
+            stats['flushing'] = len(self._flushing) if self._flushing is not None else 0
+            return stats
+
+    def close(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._wait_for_flush()
+            self._cond.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        super().close()
+
+
+def _rate(count: int, total: int) -> float:
+    return round(count / total, 3) if total else 0.0
+
+
+def fill_values(pattern: str, arg: str, count: int):
+    """FILL 패턴에 맞는 값 count 개를 만듭니다."""
+    if pattern == "const":
+        value = int(arg, 16)
+        return (value for _ in range(count))
+    if pattern == "inc":
+        value = int(arg, 16)
+        return ((value + offset) & MAX_VALUE for offset in range(count))
+    if pattern == "random":
+        import random
+        rng = random.Random(int(arg))
+        return (rng.getrandbits(32) for _ in range(count))
+    raise ValueError(f"Unknown fill pattern: {pattern}")
+
+
+class _BufferView(CommandInvoker):
+    """
+    buffer_slot_names 용: 디스크의 레코드를 다음 시작 때의 복구와 같은 규칙으로 메모리의 버퍼에만 쌓습니다.
+    정상 종료한 저널은 그대로 올리고, 아니면 ignore / compaction 을 거칩니다.
+    슬롯 파일 이전, 저널 정리, flush 는 하지 않고, 버퍼가 넘쳐 NAND 로 나갔을 명령은 버퍼에서 빼기만 합니다.
+    """
+
+    def __init__(self, records: list[tuple], buffer_dir: str = None):
+        self._records = records
+        super().__init__(None, buffer_dir, durability=config.DURABILITY_NONE)
+
+    def _recover(self) -> None:
+        self._clean_start = self._journal.clean_state()
+        self._replay(self._records, canonical=bool(self._clean_start))
+
+    def _flush_full_buffer(self) -> None:
+        for cmd in self._select_flush():
+            self._commands.remove(cmd)
+
+
+def buffer_slot_names(buffer_dir: str = None) -> list[str]:
+    """
+    디스크의 저널을 읽어 다음 시작 때 복구될 버퍼 상태를 슬롯 이름 형식으로 돌려줍니다 (디버깅/테스트용, 파일은 바꾸지 않음).
+    정상 종료한 프로세스의 버퍼와는 이름까지 같고, 실행 중인 프로세스의 버퍼와는 내용(LBA 별 값)만 같습니다.
+    """
+    buffer_dir = buffer_dir or BUFFER_DIR
+    return _BufferView(_buffered_records(buffer_dir), buffer_dir).slot_names()
+
+
+def read_only(lba: int, buffer_dir: str = None, storage: NandStorage | None = None) -> str | None:
+    """
+    R 전용 읽기 경로: 버퍼 디렉토리와 NAND 를 읽기만 하고 파일은 하나도 바꾸지 않습니다.
+    CommandInvoker 를 만들면 복구(슬롯 파일 이전, 저널 정리, 복구 중 flush)와 SSD 초기화(format, .meta 갱신)가
+    함께 일어나므로, 여러 R 프로세스가 동시에 떠도 서로의 rename / 저널 재작성과 부딪히지 않도록 따로 둡니다.
+
+    비용은 디렉토리 목록 + 저널 한 번 읽기, 버퍼에 없으면 NAND 레코드 하나 읽기입니다.
+    NAND 이미지가 올바른지 파일을 바꾸지 않고 확인할 수 없으면 None 을 돌려주고, 호출자는 일반 경로를 씁니다.
+    """
+    record = _latest_buffered_record(lba, buffer_dir or BUFFER_DIR)
+    if record is not None:
+        op, _, value = record
+        return value if op == "W" else BLANK_STRING
+
+    if config.FULL_VERIFY:
+        return None
+    if storage is None:
+        # mmap 백엔드도 같은 이미지이므로 매핑 없이 레코드 하나만 읽음
+        backend = 'binary' if NAND_BACKEND == 'mmap' else NAND_BACKEND
+        storage = create_nand_storage(backend, NAND_FILES[NAND_BACKEND], SSD_SIZE)
+    if not storage.exists():
+        return BLANK_STRING  # 일반 경로라면 BLANK 이미지를 새로 만들고 읽었을 값
+    if not storage.is_known_valid():
+        return None
+    if 0 <= lba < SSD_SIZE:
+        try:
+            return f"0x{storage.read(lba):08X}"
+        except (ValueError, IndexError, struct.error):
+            pass
+    return BLANK_STRING
+
+
+def _latest_buffered_record(lba: int, buffer_dir: str) -> tuple | None:
+    """버퍼에서 lba 에 마지막으로 영향을 준 (op, arg1, arg2) 레코드."""
+    for record in reversed(_buffered_records(buffer_dir)):
+        op, arg1, arg2 = record
+        if op == "W" and int(arg1) == lba:
+            return record
+        if op == "E" and int(arg1) <= lba < int(arg1) + int(arg2):
+            return record
+    return None
+
+
+def _buffered_records(buffer_dir: str) -> list[tuple]:
+    """버퍼 디렉토리의 (op, arg1, arg2) 레코드를 읽기만 합니다. 슬롯 파일이 남아 있으면 저널보다 앞선 명령입니다."""
+    try:
+        names = os.listdir(buffer_dir)
+    except FileNotFoundError:
+        return []
+    slot_files = sorted((f for f in names if f.split('_')[0].isdigit()), key=_slot_number)
+    records = [tuple(f.split('_')[1:4]) for f in slot_files if f.split('_')[1] in ("W", "E")]
+    return records + CommandJournal(buffer_dir).replay()
+
+
+def _slot_number(filename: str) -> int:
+    slot = filename.split('_')[0]
+    return int(slot) if slot.isdigit() else 0
+
 
 def is_valid_size(address: str, lba_size: str):
     try:
         address = int(address)
         lba_size = int(lba_size)
-        if address + lba_size <= 100:
+        if address + lba_size <= SSD_SIZE:
             return True
         else:
             return False
-    except ValueError:
-        return False  # 정수형으로 변환할 수 없는 경우 (예: "0.5")
+    except (ValueError, TypeError):
+        return False  # 정수형으로 변환할 수 없거나(예: "0.5") 인자가 없는 경우
+
+
+def is_valid_erase_size(lba_size: str):
+    try:
+        return 0 <= int(lba_size) <= MAX_ERASE_SIZE
+    except (ValueError, TypeError):
+        return False
 
 
 def is_valid_address(address: str):
     try:
         address_int = int(address)
-    except ValueError:
-        return False  # 정수형으로 변환할 수 없는 경우 (예: "0.5")
+    except (ValueError, TypeError):
+        return False  # 정수형으로 변환할 수 없거나(예: "0.5") 인자가 없는 경우
 
-    if 0 <= address_int <= 99:
+    if 0 <= address_int < SSD_SIZE:
         return True
     else:
-        return False  # 유효한 범위(0~99)를 벗어난 경우
+        return False  # 유효한 범위(0~SSD_SIZE-1)를 벗어난 경우
+
+
+def is_valid_fill(pattern: str, arg: str) -> bool:
+    # const / inc 는 시작 값(0x########), random 은 seed(10진수)
+    if pattern in ("const", "inc"):
+        return arg is not None and is_valid_value(arg)
+    if pattern == "random":
+        return arg is not None and arg.isdigit()
+    return False
 
 
 def is_valid_value(value: str) -> str | None:
+    if value is None:
+        return False  # 인자가 없는 경우 (예: "W 3")
     if not value.startswith('0x') or not len(value) == 10:  # str 시작이 0x로 시작되어야함
         return False
 
@@ -534,51 +1163,163 @@ def is_valid_value(value: str) -> str | None:
     return True
 
 
+SSD_COMMANDS = ("R", "RR", "W", "E", "D", "FILL", "F")
+
+
+def execute_command(ssd: SSD, invoker: CommandInvoker, cmd: str, arg1: str = None, arg2: str = None,
+                    *extra: str) -> str | None:
+    """
+    명령 하나를 수행하고 ssd_output.txt 에 남길 내용을 돌려줍니다 (남길 내용이 없으면 None).
+    CLI(main) 와 데몬(ssd_server) 이 같은 의미로 명령을 처리하도록 공유합니다.
+    """
+    if cmd == "R":
+        if arg1 is None:
+            raise ValueError("R needs an LBA")  # 다른 명령처럼 int() 가 못 읽는 LBA 와 같이 처리
+        return invoker.fast_read(int(arg1))
+
+    if cmd == "RR":
+        # 범위 읽기: 결과를 한 줄에 LBA 하나씩
+        if not is_valid_address(arg1) or not is_valid_size(arg1, arg2) or int(arg2) <= 0:
+            print("ERROR RR arguments are not valid")
+            return ERROR_STRING
+        return "\n".join(invoker.fast_read_range(int(arg1), int(arg2)))
+
+    if cmd == "W":
+        if not is_valid_address(arg1) or not is_valid_value(arg2):
+            print("ERROR W arguments are not valid")
+            return ERROR_STRING
+
+        invoker.add_command(WriteCommand(ssd, int(arg1), arg2))
+        return None
+
+    if cmd in ("E", "D"):
+        # D(deallocate) 는 E 와 같이 범위를 BLANK 로 만듭니다
+        # 크기는 버퍼에 넣기 전에 확인 (flush 때 SSD.erase 가 거절하면 이미 응답한 Erase 가 사라짐)
+        if not is_valid_address(arg1) or not is_valid_size(arg1, arg2) or not is_valid_erase_size(arg2):
+            print(f"ERROR {cmd} arguments are not valid")
+            return ERROR_STRING
+
+        invoker.add_command(EraseCommand(ssd, int(arg1), int(arg2)))
+        return None
+
+    if cmd == "FILL":
+        # FILL <start> <count> <const|inc|random> <값 또는 seed>
+        pattern, pattern_arg = (extra + (None, None))[:2]
+        if (not is_valid_address(arg1) or not is_valid_size(arg1, arg2) or int(arg2) < 0
+                or not is_valid_fill(pattern, pattern_arg)):
+            print("ERROR FILL arguments are not valid")
+            return ERROR_STRING
+
+        invoker.fill(int(arg1), int(arg2), fill_values(pattern, pattern_arg, int(arg2)))
+        return None
+
+    if cmd == "F":
+        invoker.flush()
+        return None
+
+    raise ValueError(f"Unknown command: {cmd}")
+
+
+def execute_batch(ssd: SSD, invoker: CommandInvoker, lines):
+    """
+    한 줄에 명령 하나씩(W / R / RR / E / D / FILL / F) 차례로 수행하면서 출력이 있는 명령(R / RR 결과, ERROR)의
+    출력을 순서대로 yield 합니다. 알 수 없는 명령을 만나면 ValueError.
+    """
+    for line in lines:
+        args = line.split()
+        if not args:
+            continue
+        cmd = args[0].upper()
+        if cmd not in SSD_COMMANDS:
+            raise ValueError(f"Unknown command: {cmd}")
+        output = execute_command(ssd, invoker, cmd, *args[1:])
+        if output is not None:
+            yield output
+
+
+def handle_request(ssd: SSD, invoker: CommandInvoker, args: list[str]) -> str:
+    """
+    드라이버/데몬 요청 하나를 처리해 응답 문자열로 돌려줍니다.
+    "OK", "OK <ssd_output.txt 에 남을 내용>", "FAIL <사유>" 중 하나입니다.
+    """
+    if not args:
+        return "FAIL empty request"
+    cmd = args[0].upper()
+    if cmd == "STATS":
+        return "OK " + " ".join(f"{key}={value}" for key, value in invoker.stats().items())
+    if cmd not in SSD_COMMANDS:
+        return f"FAIL Unknown command: {cmd}"
+    try:
+        output = execute_command(ssd, invoker, cmd, *args[1:])
+    except (ValueError, TypeError) as e:
+        return f"FAIL {e}"
+    return "OK" if output is None else f"OK {output}"
+
+
 def main():
-    if len(sys.argv) < 1:
+    if len(sys.argv) < 2:
         print("Usage: ssd.py <command> <arg1> [arg2]")
         sys.exit(1)
 
     cmd = sys.argv[1].upper()
     arg1 = sys.argv[2] if len(sys.argv) > 2 else None
     arg2 = sys.argv[3] if len(sys.argv) > 3 else None
+    extra = sys.argv[4:]
 
-    ssd = SSD()
-    invoker = CommandInvoker(ssd)
-
-    # if cmd == "R":
-    #     # invoker.add_command(ReadCommand(ssd, int(arg1)))
-    #     invoker.flush()
-    #     ReadCommand(ssd, int(arg1)).execute()
-    if cmd == "R":
-        val = invoker.fast_read(int(arg1))
-        ssd._output_file_handler.write(val)
+    if cmd == "SERVE":
+        # 상주 데몬: 프로세스 하나가 SSD / CommandInvoker 상태를 메모리에 유지
+        import ssd_server
+        ssd_server.serve(arg1)
+        return
 
-    elif cmd == "W":
-        if not is_valid_address(arg1) or not is_valid_value(arg2):
-            ssd._output_file_handler.write("ERROR")
-            print("ERROR W arguments are not valid")
-            return
+    if cmd == "PIPE":
+        # coprocess: stdin / stdout 으로 한 줄씩 명령을 받는 상주 프로세스
+        import ssd_server
+        ssd_server.serve_pipe()
+        return
 
-        invoker.add_command(WriteCommand(ssd, int(arg1), arg2, invoker.num_commands() + 1))
+    if cmd not in SSD_COMMANDS and cmd not in ("STATS", "BATCH"):
+        print(f"Unknown command: {cmd}")
+        sys.exit(1)
 
-    elif cmd == "E":
-        if not is_valid_address(arg1) or not is_valid_size(arg1, arg2):
-            ssd._output_file_handler.write("ERROR")
-            print("ERROR E arguments are not valid")
+    if cmd == "R":
+        # 읽기만 하는 경로: 버퍼 복구나 NAND 초기화 없이 답할 수 있으면 그대로 끝냄
+        output = read_only(int(arg1))
+        if output is not None:
+            SimpleFileHandler(OUTPUT_FILE, fsync=config.DURABILITY == config.DURABILITY_STRICT).write(output)
             return
 
-        invoker.add_command(EraseCommand(ssd, int(arg1), int(arg2), invoker.num_commands() + 1))
+    ssd = SSD()
+    invoker = CommandInvoker(ssd)
 
-    elif cmd == "F":
-        invoker.flush()
+    if cmd == "STATS":
+        for key, value in invoker.stats().items():
+            print(f"{key}={value}")
+        invoker.close()
+        return
 
-    else:
-        print(f"Unknown command: {cmd}")
-        sys.exit(1)
+    if cmd == "BATCH":
+        # 명령 여러 개를 한 프로세스에서 수행: stdin 또는 파일에서 한 줄에 하나씩
+        # 출력은 ssd_output.txt 에 한 줄에 하나씩 남깁니다
+        outputs = []
+        stream = open(arg1, 'r', encoding='utf-8') if arg1 else sys.stdin
+        try:
+            for output in execute_batch(ssd, invoker, stream):
+                outputs.append(output)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        finally:
+            ssd._output_file_handler.write("\n".join(outputs))
+            if arg1:
+                stream.close()
+        invoker.close()
+        return
 
-    # flush
-    # invoker.flush()
+    output = execute_command(ssd, invoker, cmd, arg1, arg2, *extra)
+    if output is not None:
+        ssd._output_file_handler.write(output)
+    invoker.close()
 
 
 if __name__ == "__main__":
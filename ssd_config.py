@@ -0,0 +1,110 @@
+"""
+ssd.py / shell.py / ssd_driver.py 가 공유하는 장치 설정.
+
+모든 값은 환경 변수로 바꿀 수 있고, SSDDriver 는 ssd.py 를 실행할 때
+as_env() 로 같은 설정을 그대로 넘겨줍니다.
+
+    SSD_LBA_COUNT       LBA 개수 (기본 100)
+    SSD_MAX_ERASE_SIZE  erase 명령 한 번의 최대 크기 (기본 10, 0 이면 제한 없음)
+    SSD_BUFFER_DEPTH    command buffer 깊이 (기본 5)
+    SSD_NAND_BACKEND    NAND 저장 백엔드: text / binary / mmap (기본 text)
+                          text 는 format 때 모든 줄을 써야 하므로 TEXT_MAX_LBA_COUNT 개 LBA 까지만 지원
+    SSD_DATA_DIR        buffer/, ssd_nand.*, ssd_output.txt 위치 (기본 프로젝트 루트)
+    SSD_FULL_VERIFY     1 이면 시작할 때마다 NAND 전체 검사 (기본 0: 검증 캐시 사용)
+    SSD_DURABILITY      fsync 정책 (기본 flush)
+                          none   : fsync 하지 않음 (벤치마크용)
+                          flush  : F / 버퍼 overflow 때 NAND 를 한 번에 fsync (group commit)
+                          strict : 명령마다 저널과 ssd_output.txt 를 fsync
+    SSD_FLUSH_POLICY    버퍼가 가득 찼을 때 내보낼 명령 (기본 all)
+                          all     : 버퍼 전체를 flush
+                          oldest  : 가장 오래된 명령 SSD_FLUSH_SIZE 개만 flush
+                          coldest : 가장 오래 쓰이거나 읽히지 않은 명령 SSD_FLUSH_SIZE 개만 flush
+    SSD_FLUSH_SIZE      oldest / coldest 정책이 한 번에 내보낼 명령 수 (기본 1)
+    SSD_FLUSH_IDLE_MS   데몬 / in-process 에서 명령이 이 시간(ms) 동안 없으면 flush (기본 0: 사용 안 함)
+    SSD_FLUSH_MAX_AGE_MS  버퍼에 명령이 쌓인 지 이 시간(ms)이 지나면 flush (기본 0: 사용 안 함)
+    SSD_FLUSH_MISS_RATE   최근 Read 중 NAND 로 간 비율이 이 값 이상이면 flush (기본 0: 사용 안 함)
+    SSD_DRIVER          shell 이 쓸 SSD 드라이버: subprocess / forkserver / socket / pipe / ring / inprocess (기본 subprocess)
+    SSD_SOCKET          ssd.py serve 데몬의 Unix socket 경로 (기본 <SSD_DATA_DIR>/ssd.sock)
+"""
+import os
+
+# pathlib 은 import 비용이 커서(ssd.py 는 명령마다 새 프로세스) os.path 만 씁니다
+_PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+LBA_COUNT = _env_int("SSD_LBA_COUNT", 100)
+MAX_ERASE_SIZE = _env_int("SSD_MAX_ERASE_SIZE", 10)
+BUFFER_DEPTH = _env_int("SSD_BUFFER_DEPTH", 5)
+NAND_BACKEND = os.environ.get("SSD_NAND_BACKEND", "text")
+# text 백엔드는 빈 장치도 '0x00000000' 줄로 다 채워야 해서 시작(format) 비용이 LBA 개수에 비례함
+# 이보다 큰 장치는 truncate 로 바로 만들어지는 binary / mmap 백엔드를 씀
+TEXT_MAX_LBA_COUNT = 1 << 20
+if NAND_BACKEND == "text" and LBA_COUNT > TEXT_MAX_LBA_COUNT:
+    raise ValueError(f"SSD_NAND_BACKEND=text supports up to {TEXT_MAX_LBA_COUNT} LBAs; "
+                     f"use binary or mmap for SSD_LBA_COUNT={LBA_COUNT}")
+DATA_DIR = os.environ.get("SSD_DATA_DIR") or _PROJECT_ROOT
+FULL_VERIFY = _env_int("SSD_FULL_VERIFY", 0) == 1
+
+DURABILITY_NONE = "none"
+DURABILITY_FLUSH = "flush"
+DURABILITY_STRICT = "strict"
+DURABILITY_MODES = (DURABILITY_NONE, DURABILITY_FLUSH, DURABILITY_STRICT)
+DURABILITY = os.environ.get("SSD_DURABILITY") or DURABILITY_FLUSH
+if DURABILITY not in DURABILITY_MODES:
+    raise ValueError(f"Unknown SSD_DURABILITY: {DURABILITY}")
+
+FLUSH_ALL = "all"
+FLUSH_OLDEST = "oldest"
+FLUSH_COLDEST = "coldest"
+FLUSH_POLICIES = (FLUSH_ALL, FLUSH_OLDEST, FLUSH_COLDEST)
+FLUSH_POLICY = os.environ.get("SSD_FLUSH_POLICY") or FLUSH_ALL
+if FLUSH_POLICY not in FLUSH_POLICIES:
+    raise ValueError(f"Unknown SSD_FLUSH_POLICY: {FLUSH_POLICY}")
+FLUSH_SIZE = _env_int("SSD_FLUSH_SIZE", 1)
+FLUSH_IDLE_MS = _env_int("SSD_FLUSH_IDLE_MS", 0)
+FLUSH_MAX_AGE_MS = _env_int("SSD_FLUSH_MAX_AGE_MS", 0)
+FLUSH_MISS_RATE = _env_float("SSD_FLUSH_MISS_RATE", 0.0)
+
+DRIVER = os.environ.get("SSD_DRIVER") or "subprocess"
+SOCKET_PATH = os.environ.get("SSD_SOCKET") or None
+
+
+def socket_path() -> str:
+    """데몬 socket 경로. 따로 지정하지 않으면 DATA_DIR 아래 ssd.sock 을 씁니다."""
+    return SOCKET_PATH or os.path.join(DATA_DIR, "ssd.sock")
+
+
+def as_env() -> dict:
+    """현재 설정을 ssd.py 하위 프로세스에 넘길 환경 변수로 만듭니다."""
+    env = dict(os.environ)
+    env.update({
+        "SSD_LBA_COUNT": str(LBA_COUNT),
+        "SSD_MAX_ERASE_SIZE": str(MAX_ERASE_SIZE),
+        "SSD_BUFFER_DEPTH": str(BUFFER_DEPTH),
+        "SSD_NAND_BACKEND": NAND_BACKEND,
+        "SSD_DATA_DIR": DATA_DIR,
+        "SSD_FULL_VERIFY": "1" if FULL_VERIFY else "0",
+        "SSD_DURABILITY": DURABILITY,
+        "SSD_FLUSH_POLICY": FLUSH_POLICY,
+        "SSD_FLUSH_SIZE": str(FLUSH_SIZE),
+        "SSD_FLUSH_IDLE_MS": str(FLUSH_IDLE_MS),
+        "SSD_FLUSH_MAX_AGE_MS": str(FLUSH_MAX_AGE_MS),
+        "SSD_FLUSH_MISS_RATE": str(FLUSH_MISS_RATE),
+        "SSD_DRIVER": DRIVER,
+        "SSD_SOCKET": socket_path(),
+    })
+    return env
@@ -1,44 +1,469 @@
+import socket
 import subprocess
 import os
+import threading
+from abc import ABC, abstractmethod
+
+import ssd_config as config
+from flush_scheduler import start_flush_scheduler
 from logger import Logger
+from ssd_server import send_frame, recv_frame, PIPE_NEWLINE, RR_BYTES_PER_LBA
 from utils import get_class_and_method_name
 
 logger = Logger()
 
 ROOT_DIR = os.path.dirname(__file__)
+# 'python ssd.py' 는 스크립트를 매번 다시 컴파일하지만, -m 으로 실행하면 __pycache__ 의 .pyc 를 씁니다
+SSD_COMMAND = ['python', '-m', 'ssd']
 SUCCESS = 0
 ERROR = -1
+ERROR_STRING = 'ERROR'  # ssd.py 가 인자 오류 때 출력에 남기는 값
 
 
 class SSDDriver:
-    def run_cmd_to_ssd(self, command):
-        result = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True)
-        if result.returncode == 0:
+    def run_cmd_to_ssd(self, command, input: str = None):
+        returncode = self._run(command, input)
+        if returncode == 0:
             return SUCCESS
         else:
-            logger.print(get_class_and_method_name(), f"subprocess returned {result.returncode}")
+            logger.print(get_class_and_method_name(), f"subprocess returned {returncode}")
             return ERROR
 
+    def _run(self, command: list, input: str = None) -> int:
+        # ssd.py 가 shell 과 같은 장치 설정(geometry 등)을 쓰도록 환경 변수로 전달
+        result = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True, env=config.as_env(),
+                                input=input)
+        return result.returncode
+
     def run_ssd_write(self, address: str, value: str):
-        command = ['python', 'ssd.py', 'W', str(address), str(value)]
+        command = [*SSD_COMMAND, 'W', str(address), str(value)]
         return self.run_cmd_to_ssd(command)
 
     def run_ssd_erase(self, address: str, lba_size: str):
-        command = ['python', 'ssd.py', 'E', str(address), str(lba_size)]
+        command = [*SSD_COMMAND, 'E', str(address), str(lba_size)]
         return self.run_cmd_to_ssd(command)
 
     def run_ssd_read(self, address: str):
-        command = ['python', 'ssd.py', 'R', str(address)]
+        command = [*SSD_COMMAND, 'R', str(address)]
         return self.run_cmd_to_ssd(command)
 
     def run_ssd_flush(self):
-        command = ['python', 'ssd.py', 'F']
+        command = [*SSD_COMMAND, 'F']
         return self.run_cmd_to_ssd(command)
 
-    def get_ssd_output(self, file_path: str = ROOT_DIR + "/ssd_output.txt"):
+    def run_ssd_fill(self, start: str, count: str, pattern: str, arg: str):
+        """start 부터 count 개 LBA 를 패턴(const / inc / random)으로 한 번에 채웁니다."""
+        command = [*SSD_COMMAND, 'FILL', str(start), str(count), pattern, str(arg)]
+        return self.run_cmd_to_ssd(command)
+
+    def run_ssd_range_read(self, start: str, count: str) -> list[str] | None:
+        """start 부터 count 개 LBA 를 한 번에 읽어 목록으로 돌려줍니다. 실패하면 None."""
+        command = [*SSD_COMMAND, 'RR', str(start), str(count)]
+        if self.run_cmd_to_ssd(command) == ERROR:
+            return None
+        return _range_outputs(self._read_output_lines())
+
+    def run_ssd_batch(self, commands: list):
+        """[['W', 3, '0x..'], ['R', 3], ...] 를 ssd.py 프로세스 하나에서 수행합니다."""
+        script = "".join(" ".join(str(arg) for arg in cmd) + "\n" for cmd in commands)
+        command = [*SSD_COMMAND, 'BATCH']
+        return self.run_cmd_to_ssd(command, input=script)
+
+    def get_ssd_output(self, file_path: str = None):
+        if file_path is None:
+            file_path = os.path.join(config.DATA_DIR, "ssd_output.txt")
         with open(file_path, 'r', encoding='utf-8') as f:
             line = f.readline().rstrip("\n")
 
         if len(line) != 10:
             raise ValueError(f"Error, value Length: {len(line)})")
         return line
+
+    def get_ssd_outputs(self, file_path: str = None) -> list[str]:
+        """run_ssd_batch 의 출력(R 결과)을 순서대로 돌려줍니다."""
+        return _check_outputs(self._read_output_lines(file_path))
+
+    def _read_output_lines(self, file_path: str = None) -> list[str]:
+        if file_path is None:
+            file_path = os.path.join(config.DATA_DIR, "ssd_output.txt")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+
+
+def _check_outputs(lines: list[str]) -> list[str]:
+    for line in lines:
+        if len(line) != 10:
+            raise ValueError(f"Error, value Length: {len(line)})")
+    return lines
+
+
+def _range_outputs(lines: list[str]) -> list[str] | None:
+    """RR 출력 줄을 확인합니다. 범위를 벗어난 RR 은 ERROR 한 줄을 남기므로 None."""
+    if ERROR_STRING in lines:
+        logger.print(get_class_and_method_name(), "ssd returned ERROR for range read")
+        return None
+    return _check_outputs(lines)
+
+
+class ForkServerSSDDriver(SSDDriver):
+    """
+    SSDDriver 와 같이 명령마다 프로세스를 따로 쓰지만, 미리 ssd 를 import 해 둔 launcher 에서
+    fork 한 자식으로 실행해 인터프리터 기동 비용을 없앤 드라이버 (ssd_forkserver 참고).
+    출력은 SSDDriver 와 같이 ssd_output.txt 로 받고, fork 를 쓸 수 없으면 SSDDriver 와 똑같이 동작합니다.
+    """
+
+    def __init__(self):
+        self._server = None
+
+    def _run(self, command: list, input: str = None) -> int:
+        if not hasattr(os, 'fork'):
+            return super()._run(command, input)
+
+        env = config.as_env()
+        if self._server is None or self._server.env != env:
+            self.close()  # 설정이 바뀌면 launcher 를 새 설정으로 다시 띄움
+            from ssd_forkserver import ForkServer
+            self._server = ForkServer(env, ROOT_DIR)
+
+        returncode = self._server.run(command[len(SSD_COMMAND):], input)
+        if returncode is None:  # launcher 가 죽었으면 이번 명령은 새 프로세스로
+            self.close()
+            return super()._run(command, input)
+        return returncode
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+
+class ResultSSDDriver(SSDDriver, ABC):
+    """
+    ssd_output.txt 를 거치지 않고 R 결과를 바로 돌려받는 드라이버의 공통 부분.
+    하위 클래스는 _execute() 로 명령 하나를 수행해 "OK ..." / "FAIL ..." 응답을 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._output = None
+        self._outputs = []
+
+    @abstractmethod
+    def _execute(self, command: list) -> str | None:
+        pass
+
+    def _execute_all(self, commands: list):
+        """명령을 차례로 수행하며 응답을 하나씩 돌려줍니다. 소비하는 쪽이 멈추면 남은 명령은 수행하지 않습니다."""
+        for command in commands:
+            yield self._execute([str(arg) for arg in command])
+
+    def run_cmd_to_ssd(self, command):
+        response = self._execute([str(arg) for arg in command])
+        if response is None or not response.startswith("OK"):
+            logger.print(get_class_and_method_name(), f"ssd returned {response}")
+            return ERROR
+        if len(response) > 2:
+            self._output = response[3:]
+        return SUCCESS
+
+    def run_ssd_write(self, address: str, value: str):
+        return self.run_cmd_to_ssd(['W', address, value])
+
+    def run_ssd_erase(self, address: str, lba_size: str):
+        return self.run_cmd_to_ssd(['E', address, lba_size])
+
+    def run_ssd_read(self, address: str):
+        return self.run_cmd_to_ssd(['R', address])
+
+    def run_ssd_flush(self):
+        return self.run_cmd_to_ssd(['F'])
+
+    def run_ssd_fill(self, start: str, count: str, pattern: str, arg: str):
+        return self.run_cmd_to_ssd(['FILL', start, count, pattern, arg])
+
+    def run_ssd_range_read(self, start: str, count: str) -> list[str] | None:
+        if self.run_cmd_to_ssd(['RR', start, count]) == ERROR:
+            return None
+        return _range_outputs(self._output.split('\n'))
+
+    def run_ssd_batch(self, commands: list):
+        self._outputs = []
+        for response in self._execute_all(commands):
+            if response is None or not response.startswith("OK"):
+                logger.print(get_class_and_method_name(), f"ssd returned {response}")
+                return ERROR
+            if len(response) > 2:
+                self._output = response[3:]
+                self._outputs += self._output.split('\n')  # RR 은 여러 줄
+        return SUCCESS
+
+    def get_ssd_output(self, file_path: str = None):
+        if file_path is not None:
+            return super().get_ssd_output(file_path)
+
+        line = self._output or ""
+        if len(line) != 10:
+            raise ValueError(f"Error, value Length: {len(line)})")
+        return line
+
+    def get_ssd_outputs(self, file_path: str = None) -> list[str]:
+        if file_path is not None:
+            return super().get_ssd_outputs(file_path)
+        return _check_outputs(list(self._outputs))
+
+
+class SocketSSDDriver(ResultSSDDriver):
+    """ssd.py serve 데몬에 Unix socket 으로 명령을 보내는 드라이버. 연결은 한 번 열어 재사용합니다."""
+
+    def __init__(self, socket_path: str = None):
+        super().__init__()
+        self._socket_path = socket_path or config.socket_path()
+        self._sock = None
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self._sock.connect(self._socket_path)
+            except OSError:
+                self._sock.close()
+                self._sock = None
+                raise
+        return self._sock
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def request(self, *args) -> str | None:
+        """요청 하나를 보내고 응답 본문을 돌려줍니다. 데몬과 통신할 수 없으면 None."""
+        try:
+            sock = self._connect()
+            send_frame(sock, " ".join(str(arg) for arg in args))
+            response = recv_frame(sock)
+        except OSError as e:
+            logger.print(get_class_and_method_name(), f"ssd daemon unavailable: {e}")
+            self.close()
+            return None
+        except ValueError as e:
+            # 읽지 못한 본문이 남아 다음 응답과 어긋나므로 연결을 버림 (다음 요청에서 다시 연결)
+            logger.print(get_class_and_method_name(), f"bad frame from ssd daemon: {e}")
+            self.close()
+            return None
+        if response is None:
+            self.close()
+        return response
+
+    def _execute(self, command: list) -> str | None:
+        return self.request(*command)
+
+    def shutdown_server(self):
+        self.request('SHUTDOWN')
+        self.close()
+
+
+class PipelinedSSDDriver(ResultSSDDriver):
+    """
+    드라이버가 띄운 상주 자식 프로세스 하나와 명령을 주고받는 드라이버의 공통 부분.
+    자식이 죽거나 설정이 바뀌면 다시 띄우고, 배치는 응답을 기다리지 않고 PIPELINE_DEPTH 개까지 먼저 보내므로
+    중간에 실패한 명령 뒤의 명령도 이미 수행되었을 수 있습니다 (결과는 실패 전까지만 모음).
+    하위 클래스는 _open / _alive / _send / _receive / _shutdown 으로 채널을 다룹니다.
+    """
+    PIPELINE_DEPTH = 64
+
+    def __init__(self):
+        super().__init__()
+        self._channel = None
+        self._env = None
+
+    @abstractmethod
+    def _open(self, env: dict):
+        pass
+
+    @abstractmethod
+    def _alive(self, channel) -> bool:
+        pass
+
+    @abstractmethod
+    def _send(self, channel, request: str) -> None:
+        pass
+
+    def _flush(self, channel) -> None:
+        pass
+
+    @abstractmethod
+    def _receive(self, channel) -> str | None:
+        """응답 하나를 읽습니다. 자식이 끝났으면 None."""
+        pass
+
+    @abstractmethod
+    def _shutdown(self, channel) -> None:
+        pass
+
+    def _connect(self):
+        env = config.as_env()
+        if self._channel is not None and (self._env != env or not self._alive(self._channel)):
+            self.close()
+        if self._channel is None:
+            self._env = env
+            self._channel = self._open(env)
+        return self._channel
+
+    def _execute(self, command: list) -> str | None:
+        return next(self._execute_all([command]))
+
+    def _execute_all(self, commands: list):
+        channel = self._connect()
+        sent = received = 0
+        rejected = None
+        try:
+            while received < len(commands):
+                while rejected is None and sent < len(commands) and sent - received < self.PIPELINE_DEPTH:
+                    try:
+                        self._send(channel, " ".join(str(arg) for arg in commands[sent]))
+                    except ValueError as e:
+                        rejected = e  # 채널에 쓰기 전에 거절된 요청 (ring 슬롯보다 긴 요청 등): 채널은 그대로 씀
+                        break
+                    sent += 1
+                if received == sent:
+                    # 앞서 보낸 명령의 응답을 다 돌려준 뒤, 거절된 명령부터는 실패로 처리
+                    logger.print(get_class_and_method_name(), f"ssd request rejected: {rejected}")
+                    yield from [None] * (len(commands) - received)
+                    return
+                self._flush(channel)
+                response = self._receive(channel)
+                if response is None:
+                    raise EOFError("ssd child exited")
+                received += 1
+                yield response
+        except (OSError, EOFError) as e:
+            logger.print(get_class_and_method_name(), f"ssd child unavailable: {e}")
+            self.close()
+            yield from [None] * (len(commands) - received)
+        finally:
+            if self._channel is channel and sent > received:
+                # 소비하는 쪽이 중간에 멈췄으면 이미 보낸 명령의 응답을 버려 다음 요청과 짝이 맞게 함
+                for _ in range(sent - received):
+                    self._receive(channel)
+
+    def close(self):
+        """자식이 버퍼 상태를 정리하고 끝날 때까지 기다립니다."""
+        if self._channel is not None:
+            channel, self._channel = self._channel, None
+            self._shutdown(channel)
+
+
+class PipeSSDDriver(PipelinedSSDDriver):
+    """
+    python -m ssd pipe 자식 프로세스 하나를 띄워 두고 stdin / stdout 으로 한 줄씩 명령을 주고받는 드라이버.
+    socket 경로나 데몬 관리 없이 드라이버가 자식의 수명을 가집니다.
+    """
+
+    def _open(self, env: dict) -> subprocess.Popen:
+        return subprocess.Popen([*SSD_COMMAND, 'PIPE'], cwd=ROOT_DIR, env=env, text=True, bufsize=1,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def _alive(self, proc: subprocess.Popen) -> bool:
+        return proc.poll() is None
+
+    def _send(self, proc: subprocess.Popen, request: str) -> None:
+        proc.stdin.write(request + "\n")
+
+    def _flush(self, proc: subprocess.Popen) -> None:
+        proc.stdin.flush()
+
+    def _receive(self, proc: subprocess.Popen) -> str | None:
+        line = proc.stdout.readline()
+        if not line:
+            return None
+        return line.rstrip("\n").replace(PIPE_NEWLINE, "\n")
+
+    def _shutdown(self, proc: subprocess.Popen) -> None:
+        try:
+            proc.stdin.close()  # 자식은 stdin EOF 를 받고 종료
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+
+class RingSSDDriver(PipelinedSSDDriver):
+    """
+    shared memory 의 SQ / CQ ring 으로 상주 SSD 프로세스와 명령을 주고받는 드라이버 (ssd_ring 참고).
+    명령마다 socket / pipe 시스템 콜이 없어 장치 엔진 자체의 한계를 잴 때 씁니다.
+    CQ 레코드는 작은 고정 크기이고, 장치 전체 RR 결과도 들어가도록 공유 payload 하나만 LBA 개수에 맞춥니다.
+    """
+
+    def _open(self, env: dict):
+        from ssd_ring import Ring, PAYLOAD_SIZE
+
+        return Ring(env, ROOT_DIR, payload_size=max(PAYLOAD_SIZE, RR_BYTES_PER_LBA * config.LBA_COUNT + 16))
+
+    def _alive(self, ring) -> bool:
+        return ring.alive()
+
+    def _send(self, ring, request: str) -> None:
+        ring.submit(request)
+
+    def _receive(self, ring) -> str | None:
+        return ring.complete()
+
+    def _shutdown(self, ring) -> None:
+        ring.close()
+
+
+class InProcessSSDDriver(ResultSSDDriver):
+    """
+    SSD / CommandInvoker 를 같은 프로세스에서 직접 호출하는 드라이버.
+    CLI 와 같은 execute_command() 를 쓰므로 buffering, fast read, ignore, merge 동작이 같습니다.
+    기본 Invoker 는 AsyncCommandInvoker 라서 버퍼가 가득 찬 flush 는 백그라운드에서 수행됩니다.
+    버퍼는 메모리에 유지되므로 같은 SSD_DATA_DIR 에 다른 프로세스가 동시에 접근하면 안 됩니다.
+    """
+
+    def __init__(self, ssd=None, invoker=None):
+        super().__init__()
+        from ssd import SSD, AsyncCommandInvoker
+
+        self._ssd = ssd or SSD()
+        self._invoker = invoker or AsyncCommandInvoker(self._ssd)
+        self._lock = threading.Lock()
+        self._scheduler = start_flush_scheduler(self._invoker, lock=self._lock)
+
+    @property
+    def invoker(self):
+        return self._invoker
+
+    def _execute(self, command: list) -> str | None:
+        from ssd import handle_request
+
+        with self._lock:
+            return handle_request(self._ssd, self._invoker, command)
+
+    def close(self):
+        """flush 스케줄러를 멈추고 백그라운드 flush 가 끝날 때까지 기다립니다."""
+        if self._scheduler is not None:
+            self._scheduler.stop()
+            self._scheduler = None
+        self._invoker.close()
+
+
+SSD_DRIVERS = {
+    'subprocess': SSDDriver,
+    'forkserver': ForkServerSSDDriver,
+    'socket': SocketSSDDriver,
+    'pipe': PipeSSDDriver,
+    'ring': RingSSDDriver,
+    'inprocess': InProcessSSDDriver,
+}
+
+
+def create_ssd_driver(name: str = None):
+    """SSD_DRIVER 설정(또는 name)에 맞는 드라이버를 만듭니다."""
+    name = name or config.DRIVER
+    if name not in SSD_DRIVERS:
+        raise ValueError(f"Unknown SSD driver: {name}")
+    return SSD_DRIVERS[name]()
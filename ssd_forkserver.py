@@ -0,0 +1,117 @@
+"""
+명령마다 프로세스를 따로 쓰되 인터프리터 기동 비용은 없애는 forkserver.
+
+launcher 프로세스(python -m ssd_forkserver <fd>)가 ssd 와 관련 모듈을 한 번만 import 해 두고,
+명령이 올 때마다 fork 한 자식에서 ssd.main() 을 실행합니다. 자식은 `python -m ssd ...` 와 같은
+상태(SSD 인스턴스 없음, 같은 설정)에서 시작하고 끝나면 사라지므로, 명령 사이의 격리(크래시 포함)는
+subprocess 실행과 같고 출력 파일과 exit code 도 CLI 와 같습니다.
+
+launcher 와는 socketpair 로 ssd_server 와 같은 프레임을 주고받습니다.
+
+    요청  프레임 2개: 인자를 '\\0' 로 이은 문자열, stdin 으로 넘길 내용 (BATCH 용, 없으면 빈 문자열)
+    응답  프레임 1개: 자식의 exit code (signal 로 죽었으면 subprocess 처럼 음수)
+
+설정(SSD_DATA_DIR 등)은 launcher 를 띄울 때의 환경 변수로 정해지므로, 설정이 바뀌면 launcher 를 다시 띄웁니다.
+"""
+import io
+import os
+import socket
+import subprocess
+import sys
+import traceback
+
+from ssd_server import send_frame, recv_frame
+
+# 자식이 명령을 처리하면서 import 할 모듈까지 launcher 에서 미리 import 해 둠
+PRELOAD_MODULES = ("ssd", "ssd_config", "command_journal", "file_handler", "nand_storage", "json", "random", "heapq")
+
+
+def _exit_code(code) -> int:
+    """SystemExit.code 를 인터프리터가 종료할 때와 같은 exit code 로 바꿉니다."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_child(args: list[str], stdin: str) -> int:
+    import ssd
+
+    sys.argv = ["ssd.py", *args]
+    sys.stdin = io.StringIO(stdin)
+    try:
+        ssd.main()
+        code = 0
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return code
+
+
+def serve(sock: socket.socket) -> None:
+    """요청마다 자식을 fork 해서 수행하고 exit code 를 돌려줍니다. 상대가 socket 을 닫으면 끝납니다."""
+    for name in PRELOAD_MODULES:
+        __import__(name)
+
+    while True:
+        request = recv_frame(sock)
+        stdin = recv_frame(sock) if request is not None else None
+        if stdin is None:
+            return
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            os._exit(_run_child(request.split("\0"), stdin))
+        _, status = os.waitpid(pid, 0)
+        send_frame(sock, str(os.waitstatus_to_exitcode(status)))
+
+
+class ForkServer:
+    """launcher 프로세스 하나를 띄우고 명령을 보내는 쪽."""
+
+    def __init__(self, env: dict, cwd: str):
+        self.env = env
+        self._sock, child_sock = socket.socketpair()
+        with child_sock:
+            self._proc = subprocess.Popen(
+                [sys.executable, "-m", "ssd_forkserver", str(child_sock.fileno())],
+                cwd=cwd, env=env, pass_fds=(child_sock.fileno(),),
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    def run(self, args: list[str], stdin: str = None) -> int | None:
+        """명령 하나를 수행하고 exit code 를 돌려줍니다. launcher 와 통신할 수 없으면 None."""
+        try:
+            send_frame(self._sock, "\0".join(str(arg) for arg in args))
+            send_frame(self._sock, stdin or "")
+            response = recv_frame(self._sock)
+        except OSError:
+            return None
+        return int(response) if response is not None else None
+
+    def close(self) -> None:
+        self._sock.close()  # launcher 는 EOF 를 받고 종료
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    with sock:
+        serve(sock)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+shared memory 의 SQ / CQ ring 으로 명령을 주고받는 상주 SSD 프로세스 (RingSSDDriver 용).
+
+드라이버가 shared memory 를 만들고 python -m ssd_ring <name> <payload_size> <sq_bell> <cq_bell> 로 프로세스를 띄웁니다.
+명령은 socket / pipe 를 거치지 않고 shared memory 에 직접 쓰고 읽으므로, 명령마다의 시스템 콜 없이
+SSD / CommandInvoker 자체의 처리량을 잴 수 있습니다.
+
+    header   sq_head, sq_tail, cq_head, cq_tail, server_waiting, client_waiting, payload_busy (uint32)
+    SQ       DEPTH 개의 SQ_SLOT byte 레코드: 길이 1 byte + 요청 ("W 3 0x00000001")
+    CQ       DEPTH 개의 CQ_SLOT byte 레코드: 길이 4 byte + 응답 (ssd_server 와 같은 "OK ..." / "FAIL ...")
+    payload  payload_size byte 하나: CQ 레코드에 들어가지 않는 응답(장치 전체 RR 등)의 본문
+
+CQ 레코드는 작은 고정 크기라 LBA 수가 늘어도 ring 크기는 DEPTH 와 무관하게 payload 하나만큼만 늘어납니다.
+큰 응답은 payload 에 쓰고 CQ 레코드 길이에 PAYLOAD_FLAG 를 켭니다. payload 는 하나뿐이므로 서버는
+payload_busy 를 켜고 쓰며, 드라이버가 응답을 꺼내고 끌 때까지 다음 큰 응답을 기다립니다.
+응답은 shared memory 에서 바로 str 로 decode 합니다 (드라이버가 str 로 다루므로 이 decode 가 유일한 복사).
+
+큐마다 쓰는 쪽은 하나라서 lock 없이 레코드를 채운 뒤 tail 을 올리고, 읽는 쪽은 레코드를 다 쓴 뒤 head 를 올립니다.
+이는 레코드(와 payload)에 쓴 내용이 tail / payload_busy 보다 먼저 상대에게 보인다고 가정합니다.
+x86 처럼 store 순서를 지키는 CPU 에서는 성립하지만, ARM / POWER 처럼 메모리 순서가 약한 CPU 에서는
+store barrier 가 필요합니다 (순수 Python 에는 barrier 가 없으므로 그런 CPU 에서는 pipe / socket 드라이버를 쓰세요).
+기다리는 쪽은 SPIN_COUNT 번 tail 을 확인한 뒤(CPU 가 하나면 바로) waiting 을 켜고 doorbell(pipe)에서 잠들며,
+채우는 쪽은 상대의 waiting 이 켜져 있을 때만 doorbell 에 1 byte 를 씁니다.
+doorbell 이 EOF 면 상대 프로세스가 끝난 것이므로 서버는 드라이버가 사라지면 버퍼 상태를 정리하고 종료합니다.
+"""
+import os
+import select
+import struct
+import subprocess
+import sys
+from multiprocessing import shared_memory
+
+DEPTH = 64  # RingSSDDriver.PIPELINE_DEPTH 이상이어야 함
+SQ_SLOT = 64
+CQ_SLOT = 256
+PAYLOAD_SIZE = 4096
+PAYLOAD_FLAG = 0x80000000  # CQ 레코드 길이의 최상위 bit: 본문이 payload 에 있음
+SPIN_COUNT = 1000 if (os.cpu_count() or 1) > 1 else 0  # CPU 가 하나면 spin 이 상대의 실행 시간만 빼앗음
+BLOCK_TIMEOUT = 0.05  # waiting 과 doorbell 이 엇갈려 깨우지 못했을 때 다시 확인하는 주기 (초)
+
+_U32 = struct.Struct('<I')
+_MASK = 0xFFFFFFFF
+SQ_HEAD, SQ_TAIL, CQ_HEAD, CQ_TAIL, SERVER_WAITING, CLIENT_WAITING, PAYLOAD_BUSY = range(0, 28, 4)
+HEADER_SIZE = 64
+SQ_OFFSET = HEADER_SIZE
+CQ_OFFSET = SQ_OFFSET + DEPTH * SQ_SLOT
+PAYLOAD_OFFSET = CQ_OFFSET + DEPTH * CQ_SLOT
+
+
+def ring_size(payload_size: int = PAYLOAD_SIZE) -> int:
+    return PAYLOAD_OFFSET + payload_size
+
+
+def _get(buf, offset: int) -> int:
+    return _U32.unpack_from(buf, offset)[0]
+
+
+def _set(buf, offset: int, value: int) -> None:
+    _U32.pack_into(buf, offset, value & _MASK)
+
+
+class _Doorbell:
+    """한쪽 끝: 상대가 큐를 채우기를 기다리고, 큐를 채운 뒤 기다리는 상대를 깨웁니다."""
+
+    def __init__(self, buf, bell_in: int, bell_out: int, waiting: int, peer_waiting: int):
+        self._buf = buf
+        self._bell_in = bell_in
+        self._bell_out = bell_out
+        self._waiting = waiting
+        self._peer_waiting = peer_waiting
+
+    def wait(self, ready) -> bool:
+        """ready() 가 참이 될 때까지 기다립니다. 상대가 끝났으면 False."""
+        for _ in range(SPIN_COUNT):
+            if ready():
+                return True
+        while True:
+            _set(self._buf, self._waiting, 1)
+            try:
+                if ready():
+                    return True
+                readable, _, _ = select.select([self._bell_in], [], [], BLOCK_TIMEOUT)
+                if readable and not os.read(self._bell_in, 4096):
+                    return ready()
+            finally:
+                _set(self._buf, self._waiting, 0)
+
+    def ring(self) -> None:
+        if _get(self._buf, self._peer_waiting):
+            os.write(self._bell_out, b'\0')
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(name)
+    # 3.12 까지는 붙기만 한 쪽도 resource tracker 에 등록되어 종료할 때 지워 버리므로, 만든 쪽(드라이버)만 관리
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def serve(name: str, payload_size: int, sq_bell: int, cq_bell: int) -> None:
+    """SQ 의 요청을 차례로 처리해 CQ 에 응답을 씁니다. 드라이버가 doorbell 을 닫으면 끝납니다."""
+    from flush_scheduler import start_flush_scheduler
+    from ssd import SSD, AsyncCommandInvoker, handle_request
+    import threading
+
+    shm = _attach(name)
+    buf = shm.buf
+    doorbell = _Doorbell(buf, sq_bell, cq_bell, SERVER_WAITING, CLIENT_WAITING)
+
+    ssd = SSD()
+    invoker = AsyncCommandInvoker(ssd)
+    lock = threading.Lock()
+    scheduler = start_flush_scheduler(invoker, lock=lock)
+    head = _get(buf, SQ_HEAD)
+    tail = _get(buf, CQ_TAIL)
+    try:
+        while doorbell.wait(lambda: _get(buf, SQ_TAIL) != head):
+            slot = SQ_OFFSET + head % DEPTH * SQ_SLOT
+            request = str(buf[slot + 1:slot + 1 + buf[slot]], 'utf-8')
+            head = (head + 1) & _MASK
+            _set(buf, SQ_HEAD, head)
+
+            with lock:
+                response = handle_request(ssd, invoker, request.split())
+            payload = response.encode('utf-8')
+            if len(payload) > payload_size:
+                payload = b"FAIL response too large"
+            slot = CQ_OFFSET + tail % DEPTH * CQ_SLOT
+            if len(payload) <= CQ_SLOT - _U32.size:
+                _set(buf, slot, len(payload))
+                buf[slot + _U32.size:slot + _U32.size + len(payload)] = payload
+            else:
+                # 앞선 큰 응답을 드라이버가 꺼낼 때까지 기다림 (그 응답은 이미 CQ 에 있으므로 막히지 않음)
+                if not doorbell.wait(lambda: not _get(buf, PAYLOAD_BUSY)):
+                    break
+                buf[PAYLOAD_OFFSET:PAYLOAD_OFFSET + len(payload)] = payload
+                _set(buf, PAYLOAD_BUSY, 1)
+                _set(buf, slot, PAYLOAD_FLAG | len(payload))
+            tail = (tail + 1) & _MASK
+            _set(buf, CQ_TAIL, tail)
+            doorbell.ring()
+    except OSError:
+        pass  # 드라이버가 먼저 끝나 doorbell 이 닫힘
+    finally:
+        if scheduler is not None:
+            scheduler.stop()
+        invoker.close()
+        del buf
+        shm.close()
+
+
+class Ring:
+    """shared memory 를 만들고 서버 프로세스를 띄워 요청을 넣고 응답을 꺼내는 쪽."""
+
+    def __init__(self, env: dict, cwd: str, payload_size: int = PAYLOAD_SIZE):
+        self.env = env
+        self._shm = shared_memory.SharedMemory(create=True, size=ring_size(payload_size))
+        sq_bell_in, self._sq_bell = os.pipe()
+        self._cq_bell, cq_bell_out = os.pipe()
+        try:
+            self._proc = subprocess.Popen(
+                [sys.executable, "-m", "ssd_ring", self._shm.name, str(payload_size), str(sq_bell_in), str(cq_bell_out)],
+                cwd=cwd, env=env, pass_fds=(sq_bell_in, cq_bell_out),
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        finally:
+            os.close(sq_bell_in)
+            os.close(cq_bell_out)
+        self._doorbell = _Doorbell(self._shm.buf, self._cq_bell, self._sq_bell, CLIENT_WAITING, SERVER_WAITING)
+        self._sq_tail = 0
+        self._cq_head = 0
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def submit(self, request: str) -> None:
+        """요청 하나를 SQ 에 넣습니다. 응답을 꺼내지 않은 요청은 DEPTH 개를 넘으면 안 됩니다."""
+        payload = request.encode('utf-8')
+        if len(payload) >= SQ_SLOT:
+            raise ValueError(f"request too large: {request}")
+        buf = self._shm.buf
+        slot = SQ_OFFSET + self._sq_tail % DEPTH * SQ_SLOT
+        buf[slot] = len(payload)
+        buf[slot + 1:slot + 1 + len(payload)] = payload
+        self._sq_tail = (self._sq_tail + 1) & _MASK
+        _set(buf, SQ_TAIL, self._sq_tail)
+        self._doorbell.ring()
+
+    def complete(self) -> str | None:
+        """CQ 에서 응답 하나를 꺼냅니다. 서버가 끝났으면 None."""
+        buf = self._shm.buf
+        if not self._doorbell.wait(lambda: _get(buf, CQ_TAIL) != self._cq_head):
+            return None
+        slot = CQ_OFFSET + self._cq_head % DEPTH * CQ_SLOT
+        length = _get(buf, slot)
+        if length & PAYLOAD_FLAG:
+            length &= ~PAYLOAD_FLAG
+            response = str(buf[PAYLOAD_OFFSET:PAYLOAD_OFFSET + length], 'utf-8')  # shared memory 에서 바로 decode
+            _set(buf, PAYLOAD_BUSY, 0)
+            self._doorbell.ring()  # payload 가 비기를 기다리는 서버를 깨움
+        else:
+            start = slot + _U32.size
+            response = str(buf[start:start + length], 'utf-8')
+        self._cq_head = (self._cq_head + 1) & _MASK
+        _set(buf, CQ_HEAD, self._cq_head)
+        return response
+
+    def close(self) -> None:
+        os.close(self._sq_bell)  # 서버는 doorbell EOF 를 받고 종료
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        os.close(self._cq_bell)
+        self._doorbell = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+def main():
+    serve(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]))
+
+
+if __name__ == "__main__":
+    main()
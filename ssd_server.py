@@ -0,0 +1,152 @@
+"""
+ssd.py serve: SSD / CommandInvoker 를 메모리에 띄워 두고 Unix domain socket 으로 명령을 받는 데몬.
+
+명령마다 python ssd.py 를 새로 띄우면 인터프리터 기동 + SSD() 초기화 + 버퍼 복구가 매번 반복됩니다.
+데몬은 이 상태를 한 번만 만들고, 요청은 연결 하나에서 계속 주고받습니다.
+
+프레임: 4 byte big-endian 길이 + UTF-8 본문
+
+    요청  "W 3 0x00000001" / "R 3" / "E 0 10" / "F" / "STATS" / "SHUTDOWN"
+    응답  "OK"                : 출력 없이 수행됨 (W / E / F)
+          "OK <출력>"         : ssd_output.txt 에 남았을 내용 (R 결과, 인자 오류 시 ERROR)
+          "FAIL <사유>"       : 알 수 없는 명령 등 (CLI 의 exit code 1 에 해당)
+
+ssd.py pipe 는 같은 요청 / 응답을 socket 대신 stdin / stdout 으로 한 줄씩 주고받는 coprocess 모드입니다.
+응답 안의 줄바꿈(RR 결과)은 PIPE_NEWLINE 으로 바꿔 보내므로 응답 하나는 항상 한 줄입니다.
+"""
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+
+import ssd_config as config
+
+_LENGTH = struct.Struct('>I')
+MAX_FRAME_SIZE = 1 << 20
+RR_BYTES_PER_LBA = 11  # RR 응답에서 LBA 하나가 차지하는 크기 ('0x........' + 구분자)
+PIPE_NEWLINE = '\t'
+
+
+def send_frame(sock: socket.socket, text: str) -> None:
+    payload = text.encode('utf-8')
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes | None:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def max_frame_size() -> int:
+    """받을 수 있는 프레임 크기 한도. 장치 전체를 읽는 RR 응답도 들어가도록 LBA 수에 맞춰 늘립니다."""
+    return max(MAX_FRAME_SIZE, RR_BYTES_PER_LBA * config.LBA_COUNT + 64)
+
+
+def recv_frame(sock: socket.socket) -> str | None:
+    """프레임 하나를 읽습니다. 상대가 연결을 닫았으면 None, 한도를 넘는 프레임이면 ValueError."""
+    header = _recv_exact(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    if size > max_frame_size():
+        raise ValueError(f"frame too large: {size}")
+    payload = _recv_exact(sock, size)
+    if payload is None:
+        return None
+    return payload.decode('utf-8')
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            request = recv_frame(self.request)
+            if request is None:
+                return
+            send_frame(self.request, self.server.dispatch(request))
+
+
+class SSDServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """연결마다 스레드를 쓰지만 명령 수행은 lock 으로 한 번에 하나씩 처리합니다."""
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, ssd, invoker):
+        self._ssd = ssd
+        self._invoker = invoker
+        self._lock = threading.Lock()
+        super().__init__(socket_path, _RequestHandler)
+
+    def dispatch(self, request: str) -> str:
+        # ssd.py 를 import 하는 쪽에서만 쓰므로 순환 import 를 피해 여기서 가져옴
+        from ssd import handle_request
+
+        args = request.split()
+        if args and args[0].upper() == "SHUTDOWN":
+            threading.Thread(target=self.shutdown).start()
+            return "OK"
+
+        with self._lock:
+            return handle_request(self._ssd, self._invoker, args)
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(socket_path: str = None) -> None:
+    from flush_scheduler import start_flush_scheduler
+    from ssd import SSD, AsyncCommandInvoker
+
+    socket_path = socket_path or config.socket_path()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)  # 이전 데몬이 남긴 socket 파일
+
+    ssd = SSD()
+    invoker = AsyncCommandInvoker(ssd)  # 버퍼가 가득 찬 flush 는 백그라운드에서
+    server = SSDServer(socket_path, ssd, invoker)
+    scheduler = start_flush_scheduler(invoker, lock=server._lock)  # idle / age / read miss flush
+    signal.signal(signal.SIGTERM, _interrupt)  # kill 로 종료해도 socket 파일 정리
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if scheduler is not None:
+            scheduler.stop()
+        invoker.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def serve_pipe(stdin=None, stdout=None) -> None:
+    """stdin 에서 요청을 한 줄씩 읽어 응답을 한 줄씩 stdout 에 씁니다. stdin 이 닫히면 끝납니다."""
+    from flush_scheduler import start_flush_scheduler
+    from ssd import SSD, AsyncCommandInvoker, handle_request
+
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    saved_stdout, sys.stdout = sys.stdout, sys.stderr  # 명령이 print 한 내용이 응답 줄에 섞이지 않도록
+
+    ssd = SSD()
+    invoker = AsyncCommandInvoker(ssd)
+    lock = threading.Lock()
+    scheduler = start_flush_scheduler(invoker, lock=lock)
+    try:
+        for line in iter(stdin.readline, ''):
+            with lock:
+                response = handle_request(ssd, invoker, line.split())
+            stdout.write(response.replace('\n', PIPE_NEWLINE) + '\n')
+            stdout.flush()
+    finally:
+        if scheduler is not None:
+            scheduler.stop()
+        invoker.close()
+        sys.stdout = saved_stdout
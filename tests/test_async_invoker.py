@@ -0,0 +1,120 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from nand_storage import BinaryNandStorage
+from ssd import SSD, AsyncCommandInvoker, CommandInvoker, WriteCommand, EraseCommand, MAX_COMMANDS
+
+
+@pytest.fixture
+def blocked_ssd():
+    """end_batch 에서 release 가 set 될 때까지 멈추는 SSD (flush 가 진행 중인 상태를 만듦)."""
+    ssd = Mock(spec=SSD)
+    ssd._read_from_nand.return_value = "0xNANDNAND"
+    ssd._read_range_from_nand.side_effect = lambda lba, count: ["0xNANDNAND"] * count
+    ssd.release = threading.Event()
+    ssd.started = threading.Event()
+
+    def end_batch():
+        ssd.started.set()
+        assert ssd.release.wait(timeout=10)
+
+    ssd.end_batch.side_effect = end_batch
+    return ssd
+
+
+@pytest.fixture
+def invoker(blocked_ssd, tmp_path):
+    invoker = AsyncCommandInvoker(blocked_ssd, str(tmp_path))
+    yield invoker
+    blocked_ssd.release.set()
+    invoker.close()
+
+
+def _write(ssd, lba, value):
+    return WriteCommand(ssd, lba, f"0x{value:08X}")
+
+
+def test_full_buffer_is_flushed_in_background(blocked_ssd, invoker):
+    for lba in range(MAX_COMMANDS + 1):
+        invoker.add_command(_write(blocked_ssd, lba, lba + 1))  # 마지막 명령이 버퍼를 넘김
+
+    assert blocked_ssd.started.wait(timeout=10)
+    assert invoker.num_commands() == 1  # 쓰는 쪽은 flush 를 기다리지 않음
+    assert invoker.stats()['flushing'] == MAX_COMMANDS
+
+
+def test_fast_read_consults_both_buffers(blocked_ssd, invoker):
+    for lba in range(MAX_COMMANDS):
+        invoker.add_command(_write(blocked_ssd, lba, lba + 1))
+    invoker.add_command(_write(blocked_ssd, 10, 0xB))  # 버퍼를 넘겨 새 버퍼로
+    invoker.add_command(_write(blocked_ssd, 0, 0xA))
+    assert blocked_ssd.started.wait(timeout=10)
+
+    assert invoker.fast_read(0) == "0x0000000A"  # 현재 버퍼
+    assert invoker.fast_read(1) == "0x00000002"  # flushing 버퍼
+    assert invoker.fast_read(99) == "0xNANDNAND"
+    assert invoker.fast_read_range(0, 2) == ["0x0000000A", "0x00000002"]
+
+
+def test_backpressure_only_when_both_buffers_are_full(blocked_ssd, invoker):
+    for lba in range(MAX_COMMANDS * 2):
+        invoker.add_command(_write(blocked_ssd, lba, 1))
+    assert blocked_ssd.started.wait(timeout=10)
+
+    writer = threading.Thread(target=invoker.add_command, args=(_write(blocked_ssd, 50, 1),))
+    writer.start()
+    writer.join(timeout=0.2)
+    assert writer.is_alive()  # 두 버퍼가 모두 차서 기다리는 중
+
+    blocked_ssd.release.set()
+    writer.join(timeout=10)
+    assert not writer.is_alive()
+    assert invoker.num_commands() == 1
+
+
+def test_explicit_flush_waits_for_background_flush(blocked_ssd, invoker):
+    for lba in range(MAX_COMMANDS + 1):
+        invoker.add_command(_write(blocked_ssd, lba, 1))
+    assert blocked_ssd.started.wait(timeout=10)
+    blocked_ssd.release.set()
+
+    invoker.flush()
+
+    assert invoker.num_commands() == 0
+    assert invoker.stats()['flushes'] == 2
+    assert invoker.stats()['flushing'] == 0
+
+
+def test_journal_keeps_unflushed_commands(tmp_path):
+    SSD._instance = None
+    ssd = SSD(BinaryNandStorage(str(tmp_path / "nand.bin"), 100))
+    invoker = AsyncCommandInvoker(ssd, str(tmp_path / "buffer"))
+    for lba in range(MAX_COMMANDS + 2):
+        invoker.add_command(WriteCommand(ssd, lba, f"0x{lba + 1:08X}"))
+    invoker.add_command(EraseCommand(ssd, 0, 1))
+    invoker.close()
+
+    recovered = CommandInvoker(ssd, str(tmp_path / "buffer"))
+    values = recovered.fast_read_range(0, MAX_COMMANDS + 2)
+    SSD._instance = None
+
+    assert values[0] == "0x00000000"
+    assert values[1:] == [f"0x{lba + 1:08X}" for lba in range(1, MAX_COMMANDS + 2)]
+    assert recovered.num_commands() == 3  # flush 된 명령은 저널에서 빠짐
+
+
+def test_partial_flush_policy_in_background(blocked_ssd, tmp_path):
+    invoker = AsyncCommandInvoker(blocked_ssd, str(tmp_path), flush_policy="oldest", flush_size=2)
+    try:
+        for lba in range(MAX_COMMANDS + 1):
+            invoker.add_command(_write(blocked_ssd, lba, lba + 1))
+        assert blocked_ssd.started.wait(timeout=10)
+
+        assert invoker.stats()['flush_policy'] == "oldest"
+        assert invoker.stats()['flushing'] == 2  # 가장 오래된 두 명령만 백그라운드로
+        assert invoker.num_commands() == MAX_COMMANDS - 1
+    finally:
+        blocked_ssd.release.set()
+        invoker.close()
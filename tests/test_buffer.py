@@ -6,6 +6,7 @@ import shutil
 
 # 테스트할 클래스들을 import
 from ssd import (
+    CommandBuffer,
     CommandInvoker,
     ReadCommand,
     WriteCommand,
@@ -51,7 +52,7 @@ def test_add_one_write_command(mock_ssd):
     """TC2: WriteCommand를 하나 추가했을 때 버퍼가 올바르게 구성되는가?"""
     # ARRANGE: 테스트 준비
     invoker = CommandInvoker(mock_ssd)
-    cmd = WriteCommand(mock_ssd, 10, TEST_VALUE, 1)
+    cmd = WriteCommand(mock_ssd, 10, TEST_VALUE)
 
     # ACT: 테스트할 동작 실행
     invoker.add_command(cmd)
@@ -70,7 +71,7 @@ def test_add_one_erase_command(mock_ssd):
     # ARRANGE
     invoker = CommandInvoker(mock_ssd)
     invoker.flush()
-    cmd = EraseCommand(mock_ssd, 5, 5, 1)
+    cmd = EraseCommand(mock_ssd, 5, 5)
 
     # ACT
     invoker.add_command(cmd)
@@ -104,9 +105,9 @@ def test_add_multiple_commands(mock_ssd):
     """TC4: 여러 개의 커맨드를 순차적으로 추가했을 때 버퍼가 올바르게 쌓이는가?"""
     # ARRANGE & ACT
     invoker = CommandInvoker(mock_ssd)
-    invoker.add_command(WriteCommand(mock_ssd, 0, "0x11112222", 1))
-    invoker.add_command(WriteCommand(mock_ssd, 1, "0x22221111", 2))
-    invoker.add_command(EraseCommand(mock_ssd, 5, 10, 3))
+    invoker.add_command(WriteCommand(mock_ssd, 0, "0x11112222"))
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x22221111"))
+    invoker.add_command(EraseCommand(mock_ssd, 5, 10))
 
     # ASSERT
     assert invoker.num_commands() == 3
@@ -118,6 +119,27 @@ def test_add_multiple_commands(mock_ssd):
 
     assert buffer[1].address == 1
     assert buffer[2].address == 5
+    assert buffer[-1] is buffer[2]
+    assert list(buffer) == [buffer[0], buffer[1], buffer[2]]
+    with pytest.raises(IndexError):
+        buffer[3]
+
+
+def test_buffer_rejects_second_erase_at_same_start(mock_ssd):
+    """시작 LBA 가 같은 Erase 를 인덱스에서 덮어쓰지 않고 거절하는가?"""
+    buffer = CommandBuffer()
+    first = EraseCommand(mock_ssd, 5, 3)
+    buffer.append(first)
+
+    with pytest.raises(ValueError):
+        buffer.append(EraseCommand(mock_ssd, 5, 2))
+    other = EraseCommand(mock_ssd, 10, 2)
+    buffer.append(other)
+    with pytest.raises(ValueError):
+        buffer.resize_erase(other, 5, 7)
+
+    assert buffer.erase_at(6) is first
+    assert buffer.erase_at(11) is other
 
 
 def test_flush_executes_and_clears_buffer(mocker, mock_ssd):
@@ -125,10 +147,10 @@ def test_flush_executes_and_clears_buffer(mocker, mock_ssd):
     # ARRANGE
     # 각 커맨드 객체의 execute 메서드를 Mocking(감시)합니다.
     invoker = CommandInvoker(mock_ssd)
-    mock_write_cmd = WriteCommand(mock_ssd, 0, "0x11112222", 1)
-    mock_erase_cmd = EraseCommand(mock_ssd, 5, 10, 2)
-    mocker.spy(mock_write_cmd, "execute")
-    mocker.spy(mock_erase_cmd, "execute")
+    mock_write_cmd = WriteCommand(mock_ssd, 0, "0x11112222")
+    mock_erase_cmd = EraseCommand(mock_ssd, 5, 10)
+    write_execute = mocker.spy(WriteCommand, "execute")
+    erase_execute = mocker.spy(EraseCommand, "execute")
 
     invoker.add_command(mock_write_cmd)
     invoker.add_command(mock_erase_cmd)
@@ -140,8 +162,350 @@ def test_flush_executes_and_clears_buffer(mocker, mock_ssd):
 
     # ASSERT
     # 각 커맨드의 execute 메서드가 정확히 한 번씩 호출되었는지 확인
-    mock_write_cmd.execute.assert_called_once()
-    mock_erase_cmd.execute.assert_called_once()
+    write_execute.assert_called_once_with(mock_write_cmd)
+    erase_execute.assert_called_once_with(mock_erase_cmd)
+    mock_ssd.write.assert_called_once_with(0, 0x11112222)
+    mock_ssd.erase.assert_called_once_with(5, 10)
 
     # Flush 후 버퍼가 비워졌는지 확인
     assert invoker.num_commands() == 0
+
+
+def test_commands_have_no_instance_dict(mock_ssd):
+    """깊은 버퍼에서 명령마다 __dict__ 가 생기지 않도록 __slots__ 만 쓰는가?"""
+    for cmd in (WriteCommand(mock_ssd, 0, TEST_VALUE), EraseCommand(mock_ssd, 0, 1), ReadCommand(mock_ssd, 0)):
+        assert not hasattr(cmd, "__dict__")
+
+
+def test_flush_syncs_nand_once(mock_ssd):
+    """flush()는 모든 커맨드를 반영한 뒤 한 번만 NAND 를 sync(msync) 한다."""
+    invoker = CommandInvoker(mock_ssd)
+    invoker.add_command(WriteCommand(mock_ssd, 0, "0x11112222"))
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x33334444"))
+
+    invoker.flush()
+
+    mock_ssd.sync.assert_called_once()
+
+
+def test_flush_applies_buffer_in_one_batch(mock_ssd):
+    """flush()는 버퍼 명령을 begin_batch ~ end_batch 사이에서 실행한다 (NAND 쓰기는 end_batch 에서 한 번)."""
+    invoker = CommandInvoker(mock_ssd)
+    invoker.add_command(WriteCommand(mock_ssd, 0, "0x11112222"))
+    invoker.add_command(EraseCommand(mock_ssd, 5, 3))
+
+    invoker.flush()
+
+    assert [name for name, _, _ in mock_ssd.method_calls] == ["begin_batch", "write", "erase", "end_batch", "sync"]
+
+
+def test_flush_writes_coalesced_runs(tmp_path, mocker):
+    from nand_storage import BinaryNandStorage
+    SSD._instance = None
+    ssd = SSD(BinaryNandStorage(str(tmp_path / "nand.bin"), 100))
+    invoker = CommandInvoker(ssd, str(tmp_path / "buffer"))
+    write_runs = mocker.spy(ssd._storage, "write_runs")
+    erase = mocker.spy(ssd._storage, "erase")
+    for lba, value in [(3, "0x00000003"), (1, "0x00000001"), (90, "0x00000090"), (2, "0x00000002")]:
+        invoker.add_command(WriteCommand(ssd, lba, value))
+    invoker.add_command(EraseCommand(ssd, 4, 2))
+
+    invoker.flush()
+    SSD._instance = None
+
+    erase.assert_called_once_with(4, 2)  # Erase 는 LBA 별 값으로 펼치지 않고 구간 그대로
+    write_runs.assert_called_once_with([(1, [1, 2, 3]), (90, [0x90])])
+    assert ssd._storage.read_range(0, 7) == [0, 1, 2, 3, 0, 0, 0]
+
+
+def _scan_fast_read(invoker, lba):
+    """인덱스 없이 버퍼를 역순으로 훑는 기준 구현."""
+    for cmd in reversed(invoker.get_buffer()):
+        if isinstance(cmd, WriteCommand) and cmd.address == lba:
+            return cmd.value
+        if isinstance(cmd, EraseCommand) and cmd.address <= lba < cmd.address + cmd.size:
+            return "0x00000000"
+    return None
+
+
+def test_deep_buffer_index_matches_linear_scan(mock_ssd, monkeypatch, tmp_path):
+    """버퍼 깊이를 수천으로 늘려도 인덱스 조회 결과가 선형 탐색과 같아야 한다."""
+    import random
+    monkeypatch.setattr("ssd.MAX_COMMANDS", 1000)
+    monkeypatch.setattr("ssd.MAX_JOURNAL_RECORDS", 4000)
+    mock_ssd._read_from_nand.return_value = None
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    rng = random.Random(14)
+
+    for i in range(5000):
+        lba = rng.randrange(3000)
+        if rng.random() < 0.7:
+            invoker.add_command(WriteCommand(mock_ssd, lba, f"0x{i:08X}"))
+        else:
+            invoker.add_command(EraseCommand(mock_ssd, lba, rng.randint(0, 10)))
+
+        if i % 100 == 0:
+            lbas = [rng.randrange(3000) for _ in range(100)]
+            assert [invoker.fast_read(x) for x in lbas] == [_scan_fast_read(invoker, x) for x in lbas]
+
+    erases = sorted((c.address, c.address + c.size) for c in invoker.get_buffer() if isinstance(c, EraseCommand))
+    assert all(end <= start for (_, end), (start, _) in zip(erases, erases[1:]))  # Erase 는 서로 겹치지 않음
+    assert 0 < invoker.num_commands() <= 1000
+    assert mock_ssd.sync.called  # 깊이를 넘겨 flush 가 일어남
+
+
+def _replay(cmds, nand=None):
+    """버퍼 명령을 순서대로 dict NAND 에 수행한 결과."""
+    nand = dict(nand or {})
+    for cmd in cmds:
+        if isinstance(cmd, WriteCommand):
+            nand[cmd.address] = int(cmd.value, 16)
+        else:
+            for lba in range(cmd.address, cmd.address + cmd.size):
+                nand[lba] = 0
+    return nand
+
+
+def test_merge_keeps_newer_write_inside_old_erase(mock_ssd, tmp_path):
+    """Erase 를 합쳐도 예전 Erase 범위 안에 나중에 쓴 값이 지워지면 안 된다."""
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 5))
+    invoker.add_command(WriteCommand(mock_ssd, 2, TEST_VALUE))
+
+    invoker.add_command(EraseCommand(mock_ssd, 5, 3))
+
+    assert invoker.slot_names()[:2] == ["1_E_0_8", f"2_W_2_{TEST_VALUE}"]
+    assert invoker.fast_read(2) == TEST_VALUE
+
+
+def test_zero_write_is_absorbed_by_erase(mock_ssd, tmp_path):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 3))
+
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000000"))  # 이미 0
+    invoker.add_command(WriteCommand(mock_ssd, 3, "0x00000000"))  # Erase 뒤에 맞닿음
+
+    assert invoker.slot_names()[0] == "1_E_0_4"
+    assert invoker.num_commands() == 1
+
+
+def test_erase_bridges_gap_filled_with_writes(mock_ssd, tmp_path):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 3))
+    invoker.add_command(WriteCommand(mock_ssd, 3, TEST_VALUE))
+    invoker.add_command(WriteCommand(mock_ssd, 4, "0x00000000"))
+
+    invoker.add_command(EraseCommand(mock_ssd, 5, 3))
+
+    assert invoker.slot_names()[:2] == ["1_E_0_8", f"2_W_3_{TEST_VALUE}"]
+
+
+def test_erase_bridges_long_written_run(mock_ssd, monkeypatch, tmp_path):
+    """Write 로 채워진 긴 구간 너머의 Erase 도 bisect 인덱스로 찾아 하나로 합친다."""
+    monkeypatch.setattr("ssd.MAX_COMMANDS", 200)
+    monkeypatch.setattr("ssd.MAX_ERASE_SIZE", 1000)
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 1))
+    for lba in range(1, 101):
+        invoker.add_command(WriteCommand(mock_ssd, lba, TEST_VALUE))
+
+    invoker.add_command(EraseCommand(mock_ssd, 101, 1))
+
+    assert invoker.slot_names()[0] == "1_E_0_102"
+    assert invoker.num_commands() == 101
+
+
+def test_sequential_writes_do_not_rescan_run(mock_ssd, monkeypatch, tmp_path, mocker):
+    """연속 Write 를 받을 때 compaction 은 이웃만 보므로, 명령 하나당 조회 수가 연속 구간 길이와 무관해야 한다."""
+    monkeypatch.setattr("ssd.MAX_COMMANDS", 2000)
+    monkeypatch.setattr("ssd.MAX_JOURNAL_RECORDS", 8000)
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    erase_at = mocker.spy(CommandBuffer, "erase_at")
+    writes_in = mocker.spy(CommandBuffer, "writes_in")
+
+    for lba in range(2000):
+        invoker.add_command(WriteCommand(mock_ssd, lba, TEST_VALUE))
+
+    assert invoker.num_commands() == 2000
+    assert erase_at.call_count <= 2 * 2000
+    assert writes_in.call_count == 0
+
+
+def test_absorbed_command_does_not_overflow(mock_ssd, tmp_path):
+    """정리 후 버퍼에 들어가는 명령은 버퍼가 가득 차 있어도 flush 를 일으키지 않는다."""
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    for lba in range(0, 10, 2):
+        invoker.add_command(EraseCommand(mock_ssd, lba, 1))
+
+    invoker.add_command(EraseCommand(mock_ssd, 1, 1))
+
+    assert invoker.stats()['flushes'] == 0
+    assert invoker.slot_names()[:4] == ["1_E_4_1", "2_E_6_1", "3_E_8_1", "4_E_0_3"]
+
+
+def test_compaction_is_equivalent_to_sequential_execution(mock_ssd, monkeypatch, tmp_path):
+    """임의의 명령열에 대해 버퍼(+flush 된 NAND) 결과가 명령을 그대로 수행한 결과와 같아야 한다."""
+    import random
+    monkeypatch.setattr("ssd.MAX_COMMANDS", 50)
+    monkeypatch.setattr("ssd.MAX_JOURNAL_RECORDS", 200)
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    flushed = {}
+    monkeypatch.setattr(invoker, "flush", lambda: (flushed.update(_replay(invoker.get_buffer())),
+                                                   invoker._commands.clear()))
+    rng = random.Random(15)
+    expected = {}
+
+    for i in range(3000):
+        lba = rng.randrange(40)
+        if rng.random() < 0.6:
+            value = rng.choice(["0x00000000", f"0x{i + 1:08X}"])
+            cmd = WriteCommand(mock_ssd, lba, value)
+        else:
+            cmd = EraseCommand(mock_ssd, lba, rng.randint(0, min(10, 40 - lba)))
+        expected = _replay([cmd], expected)
+        invoker.add_command(cmd)
+
+        assert _replay(invoker.get_buffer(), flushed) == expected
+        erases = sorted((c.address, c.address + c.size) for c in invoker.get_buffer() if isinstance(c, EraseCommand))
+        assert all(end <= start for (_, end), (start, _) in zip(erases, erases[1:]))
+
+
+@pytest.mark.parametrize("policy, flush_size", [("oldest", 2), ("coldest", 1), ("coldest", 3)])
+def test_partial_flush_is_equivalent_to_sequential_execution(policy, flush_size, tmp_path):
+    """일부만 내보내는 flush 정책에서도 NAND + 버퍼 결과가 명령을 그대로 수행한 결과와 같아야 한다."""
+    import random
+    from nand_storage import BinaryNandStorage
+    SSD._instance = None
+    ssd = SSD(BinaryNandStorage(str(tmp_path / "nand.bin"), 100))
+    invoker = CommandInvoker(ssd, str(tmp_path / "buffer"), flush_policy=policy, flush_size=flush_size)
+    rng = random.Random(18)
+    expected = {}
+
+    for i in range(500):
+        lba = rng.randrange(30)
+        if rng.random() < 0.6:
+            cmd = WriteCommand(ssd, lba, rng.choice(["0x00000000", f"0x{i + 1:08X}"]))
+        else:
+            cmd = EraseCommand(ssd, lba, rng.randint(0, min(10, 30 - lba)))
+        expected = _replay([cmd], expected)
+        invoker.add_command(cmd)
+        if i % 7 == 0:
+            invoker.fast_read(rng.randrange(30))  # coldest 정책의 접근 기록을 섞음
+
+        assert invoker.fast_read_range(0, 30) == [f"0x{expected.get(x, 0):08X}" for x in range(30)]
+    SSD._instance = None
+
+
+def test_zero_size_erase_is_not_buffered(tmp_path):
+    """크기 0 Erase 는 버퍼에 남지 않아, 이후 같은 시작 LBA 로 합쳐지는 Erase 와 부딪히지 않는다."""
+    from nand_storage import BinaryNandStorage
+    SSD._instance = None
+    ssd = SSD(BinaryNandStorage(str(tmp_path / "nand.bin"), 10))
+    invoker = CommandInvoker(ssd, str(tmp_path / "buffer"))
+    for cmd in [WriteCommand(ssd, 3, "0x00000000"), EraseCommand(ssd, 1, 0), WriteCommand(ssd, 1, "0x00000000"),
+                WriteCommand(ssd, 2, "0x00000000"), WriteCommand(ssd, 4, "0x00000001")]:
+        invoker.add_command(cmd)
+
+    assert invoker.slot_names()[:2] == ["1_E_1_3", "2_W_4_0x00000001"]
+    assert invoker._journal.record_count == 4  # 크기 0 Erase 는 저널에도 남지 않음
+    SSD._instance = None
+
+
+@pytest.mark.parametrize("policy", ["all", "oldest", "coldest"])
+@pytest.mark.parametrize("depth", [1, 2, 5, 20])
+def test_buffer_matches_array_model(policy, depth, monkeypatch, tmp_path):
+    """좁은 LBA 범위에 임의의 W / E(크기 0 포함) / R 을 섞어도 읽은 값이 평범한 배열에 수행한 결과와 같아야 한다."""
+    import random
+    from nand_storage import BinaryNandStorage
+    monkeypatch.setattr("ssd.MAX_COMMANDS", depth)
+    monkeypatch.setattr("ssd.MAX_ERASE_SIZE", 4)
+    SSD._instance = None
+    size = 12
+    ssd = SSD(BinaryNandStorage(str(tmp_path / "nand.bin"), size))
+    invoker = CommandInvoker(ssd, str(tmp_path / "buffer"), flush_policy=policy, flush_size=2)
+    rng = random.Random(depth * 31 + len(policy))
+    model = [0] * size
+
+    for i in range(1500):
+        lba = rng.randrange(size)
+        op = rng.random()
+        if op < 0.5:
+            value = rng.choice([0, 1, i + 1])
+            invoker.add_command(WriteCommand(ssd, lba, f"0x{value:08X}"))
+            model[lba] = value
+        elif op < 0.85:
+            count = rng.randint(0, min(4, size - lba))
+            invoker.add_command(EraseCommand(ssd, lba, count))
+            model[lba:lba + count] = [0] * count
+        else:
+            assert invoker.fast_read(lba) == f"0x{model[lba]:08X}"
+        assert len(invoker.get_buffer()) <= depth
+
+    assert invoker.fast_read_range(0, size) == [f"0x{value:08X}" for value in model]
+    invoker.flush()
+    assert [ssd._read_from_nand(lba) for lba in range(size)] == [f"0x{value:08X}" for value in model]
+    SSD._instance = None
+
+
+def test_oldest_policy_keeps_recent_commands(mock_ssd, tmp_path):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path), flush_policy="oldest", flush_size=2)
+    for lba in range(6):
+        invoker.add_command(WriteCommand(mock_ssd, lba, TEST_VALUE))
+
+    assert [cmd.address for cmd in invoker.get_buffer()] == [2, 3, 4, 5]
+    assert [call.args[0] for call in mock_ssd.write.call_args_list] == [0, 1]
+
+
+def test_coldest_policy_keeps_hot_commands(mock_ssd, tmp_path):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path), flush_policy="coldest", flush_size=1)
+    for lba in range(5):
+        invoker.add_command(WriteCommand(mock_ssd, lba, TEST_VALUE))
+    invoker.fast_read(0)  # LBA 0 은 최근에 읽혀서 hot
+
+    invoker.add_command(WriteCommand(mock_ssd, 5, TEST_VALUE))
+
+    assert [cmd.address for cmd in invoker.get_buffer()] == [0, 2, 3, 4, 5]
+    mock_ssd.write.assert_called_once_with(1, int(TEST_VALUE, 16))
+
+
+def test_coldest_policy_flushes_covering_erase_with_write(mock_ssd, tmp_path):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path), flush_policy="coldest", flush_size=1)
+    invoker.add_command(EraseCommand(mock_ssd, 0, 5))
+    invoker.add_command(WriteCommand(mock_ssd, 2, TEST_VALUE))
+    for lba in range(10, 13):
+        invoker.add_command(WriteCommand(mock_ssd, lba, TEST_VALUE))
+    invoker.fast_read(0)  # Erase 는 hot, 그 안의 Write 가 가장 cold
+
+    invoker.add_command(WriteCommand(mock_ssd, 20, TEST_VALUE))
+
+    assert [name for name, _, _ in mock_ssd.method_calls[:4]] == ["begin_batch", "erase", "write", "end_batch"]
+    assert [cmd.address for cmd in invoker.get_buffer()] == [10, 11, 12, 20]
+
+
+def test_stats_report_absorb_and_hit_rates(mock_ssd, tmp_path):
+    mock_ssd._read_from_nand.return_value = "0x00000000"
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(WriteCommand(mock_ssd, 0, TEST_VALUE))
+    invoker.add_command(WriteCommand(mock_ssd, 0, TEST_VALUE))  # 앞의 Write 를 흡수
+    invoker.add_command(WriteCommand(mock_ssd, 1, TEST_VALUE))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 2))           # 두 Write 를 흡수
+    invoker.fast_read(0)
+    invoker.fast_read(50)
+
+    stats = invoker.stats()
+
+    assert (stats['writes'], stats['absorbed'], stats['absorb_rate']) == (4, 3, 0.75)
+    assert (stats['reads'], stats['read_hits'], stats['hit_rate']) == (2, 1, 0.5)
+    assert stats['flush_policy'] == "all"
+
+
+def test_write_command_keeps_integer_value(mock_ssd):
+    cmd = WriteCommand(mock_ssd, "7", "0x0000abcd")
+
+    assert (cmd.address, cmd.data) == (7, 0xABCD)
+    assert cmd.value == "0x0000abcd"  # 출력할 때는 받은 표기 그대로
+    assert cmd.to_record() == ("W", 7, "0x0000abcd")
+
+    cmd.execute()
+    mock_ssd.write.assert_called_once_with(7, 0xABCD)
+
@@ -1,6 +1,8 @@
 import pytest
 from pytest_mock import MockerFixture
 from shell import *
+from ssd_driver import SSDDriver
+from ssd import buffer_slot_names
 
 @pytest.fixture
 def shell_app(mocker):
@@ -21,9 +23,9 @@ def fast_read(arg1, arg2, buffer_files, capsys, check_print, cmd, mocker, shell_
     assert check_print in captured.out
     if not invalid_command:
         assert 'INVALID COMMAND' not in captured.out
+    slot_names = buffer_slot_names()
     for buffer_file in buffer_files:
-        full_buffer_file = os.path.join(f"{ROOT_DIR}/buffer", buffer_file)
-        assert os.path.exists(full_buffer_file)
+        assert buffer_file in slot_names
 
 @pytest.mark.parametrize(
     "cmd, arg1, arg2, buffer_files, check_print",
@@ -33,7 +33,7 @@ def ctx():
 # 1) 버퍼가 제대로 초기화됐는지
 def test_01_buffer_initialized(ctx):
     expected = {f"{i}_empty" for i in range(1, 6)}
-    assert set(os.listdir(ssd.BUFFER_DIR)) == expected
+    assert set(ssd.buffer_slot_names()) == expected
 
 
 # 2) 명령 추가 시 파일명이 변경되는지
@@ -41,13 +41,13 @@ def test_02_buffer_renamed(ctx):
     ssd_inst, invoker = ctx
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 10, "0xAAAABBBB", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 10, "0xAAAABBBB")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 20, 5, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 20, 5)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_W_10_0xAAAABBBB" in files
     assert "2_E_20_5" in files
 
@@ -58,7 +58,7 @@ def test_03_flush_resets_buffer(ctx):
     invoker.flush()
 
     expected = {f"{i}_empty" for i in range(1, 6)}
-    assert set(os.listdir(ssd.BUFFER_DIR)) == expected
+    assert set(ssd.buffer_slot_names()) == expected
 
 
 def test_04_ignore_write_overwrite(ctx):
@@ -67,13 +67,13 @@ def test_04_ignore_write_overwrite(ctx):
 
     # W 20 → W 21 → W 20(덮어쓰기)
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 20, "0xABCDABCD", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 20, "0xABCDABCD")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 21, "0x12341234", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 21, "0x12341234")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 20, "0xEEEEFFFF", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 20, "0xEEEEFFFF")
     )
 
     # 버퍼에는 두 개만 남아야 함 (W 21 / W 20-최근)
@@ -82,7 +82,7 @@ def test_04_ignore_write_overwrite(ctx):
     assert buf[0].address == 21 and buf[1].address == 20
 
     # 실제 파일 이름도 1_W_21_… , 2_W_20_… 이어야 함
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_W_21_0x12341234" in files
     assert "2_W_20_0xEEEEFFFF" in files
     # 불필요 파일이 더 있으면 실패
@@ -96,13 +96,13 @@ def test_05_ignore_erase_supersedes(ctx):
 
     # E 18 3  →  W 21 …  →  E 18 5 (상위범위)
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 18, 3, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 18, 3)
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 21, "0x12341234", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 21, "0x12341234")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 18, 5, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 18, 5)
     )
 
     # 버퍼에는 최종 Erase 하나만 남아야 함
@@ -112,7 +112,7 @@ def test_05_ignore_erase_supersedes(ctx):
     assert cmd.address == 18 and cmd.size == 5
 
     # 파일도 1_E_18_5 하나 + 2~5_empty 네 개
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == {
         "1_E_18_5",
         "2_empty",
@@ -128,13 +128,13 @@ def test_06_merge_erase(ctx):
 
     # E 1 4  →  W 0 …  →  E 0 5 (상위범위)
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 1, 4, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 1, 4)
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 0, "0x12341234", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 0, "0x12341234")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 0, 5, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 0, 5)
     )
 
     # 버퍼에는 최종 Erase 하나만 남아야 함
@@ -144,7 +144,7 @@ def test_06_merge_erase(ctx):
     assert cmd.address == 0 and cmd.size == 5
 
     # 파일도 1_E_0_5 하나 + 2~5_empty 네 개
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == {
         "1_E_0_5",
         "2_empty",
@@ -160,10 +160,10 @@ def test_07_ignore_erase(ctx):
 
     # E 1 4  →  W 0 …  →  E 0 5 (상위범위)
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 0, 1, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 0, 1)
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 0, "0x12341234", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 0, "0x12341234")
     )
 
     # 버퍼에는 최종 Erase 하나만 남아야 함
@@ -172,7 +172,7 @@ def test_07_ignore_erase(ctx):
     assert isinstance(cmd, ssd.WriteCommand)
 
     # 파일도 1_E_0_5 하나 + 2~5_empty 네 개
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == {
         "1_W_0_0x12341234",
         "2_empty",
@@ -187,25 +187,25 @@ def test_my1(ctx):
     invoker.flush()
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 20, 5, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 20, 5)
     )
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 30, "0xAAAABBBB", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 30, "0xAAAABBBB")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 30, "0x12345678", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 30, "0x12345678")
     )
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 20, 10, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 20, 10)
     )
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 25, 10, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 25, 10)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_E_20_10" in files
     assert "2_E_30_5" in files
 
@@ -215,25 +215,25 @@ def test_my2(ctx):
     invoker.flush()
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 0, 8, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 0, 8)
     )
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 30, "0xAAAABBBB", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 30, "0xAAAABBBB")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 30, "0x12345678", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 30, "0x12345678")
     )
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 7, 8, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 7, 8)
     )
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 14, 10, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 14, 10)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_W_30_0x12345678" in files
     assert "2_E_0_10" in files
     assert "3_E_10_10" in files
@@ -245,25 +245,25 @@ def test_my3(ctx):
     invoker.flush()
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 0, 8, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 0, 8)
     )
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 30, "0xAAAABBBB", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 30, "0xAAAABBBB")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 30, "0x12345678", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 30, "0x12345678")
     )
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 7, 8, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 7, 8)
     )
 
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 14, 10, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 14, 10)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_W_30_0x12345678" in files
     assert "2_E_0_10" in files
     assert "3_E_10_10" in files
@@ -275,19 +275,19 @@ def test_my4(ctx):
     invoker.flush()
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 0, "0x0000000a", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 0, "0x0000000a")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 1, "0x0000000b", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 1, "0x0000000b")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 2, "0x0000000c", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 2, "0x0000000c")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 0, 3, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 0, 3)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_E_0_3" in files
 
 
@@ -296,19 +296,19 @@ def test_my5(ctx):
     invoker.flush()
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 0, "0x0000000a", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 0, "0x0000000a")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 1, "0x0000000b", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 1, "0x0000000b")
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 2, "0x0000000c", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 2, "0x0000000c")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 0, 3, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 0, 3)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert "1_E_0_3" in files
 
 
@@ -317,19 +317,19 @@ def test_my6(ctx):
     invoker.flush()
 
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 10, "0x0000000a", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 10, "0x0000000a")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 11, 2, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 11, 2)
     )
     invoker.add_command(
-        ssd.WriteCommand(ssd_inst, 11, "0x0000000b", invoker.num_commands() + 1)
+        ssd.WriteCommand(ssd_inst, 11, "0x0000000b")
     )
     invoker.add_command(
-        ssd.EraseCommand(ssd_inst, 12, 2, invoker.num_commands() + 1)
+        ssd.EraseCommand(ssd_inst, 12, 2)
     )
 
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     # failed 아래처럼 나옴
     assert "1_W_10_0x0000000a" in files
     assert "2_W_11_0x0000000b" in files
@@ -382,16 +382,16 @@ def test_08_pass_ignore_write(ctx, input):
             continue
         _, cmd, addr, value = input["original"][num].split("_")
         if cmd == "W":
-            invoker.add_command(WriteCommand(ssd_inst, addr, value, num))
+            invoker.add_command(WriteCommand(ssd_inst, addr, value))
         elif cmd == "E":
-            invoker.add_command(EraseCommand(ssd_inst, int(addr), int(value), num))
+            invoker.add_command(EraseCommand(ssd_inst, int(addr), int(value)))
 
     # 새로운 입력
     cmd, addr, value = input["new_input"].split("_")
     if cmd == "W":
-        invoker.add_command(WriteCommand(ssd_inst, int(addr), value, invoker.num_commands() + 1))
+        invoker.add_command(WriteCommand(ssd_inst, int(addr), value))
     elif cmd == "E":
-        invoker.add_command(EraseCommand(ssd_inst, int(addr), int(value), invoker.num_commands() + 1))
+        invoker.add_command(EraseCommand(ssd_inst, int(addr), int(value)))
 
     expected_num_commands = 0
     for i in input["changed"]:
@@ -399,7 +399,7 @@ def test_08_pass_ignore_write(ctx, input):
             expected_num_commands += 1
 
     assert invoker.num_commands() == expected_num_commands
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == set(input["changed"])
 
 
@@ -448,11 +448,11 @@ def test_09_ignore_write(ctx, input):
         if "empty" in input["original"][num]:
             continue
         _, cmd, addr, value = input["original"][num].split("_")
-        add_command_by_signature(addr, cmd, invoker, num, ssd_inst, value)
+        add_command_by_signature(addr, cmd, invoker, ssd_inst, value)
 
     # 새로운 입력
     cmd, addr, value = input["new_input"].split("_")
-    add_command_by_signature(addr, cmd, invoker, invoker.num_commands() + 1, ssd_inst, value)
+    add_command_by_signature(addr, cmd, invoker, ssd_inst, value)
 
     expected_num_commands = 0
     for i in input["changed"]:
@@ -460,15 +460,15 @@ def test_09_ignore_write(ctx, input):
             expected_num_commands += 1
 
     assert invoker.num_commands() == expected_num_commands
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == set(input["changed"])
 
 
-def add_command_by_signature(addr, cmd, invoker, num, ssd_inst, value):
+def add_command_by_signature(addr, cmd, invoker, ssd_inst, value):
     if cmd == "W":
-        invoker.add_command(WriteCommand(ssd_inst, int(addr), value, num))
+        invoker.add_command(WriteCommand(ssd_inst, int(addr), value))
     elif cmd == "E":
-        invoker.add_command(EraseCommand(ssd_inst, int(addr), int(value), num))
+        invoker.add_command(EraseCommand(ssd_inst, int(addr), int(value)))
 
 
 @pytest.mark.parametrize("input", [
@@ -533,11 +533,11 @@ def test_10_pass_ignore_command_erase(ctx, input):
         if "empty" in input["original"][num]:
             continue
         _, cmd, addr, value = input["original"][num].split("_")
-        add_command_by_signature(addr, cmd, invoker, num, ssd_inst, value)
+        add_command_by_signature(addr, cmd, invoker, ssd_inst, value)
 
     # 새로운 입력
     cmd, addr, value = input["new_input"].split("_")
-    add_command_by_signature(int(addr), cmd, invoker, invoker.num_commands() + 1, ssd_inst, int(value))
+    add_command_by_signature(int(addr), cmd, invoker, ssd_inst, int(value))
 
     expected_num_commands = 0
     for i in input["changed"]:
@@ -545,7 +545,7 @@ def test_10_pass_ignore_command_erase(ctx, input):
             expected_num_commands += 1
 
     assert invoker.num_commands() == expected_num_commands
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == set(input["changed"])
 
 
@@ -599,11 +599,11 @@ def test_11_ignore_command_erase(ctx, input):
         if "empty" in input["original"][num]:
             continue
         _, cmd, addr, value = input["original"][num].split("_")
-        add_command_by_signature(addr, cmd, invoker, num, ssd_inst, value)
+        add_command_by_signature(addr, cmd, invoker, ssd_inst, value)
 
     # 새로운 입력
     cmd, addr, value = input["new_input"].split("_")
-    add_command_by_signature(int(addr), cmd, invoker, invoker.num_commands() + 1, ssd_inst, int(value))
+    add_command_by_signature(int(addr), cmd, invoker, ssd_inst, int(value))
 
     expected_num_commands = 0
     for i in input["changed"]:
@@ -611,7 +611,7 @@ def test_11_ignore_command_erase(ctx, input):
             expected_num_commands += 1
 
     assert invoker.num_commands() == expected_num_commands
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == set(input["changed"])
 
 
@@ -639,11 +639,11 @@ def test_12_pass_merge_erase(ctx, input):
         if "empty" in input["original"][num]:
             continue
         _, cmd, addr, value = input["original"][num].split("_")
-        add_command_by_signature(addr, cmd, invoker, num, ssd_inst, value)
+        add_command_by_signature(addr, cmd, invoker, ssd_inst, value)
 
     # 새로운 입력
     cmd, addr, value = input["new_input"].split("_")
-    add_command_by_signature(int(addr), cmd, invoker, invoker.num_commands() + 1, ssd_inst, int(value))
+    add_command_by_signature(int(addr), cmd, invoker, ssd_inst, int(value))
 
     expected_num_commands = 0
     for i in input["changed"]:
@@ -651,7 +651,7 @@ def test_12_pass_merge_erase(ctx, input):
             expected_num_commands += 1
 
     assert invoker.num_commands() == expected_num_commands
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == set(input["changed"])
 
 
@@ -783,11 +783,11 @@ def test_13_merge_erase(ctx, input):
         if "empty" in input["original"][num]:
             continue
         _, cmd, addr, value = input["original"][num].split("_")
-        add_command_by_signature(addr, cmd, invoker, num, ssd_inst, value)
+        add_command_by_signature(addr, cmd, invoker, ssd_inst, value)
 
     # 새로운 입력
     cmd, addr, value = input["new_input"].split("_")
-    add_command_by_signature(int(addr), cmd, invoker, invoker.num_commands() + 1, ssd_inst, int(value))
+    add_command_by_signature(int(addr), cmd, invoker, ssd_inst, int(value))
 
     expected_num_commands = 0
     for i in input["changed"]:
@@ -795,5 +795,5 @@ def test_13_merge_erase(ctx, input):
             expected_num_commands += 1
 
     assert invoker.num_commands() == expected_num_commands
-    files = set(os.listdir(ssd.BUFFER_DIR))
+    files = set(ssd.buffer_slot_names())
     assert files == set(input["changed"])
@@ -0,0 +1,307 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+import ssd_config
+from command_journal import CommandJournal
+from nand_storage import BinaryNandStorage
+from ssd import (SSD, CommandInvoker, WriteCommand, EraseCommand, MAX_COMMANDS, MAX_JOURNAL_RECORDS, read_only,
+                 buffer_slot_names)
+
+SSD_PATH = str(Path(__file__).parent.parent / "ssd.py")
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return CommandJournal(str(tmp_path))
+
+
+@pytest.fixture
+def mock_ssd():
+    return Mock(spec=SSD)
+
+
+def test_append_and_replay(journal):
+    journal.append("W", 3, "0x00000001")
+    journal.append("E", 10, 5)
+
+    assert CommandJournal(os.path.dirname(journal.filename)).replay() == [
+        ("W", "3", "0x00000001"),
+        ("E", "10", "5"),
+    ]
+
+
+def test_replay_stops_at_torn_record(journal):
+    journal.append("W", 3, "0x00000001")
+    with open(journal.filename, "a") as f:
+        f.write("W 4 0x000")  # 쓰는 도중 종료된 레코드
+
+    assert journal.replay() == [("W", "3", "0x00000001")]
+
+
+def test_replay_stops_at_checksum_mismatch(journal):
+    journal.append("W", 3, "0x00000001")
+    journal.append("W", 4, "0x00000002")
+    data = open(journal.filename).read().replace("W 4 0x00000002", "W 4 0x00000009")
+    open(journal.filename, "w").write(data)
+
+    assert journal.replay() == [("W", "3", "0x00000001")]
+
+
+def test_compact_and_clear(journal):
+    for lba in range(10):
+        journal.append("W", lba, "0x00000001")
+
+    journal.compact([("E", 0, 10)])
+    assert journal.replay() == [("E", "0", "10")]
+
+    journal.clear()
+    assert journal.replay() == []
+    assert journal.record_count == 0
+
+
+def test_invoker_appends_one_record_per_command(tmp_path, mock_ssd):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000001"))
+    invoker.add_command(EraseCommand(mock_ssd, 5, 2))
+
+    assert os.listdir(tmp_path) == ["journal.log"]  # 슬롯 파일 없이 저널 하나
+    assert len(open(tmp_path / "journal.log").readlines()) == 2
+
+
+def test_invoker_recovers_from_journal(tmp_path, mock_ssd):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 5))
+    invoker.add_command(WriteCommand(mock_ssd, 0, "0x00000001"))  # Erase 앞쪽 축소
+    invoker.add_command(WriteCommand(mock_ssd, 7, "0x00000002"))
+
+    recovered = CommandInvoker(mock_ssd, str(tmp_path))
+
+    assert recovered.slot_names() == invoker.slot_names()
+    assert recovered.fast_read(0) == "0x00000001"
+    assert recovered.fast_read(3) == "0x00000000"
+
+
+def test_flush_clears_journal(tmp_path, mock_ssd):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000001"))
+
+    invoker.flush()
+
+    assert os.path.getsize(tmp_path / "journal.log") == 0
+    assert CommandInvoker(mock_ssd, str(tmp_path)).num_commands() == 0
+
+
+def test_journal_compacted_on_repeated_overwrites(tmp_path, mock_ssd):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    for i in range(MAX_JOURNAL_RECORDS + 1):
+        invoker.add_command(WriteCommand(mock_ssd, 0, f"0x{i:08X}"))
+
+    records = CommandJournal(str(tmp_path)).replay()
+    assert len(records) <= MAX_JOURNAL_RECORDS
+    assert records[-1] == ("W", "0", f"0x{MAX_JOURNAL_RECORDS:08X}")
+
+
+def test_legacy_slot_files_are_migrated(tmp_path, mock_ssd):
+    for name in ["1_W_3_0x00000001", "2_E_10_2", "3_empty", "4_empty", "5_empty"]:
+        open(tmp_path / name, "w").close()
+
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+
+    assert invoker.slot_names()[:3] == ["1_W_3_0x00000001", "2_E_10_2", "3_empty"]
+    assert sorted(os.listdir(tmp_path)) == ["journal.log"]
+
+
+def _legacy_slot_files(buffer_dir):
+    for name in ["1_W_3_0x00000001", "2_E_10_2", "3_empty", "4_empty", "5_empty"]:
+        open(buffer_dir / name, "w").close()
+
+
+def _overflowing_journal(buffer_dir):
+    journal = CommandJournal(str(buffer_dir))
+    for lba in range(MAX_COMMANDS + 2):  # 다시 쌓으면 버퍼가 넘치는 저널
+        journal.append("W", lba * 2, f"0x{lba + 1:08X}")
+
+
+@pytest.mark.parametrize("make_buffer", [_legacy_slot_files, _overflowing_journal])
+def test_buffer_slot_names_leaves_buffer_dir_untouched(tmp_path, mock_ssd, make_buffer):
+    for buffer_dir in (tmp_path / "view", tmp_path / "invoker"):
+        buffer_dir.mkdir()
+        make_buffer(buffer_dir)
+    view_dir = tmp_path / "view"
+    before = {name: (view_dir / name).read_bytes() for name in os.listdir(view_dir)}
+
+    names = buffer_slot_names(str(view_dir))
+
+    assert {name: (view_dir / name).read_bytes() for name in os.listdir(view_dir)} == before
+    assert names == CommandInvoker(mock_ssd, str(tmp_path / "invoker")).slot_names()
+
+
+@pytest.mark.parametrize("durability, expected", [("none", 0), ("flush", 1), ("strict", 3)])
+def test_journal_fsync_per_durability(tmp_path, durability, expected):
+    journal = CommandJournal(str(tmp_path), durability=durability)
+
+    journal.append("W", 1, "0x00000001")
+    journal.append("W", 2, "0x00000002")
+    journal.clear()
+
+    # strict 는 append 마다, flush 는 clear 때만 fsync
+    assert journal.fsync_count == expected
+
+
+@pytest.mark.parametrize("durability, dir_fsyncs", [("none", 0), ("flush", 1), ("strict", 1)])
+def test_compact_fsyncs_buffer_dir(tmp_path, mocker, durability, dir_fsyncs):
+    fsync_dir = mocker.patch("command_journal.fsync_dir")
+    journal = CommandJournal(str(tmp_path), durability=durability)
+    journal.append("W", 1, "0x00000001")
+
+    journal.compact([("W", 1, "0x00000001")])
+
+    assert fsync_dir.call_count == dir_fsyncs
+    if dir_fsyncs:
+        fsync_dir.assert_called_with(str(tmp_path))
+    assert journal.replay() == [("W", "1", "0x00000001")]
+
+
+@pytest.mark.parametrize("durability, nand_syncs", [("none", 0), ("flush", 1), ("strict", 1)])
+def test_invoker_stats_report_durability(tmp_path, mock_ssd, durability, nand_syncs):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path), durability=durability)
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000001"))
+    invoker.add_command(WriteCommand(mock_ssd, 2, "0x00000002"))
+
+    invoker.flush()
+
+    stats = invoker.stats()
+    assert stats["durability"] == durability
+    assert stats["flushes"] == 1
+    assert stats["buffered"] == 0
+    assert mock_ssd.sync.call_count == nand_syncs == stats["nand_syncs"]
+
+
+@pytest.fixture
+def nand(tmp_path):
+    storage = BinaryNandStorage(str(tmp_path / "nand.bin"), 100)
+    storage.format()
+    storage.write(3, 0x33)
+    storage.write(8, 0x88)
+    return storage
+
+
+def test_read_only_matches_fast_read(tmp_path, nand):
+    SSD._instance = None
+    ssd = SSD(nand)
+    invoker = CommandInvoker(ssd, str(tmp_path / "buffer"))
+    invoker.add_command(EraseCommand(ssd, 0, 5))
+    invoker.add_command(WriteCommand(ssd, 1, "0x00000001"))
+    invoker.add_command(WriteCommand(ssd, 7, "0x00000007"))
+    SSD._instance = None
+
+    for lba in (0, 1, 3, 7, 8, 99, 100, -1):
+        assert read_only(lba, str(tmp_path / "buffer"), nand) == invoker.fast_read(lba)
+
+
+def test_read_only_sees_legacy_slot_files_before_journal(tmp_path, nand):
+    for name in ["1_W_3_0x00000001", "2_E_8_2", "3_empty"]:
+        open(tmp_path / name, "w").close()
+    CommandJournal(str(tmp_path)).append("W", 9, "0x00000009")
+
+    assert read_only(3, str(tmp_path), nand) == "0x00000001"
+    assert read_only(8, str(tmp_path), nand) == "0x00000000"
+    assert read_only(9, str(tmp_path), nand) == "0x00000009"
+    assert sorted(os.listdir(tmp_path)) == ["1_W_3_0x00000001", "2_E_8_2", "3_empty", "journal.log", "nand.bin"]
+
+
+def test_read_only_falls_back_when_nand_is_unverified(tmp_path):
+    storage = Mock(spec=BinaryNandStorage)
+    storage.exists.return_value = True
+    storage.is_known_valid.return_value = False
+
+    assert read_only(0, str(tmp_path), storage) is None
+    storage.read.assert_not_called()
+
+
+def test_cli_read_leaves_buffer_and_nand_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    env = ssd_config.as_env()
+    subprocess.run([sys.executable, SSD_PATH, "W", "3", "0x00000003"], env=env)
+    subprocess.run([sys.executable, SSD_PATH, "E", "3", "1"], env=env)  # Erase 가 앞의 W 를 지움
+    subprocess.run([sys.executable, SSD_PATH, "W", "5", "0x00000005"], env=env)
+    files = [path for path in tmp_path.rglob("*") if path.is_file() and path.name != "ssd_output.txt"]
+    before = {path: (path.stat().st_mtime_ns, path.read_bytes()) for path in files}
+
+    outputs = []
+    for lba in ("5", "3", "50"):
+        subprocess.run([sys.executable, SSD_PATH, "R", lba], env=env)
+        outputs.append((tmp_path / "ssd_output.txt").read_text())
+
+    assert outputs == ["0x00000005", "0x00000000", "0x00000000"]
+    assert {path: (path.stat().st_mtime_ns, path.read_bytes()) for path in files} == before
+
+
+def test_clean_marker_tracks_journal(journal):
+    assert journal.clean_state() is None
+    journal.append("W", 1, "0x00000001")
+
+    journal.mark_clean(canonical=True)
+    assert journal.clean_state() is True
+
+    journal.append("W", 2, "0x00000002")  # 표시 이후의 변경(비정상 종료 포함)
+    assert journal.clean_state() is None
+
+
+def test_clean_start_skips_directory_scan(tmp_path, mock_ssd, monkeypatch):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000001"))
+    invoker.add_command(EraseCommand(mock_ssd, 5, 2))
+    invoker.close()
+
+    monkeypatch.setattr("ssd.os.listdir", Mock(side_effect=AssertionError("scanned")))
+    recovered = CommandInvoker(mock_ssd, str(tmp_path))
+
+    assert recovered.stats()['clean_start']
+    assert recovered.slot_names() == invoker.slot_names()
+
+
+def test_clean_start_after_absorbed_commands(tmp_path, mock_ssd):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 3))
+    invoker.add_command(EraseCommand(mock_ssd, 3, 2))  # 병합: 저널과 버퍼가 달라짐
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000001"))
+    invoker.close()
+
+    recovered = CommandInvoker(mock_ssd, str(tmp_path))
+
+    assert recovered.stats()['clean_start']
+    assert recovered.slot_names() == invoker.slot_names()
+
+
+def test_clean_start_after_trimmed_erase(tmp_path, mock_ssd):
+    """Write 가 Erase 앞쪽을 잘라내도(명령 수는 그대로) 다시 시작한 버퍼와 저널 보기가 지금 버퍼와 같아야 한다."""
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(EraseCommand(mock_ssd, 0, 5))
+    invoker.add_command(WriteCommand(mock_ssd, 0, "0x00000001"))  # E 0 5 -> E 1 4
+    invoker.close()
+
+    recovered = CommandInvoker(mock_ssd, str(tmp_path))
+
+    assert invoker.slot_names()[:2] == ["1_E_1_4", "2_W_0_0x00000001"]
+    assert recovered.stats()['clean_start']
+    assert recovered.slot_names() == invoker.slot_names()
+    assert buffer_slot_names(str(tmp_path)) == invoker.slot_names()
+
+
+def test_unclean_start_runs_full_recovery(tmp_path, mock_ssd):
+    invoker = CommandInvoker(mock_ssd, str(tmp_path))
+    invoker.add_command(WriteCommand(mock_ssd, 1, "0x00000001"))
+    invoker.close()
+    invoker.add_command(WriteCommand(mock_ssd, 2, "0x00000002"))  # close 없이 종료
+
+    recovered = CommandInvoker(mock_ssd, str(tmp_path))
+
+    assert not recovered.stats()['clean_start']
+    assert recovered.fast_read(2) == "0x00000002"
@@ -47,7 +47,7 @@ def test_fast_read_after_write(ctx):
     invoker.flush()
 
     actual = "0xABCDEF01"
-    invoker.add_command(WriteCommand(ssd_inst, 5, actual, invoker.num_commands() + 1))
+    invoker.add_command(WriteCommand(ssd_inst, 5, actual))
 
     value = invoker.fast_read(5)
     assert value == actual
@@ -63,9 +63,9 @@ def test_fast_read_after_erase(ctx):
     invoker.flush()
 
     # 먼저 Write (Buffer에)
-    invoker.add_command(WriteCommand(ssd_inst, 10, "0x12345678", invoker.num_commands() + 1))
+    invoker.add_command(WriteCommand(ssd_inst, 10, "0x12345678"))
     # Erase (같은 Buffer)
-    invoker.add_command(EraseCommand(ssd_inst, 10, 1, invoker.num_commands() + 1))
+    invoker.add_command(EraseCommand(ssd_inst, 10, 1))
 
     value = invoker.fast_read(10)
     assert value == BLANK_STRING
@@ -76,9 +76,9 @@ def test_fast_read_mixed_commands(ctx):
     ssd_inst, invoker = ctx
     invoker.flush()
 
-    invoker.add_command(WriteCommand(ssd_inst, 10, "0xABCDABCD", invoker.num_commands() + 1))
-    invoker.add_command(EraseCommand(ssd_inst, 10, 2, invoker.num_commands() + 1))
-    invoker.add_command(WriteCommand(ssd_inst, 11, "0xABCDABCD", invoker.num_commands() + 1))
+    invoker.add_command(WriteCommand(ssd_inst, 10, "0xABCDABCD"))
+    invoker.add_command(EraseCommand(ssd_inst, 10, 2))
+    invoker.add_command(WriteCommand(ssd_inst, 11, "0xABCDABCD"))
 
     assert invoker.fast_read(10) == BLANK_STRING
     assert invoker.fast_read(11) == "0xABCDABCD"
@@ -89,8 +89,8 @@ def test_fast_read_with_ignore_write(ctx):
     ssd_inst, invoker = ctx
     invoker.flush()
 
-    invoker.add_command(WriteCommand(ssd_inst, 20, "0xAAAAAAAA", invoker.num_commands() + 1))
-    invoker.add_command(WriteCommand(ssd_inst, 20, "0xBBBBBBBB", invoker.num_commands() + 1))
+    invoker.add_command(WriteCommand(ssd_inst, 20, "0xAAAAAAAA"))
+    invoker.add_command(WriteCommand(ssd_inst, 20, "0xBBBBBBBB"))
 
     assert invoker.fast_read(20) == "0xBBBBBBBB"
 
@@ -100,9 +100,9 @@ def test_fast_read_with_ignore_erase(ctx):
     ssd_inst, invoker = ctx
     invoker.flush()
 
-    invoker.add_command(EraseCommand(ssd_inst, 18, 3, invoker.num_commands() + 1))
-    invoker.add_command(WriteCommand(ssd_inst, 21, "0x12341234", invoker.num_commands() + 1))
-    invoker.add_command(EraseCommand(ssd_inst, 18, 5, invoker.num_commands() + 1))  # 18~22 Erase
+    invoker.add_command(EraseCommand(ssd_inst, 18, 3))
+    invoker.add_command(WriteCommand(ssd_inst, 21, "0x12341234"))
+    invoker.add_command(EraseCommand(ssd_inst, 18, 5))  # 18~22 Erase
 
     for lba in range(18, 23):
         assert invoker.fast_read(lba) == BLANK_STRING
@@ -113,8 +113,8 @@ def test_fast_read_with_merge_erase(ctx):
     ssd_inst, invoker = ctx
     invoker.flush()
 
-    invoker.add_command(EraseCommand(ssd_inst, 10, 4, invoker.num_commands() + 1))  # 10~13
-    invoker.add_command(EraseCommand(ssd_inst, 12, 3, invoker.num_commands() + 1))  # 12~14 → merge to 10~14
+    invoker.add_command(EraseCommand(ssd_inst, 10, 4))  # 10~13
+    invoker.add_command(EraseCommand(ssd_inst, 12, 3))  # 12~14 → merge to 10~14
 
     for lba in range(10, 15):
         assert invoker.fast_read(lba) == BLANK_STRING
@@ -129,7 +129,7 @@ def test_fast_read_near_full_buffer(ctx):
     invoker.flush()
 
     for i in range(1, 5):  # 4개 Write
-        invoker.add_command(WriteCommand(ssd_inst, i, f"0x0000000{i}", invoker.num_commands() + 1))
+        invoker.add_command(WriteCommand(ssd_inst, i, f"0x0000000{i}"))
 
     for i in range(1, 5):
         assert invoker.fast_read(i) == f"0x0000000{i}"
@@ -157,10 +157,10 @@ def test_fast_read_near_full_buffer(ctx):
 #     ssd, invoker = setup_ssd
 #     actual = "0xABCDEF01"
 #
-#     invoker.add_command(WriteCommand(ssd, 5, actual, invoker.num_commands() + 1))
+#     invoker.add_command(WriteCommand(ssd, 5, actual))
 #
 #     # Buffer에 Erase 명령어 추가 (해당 LBA 지움)
-#     # invoker.add_command(EraseCommand(ssd, 5, 1, invoker.num_commands() + 1))
+#     # invoker.add_command(EraseCommand(ssd, 5, 1))
 #
 #     # Fast read: Buffer에서 Erase 적용되어 BLANK_STRING 반환해야 함
 #     value = invoker.fast_read(5)
@@ -168,4 +168,20 @@ def test_fast_read_near_full_buffer(ctx):
 #
 #     # # NAND 확인: Flush 안 했으므로 NAND는 여전히 초기값 (BLANK_STRING)
 #     # nand_value = ssd._read_from_nand(5)
-#     # assert nand_value == BLANK_STRING, f"NAND should still be {BLANK_STRING}, but got {nand_value}"
\ No newline at end of file
+#     # assert nand_value == BLANK_STRING, f"NAND should still be {BLANK_STRING}, but got {nand_value}"
+
+# 범위 읽기: NAND 값 위에 Buffer 의 Write / Erase 가 순서대로 반영됨
+def test_fast_read_range(ctx):
+    ssd_inst, invoker = ctx
+    invoker.flush()
+    invoker.add_command(WriteCommand(ssd_inst, 10, "0x11111111"))
+    invoker.add_command(WriteCommand(ssd_inst, 11, "0x22222222"))
+    invoker.flush()  # 10, 11 은 NAND 에 기록
+
+    invoker.add_command(EraseCommand(ssd_inst, 11, 3))
+    invoker.add_command(WriteCommand(ssd_inst, 12, "0x33333333"))
+
+    values = invoker.fast_read_range(9, 6)
+
+    assert values == [BLANK_STRING, "0x11111111", BLANK_STRING, "0x33333333", BLANK_STRING, BLANK_STRING]
+    assert values == [invoker.fast_read(lba) for lba in range(9, 15)]
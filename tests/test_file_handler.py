@@ -0,0 +1,63 @@
+import pytest
+
+from file_handler import SimpleFileHandler, MultilineFileWriter
+
+BLANK = "0x00000000"
+
+
+@pytest.fixture
+def nand(tmp_path):
+    path = tmp_path / "nand.txt"
+    writer = MultilineFileWriter(SimpleFileHandler(str(path)))
+    writer.write_lines([BLANK for _ in range(10)])
+    return path, writer
+
+
+def test_read_record(nand):
+    path, writer = nand
+    writer.write_lines([f"0x{i:08X}" for i in range(10)])
+
+    assert writer.read_record(0) == "0x00000000"
+    assert writer.read_record(7) == "0x00000007"
+    assert writer.read_record(10) is None  # 범위 밖
+
+
+def test_write_record_touches_only_target(nand):
+    path, writer = nand
+    before = path.read_bytes()
+
+    writer.write_record(3, "0x12345678")
+
+    after = path.read_bytes()
+    assert len(after) == len(before)
+    assert writer.read_all_lines()[3] == "0x12345678"
+    assert after[:3 * 11] == before[:3 * 11]
+    assert after[4 * 11:] == before[4 * 11:]
+
+
+def test_write_records_range(nand):
+    path, writer = nand
+    writer.write_lines([f"0x{i:08X}" for i in range(10)])
+
+    writer.write_records(2, [BLANK] * 3)
+
+    lines = writer.read_all_lines()
+    assert lines[2:5] == [BLANK] * 3
+    assert lines[5] == "0x00000005"
+
+
+def test_broken_layout_falls_back_to_full_rewrite(nand):
+    path, writer = nand
+    lines = writer.read_all_lines()
+    lines[0] = "0x57"  # 고정 길이가 아닌 레코드
+    writer.write_lines(lines)
+
+    assert writer.read_record(1) is None
+    assert writer.read_specific_line(1) == BLANK
+
+    writer.write_record(1, "0xAAAAAAAA")
+
+    lines = writer.read_all_lines()
+    assert lines[0] == "0x57"
+    assert lines[1] == "0xAAAAAAAA"
+    assert len(lines) == 10
@@ -0,0 +1,156 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import ssd_config
+from flush_scheduler import FlushScheduler, MISS_POLL_INTERVAL, MISS_WINDOW, start_flush_scheduler
+from ssd import SSD, CommandInvoker, WriteCommand, ReadCommand
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def mock_ssd():
+    ssd = Mock(spec=SSD)
+    ssd._read_from_nand.return_value = "0x00000000"
+    return ssd
+
+
+@pytest.fixture
+def invoker(mock_ssd, tmp_path):
+    return CommandInvoker(mock_ssd, str(tmp_path))
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _write(invoker, ssd, lba):
+    invoker.add_command(WriteCommand(ssd, lba, "0x00000001"))
+
+
+def test_idle_flush(invoker, mock_ssd, clock):
+    scheduler = FlushScheduler(invoker, idle_ms=50, clock=clock)
+    _write(invoker, mock_ssd, 0)
+    assert scheduler.tick() is None
+
+    clock.advance(30)
+    _write(invoker, mock_ssd, 1)  # 명령이 오면 idle 시간이 다시 시작
+    assert scheduler.tick() is None
+    clock.advance(30)
+    assert scheduler.tick() is None
+
+    clock.advance(30)
+    assert scheduler.tick() == "idle"
+    assert invoker.num_commands() == 0
+
+
+def test_idle_does_not_flush_empty_buffer(invoker, clock):
+    scheduler = FlushScheduler(invoker, idle_ms=50, clock=clock)
+
+    clock.advance(1000)
+
+    assert scheduler.tick() is None
+    assert invoker.stats()['flushes'] == 0
+
+
+def test_age_limit_flushes_busy_buffer(invoker, mock_ssd, clock):
+    scheduler = FlushScheduler(invoker, max_age_ms=100, clock=clock)
+    scheduler.tick()
+
+    for lba in range(4):
+        _write(invoker, mock_ssd, lba)
+        scheduler.tick()
+        clock.advance(30)  # 계속 바빠서 idle 은 아님
+
+    assert scheduler.tick() == "age"
+    assert scheduler.triggered == {'idle': 0, 'age': 1, 'read_miss': 0}
+
+
+def test_age_restarts_after_overflow_flush(invoker, mock_ssd, clock, monkeypatch):
+    monkeypatch.setattr("ssd.MAX_COMMANDS", 2)
+    scheduler = FlushScheduler(invoker, max_age_ms=100, clock=clock)
+    _write(invoker, mock_ssd, 0)
+    scheduler.tick()
+
+    clock.advance(80)
+    _write(invoker, mock_ssd, 1)
+    _write(invoker, mock_ssd, 2)  # overflow flush, 버퍼에는 LBA 2 만 남음
+    scheduler.tick()
+    clock.advance(80)
+
+    assert scheduler.tick() is None
+
+
+def test_read_miss_pressure(invoker, mock_ssd, clock):
+    scheduler = FlushScheduler(invoker, miss_rate=0.9, clock=clock)
+    _write(invoker, mock_ssd, 0)
+
+    for lba in range(1, MISS_WINDOW):
+        invoker.fast_read(lba)
+    assert scheduler.tick() is None  # 아직 window 가 차지 않음
+
+    invoker.fast_read(99)
+    assert scheduler.tick() == "read_miss"
+    assert invoker.num_commands() == 0
+
+
+def test_read_hits_do_not_trigger(invoker, mock_ssd, clock):
+    scheduler = FlushScheduler(invoker, miss_rate=0.5, clock=clock)
+    _write(invoker, mock_ssd, 0)
+
+    for _ in range(MISS_WINDOW * 2):
+        invoker.fast_read(0)
+
+    assert scheduler.tick() is None
+
+
+def test_start_flush_scheduler_from_config(invoker, mock_ssd, monkeypatch):
+    assert start_flush_scheduler(invoker) is None  # 기본값은 모두 꺼짐
+
+    monkeypatch.setattr(ssd_config, "FLUSH_IDLE_MS", 20)
+    scheduler = start_flush_scheduler(invoker)
+    try:
+        _write(invoker, mock_ssd, 0)
+        for _ in range(200):
+            if invoker.num_commands() == 0:
+                break
+            time.sleep(0.01)
+    finally:
+        scheduler.stop()
+
+    assert scheduler.triggered['idle'] == 1
+
+
+def test_read_miss_uses_recent_window(invoker, mock_ssd, clock):
+    scheduler = FlushScheduler(invoker, miss_rate=0.3, clock=clock)
+    _write(invoker, mock_ssd, 0)
+
+    for lba in range(1, MISS_WINDOW):
+        invoker.fast_read(lba)  # flush 이후 누적으로는 miss 가 많지만
+    assert scheduler.tick() is None
+    for _ in range(MISS_WINDOW * 2):
+        invoker.fast_read(0)    # 최근 window 는 모두 hit
+
+    assert scheduler.tick() is None
+    assert invoker.num_commands() == 1
+
+
+def test_miss_rate_only_polls_slowly(invoker, mocker):
+    thread = mocker.patch("flush_scheduler.threading.Thread")
+    scheduler = FlushScheduler(invoker, miss_rate=0.5)
+
+    scheduler.start()
+
+    assert thread.call_args.kwargs['args'] == (MISS_POLL_INTERVAL,)
@@ -0,0 +1,249 @@
+import json
+import os
+
+import pytest
+
+from nand_storage import (
+    BinaryNandStorage,
+    MmapNandStorage,
+    TextNandStorage,
+    create_nand_storage,
+    export_text,
+)
+from ssd import SSD, BLANK_STRING, OUTPUT_FILE
+
+SIZE = 100
+
+
+@pytest.fixture(params=["text", "binary", "mmap"])
+def storage(request, tmp_path):
+    filename = str(tmp_path / f"nand.{request.param}")
+    storage = create_nand_storage(request.param, filename, SIZE)
+    storage.format()
+    yield storage
+    storage.close()
+
+
+def test_format_creates_blank_image(storage):
+    assert storage.is_valid()
+    assert storage.read_all() == [0] * SIZE
+
+
+def test_write_and_read(storage):
+    storage.write(0, 0x12345678)
+    storage.write(99, 0xFFFFFFFF)
+
+    assert storage.read(0) == 0x12345678
+    assert storage.read(99) == 0xFFFFFFFF
+    assert storage.read_hex(0) == "0x12345678"
+    assert storage.read(1) == 0
+
+
+def test_erase(storage):
+    for lba in range(10, 20):
+        storage.write(lba, 0xAAAAAAAA)
+
+    storage.erase(12, 5)
+
+    values = storage.read_all()
+    assert values[10:12] == [0xAAAAAAAA] * 2
+    assert values[12:17] == [0] * 5
+    assert values[17:20] == [0xAAAAAAAA] * 3
+
+
+def test_binary_image_layout(tmp_path):
+    storage = BinaryNandStorage(str(tmp_path / "nand.bin"), SIZE)
+    storage.format()
+    storage.write(2, 0x01020304)
+
+    data = open(storage.filename, "rb").read()
+    assert len(data) == SIZE * 4
+    assert data[8:12] == bytes([0x04, 0x03, 0x02, 0x01])  # little-endian
+
+
+def test_binary_invalid_size(tmp_path):
+    storage = BinaryNandStorage(str(tmp_path / "nand.bin"), SIZE)
+    with open(storage.filename, "wb") as f:
+        f.write(bytes(10))
+
+    assert not storage.is_valid()
+
+
+def test_mmap_shared_between_instances(tmp_path):
+    filename = str(tmp_path / "nand.bin")
+    writer = MmapNandStorage(filename, SIZE)
+    reader = MmapNandStorage(filename, SIZE)
+    writer.format()
+
+    writer.write(3, 0xCAFEBABE)
+    writer.erase(0, 2)
+
+    # msync 전에도 같은 이미지를 매핑한 쪽에서는 바로 보입니다
+    assert reader.read(3) == 0xCAFEBABE
+
+    writer.sync()
+    assert BinaryNandStorage(filename, SIZE).read(3) == 0xCAFEBABE
+    writer.close()
+    reader.close()
+
+
+def test_export_text(storage, tmp_path):
+    storage.write(5, 0xABCDEF01)
+    exported = tmp_path / "export.txt"
+
+    export_text(storage, str(exported))
+
+    exported_storage = TextNandStorage(str(exported), SIZE)
+    assert exported_storage.is_valid()
+    assert exported_storage.read_hex(5) == "0xABCDEF01"
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        create_nand_storage("tape", str(tmp_path / "nand"), SIZE)
+
+
+def test_ssd_with_binary_storage(tmp_path):
+    SSD._instance = None
+    try:
+        storage = BinaryNandStorage(str(tmp_path / "nand.bin"), SIZE)
+        ssd = SSD(storage)
+        assert os.path.exists(storage.filename)
+
+        ssd.write(7, "0x0000BEEF")
+        ssd.read(7)
+        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+            assert f.read() == "0x0000BEEF"
+
+        ssd.erase(7, 1)
+        assert ssd._read_from_nand(7) == BLANK_STRING
+    finally:
+        SSD._instance = None
+
+
+@pytest.fixture
+def text_storage(tmp_path):
+    storage = TextNandStorage(str(tmp_path / "nand.txt"), SIZE)
+    storage.format()
+    return storage
+
+
+def _external_write(storage, lines):
+    """도구 밖에서 파일을 고친 것처럼 쓰고, mtime 해상도와 무관하게 mtime 이 바뀌도록 함"""
+    before = os.stat(storage.filename)
+    storage.file_handler.write_lines(lines)
+    os.utime(storage.filename, ns=(before.st_atime_ns, before.st_mtime_ns + 1_000_000))
+
+
+def test_validation_cache_skips_full_scan(text_storage, mocker):
+    text_storage.write(1, 0x12345678)
+    text_storage.erase(0, 1)
+    text_storage.checkpoint()  # flush 가 끝날 때
+
+    # 다른 프로세스가 새로 연 것처럼 새 객체로 검사
+    reopened = TextNandStorage(text_storage.filename, SIZE)
+    spy = mocker.spy(reopened.file_handler, "read_all_lines")
+
+    assert reopened.is_valid()
+    spy.assert_not_called()
+    assert reopened.verify_checksum()
+
+
+def test_validation_cache_detects_external_change(text_storage):
+    lines = text_storage.file_handler.read_all_lines()
+    lines[3] = "0x001100GG"
+    _external_write(text_storage, lines)
+
+    reopened = TextNandStorage(text_storage.filename, SIZE)
+    assert not reopened.is_valid()
+
+
+def test_write_after_external_change_invalidates_cache(text_storage):
+    lines = text_storage.file_handler.read_all_lines()
+    lines[3] = "0x001100GG"
+    _external_write(text_storage, lines)
+
+    text_storage.write(5, 0xAAAAAAAA)
+    text_storage.checkpoint()
+
+    reopened = TextNandStorage(text_storage.filename, SIZE)
+    assert not reopened.is_valid()
+
+
+def test_full_verify_ignores_cache(text_storage):
+    meta = json.load(open(text_storage.filename + ".meta"))
+    lines = text_storage.file_handler.read_all_lines()
+    lines[3] = "0x001100GG"  # 크기가 같은 수정
+    text_storage.file_handler.write_lines(lines)
+    stat = os.stat(text_storage.filename)
+    os.utime(text_storage.filename, ns=(stat.st_atime_ns, meta["mtime_ns"]))
+
+    reopened = TextNandStorage(text_storage.filename, SIZE)
+    assert reopened.is_valid()  # stat 만 보는 캐시는 속지만
+    assert not reopened.verify_checksum()
+    assert not reopened.is_valid(full=True)
+
+
+def test_read_range(storage):
+    storage.write(3, 0x00000003)
+    storage.write(5, 0x00000005)
+
+    assert storage.read_range(2, 5) == [0, 3, 0, 5, 0]
+    assert storage.read_range(0, SIZE) == storage.read_all()
+
+
+def test_write_range(storage):
+    storage.write_range(10, [1, 2, 3])
+
+    assert storage.read_range(9, 5) == [0, 1, 2, 3, 0]
+
+
+def test_write_runs(storage):
+    storage.write_runs([(0, [1, 2]), (50, [3]), (98, [4, 5])])
+
+    values = storage.read_all()
+    assert values[:3] == [1, 2, 0]
+    assert values[50] == 3
+    assert values[98:] == [4, 5]
+    assert storage.is_valid()
+
+
+def test_text_writes_save_validation_cache_once_per_checkpoint(tmp_path, mocker):
+    storage = TextNandStorage(str(tmp_path / "nand.txt"), SIZE)
+    storage.format()
+    save = mocker.spy(storage._cache, "save")
+    load = mocker.spy(storage._cache, "load")
+
+    storage.write_runs([(0, [1]), (10, [2, 3]), (20, [4])])
+    storage.write(30, 5)
+    storage.erase(40, 2)
+
+    save.assert_not_called()  # write 마다 .meta 를 읽고 쓰지 않음
+    load.assert_not_called()
+    assert not TextNandStorage(storage.filename, SIZE).is_known_valid()
+
+    storage.checkpoint()
+    storage.checkpoint()
+
+    save.assert_called_once()
+    assert TextNandStorage(storage.filename, SIZE).is_known_valid()  # 캐시가 clean 으로 남음
+    assert storage.verify_checksum()
+
+
+def test_text_storage_does_not_touch_nand_timestamps(text_storage):
+    text_storage.write(1, 0x12345678)
+    stat = os.stat(text_storage.filename)
+
+    text_storage.close()
+
+    assert os.stat(text_storage.filename).st_mtime_ns == stat.st_mtime_ns
+    assert json.load(open(text_storage.filename + ".meta"))["mtime_ns"] == stat.st_mtime_ns
+
+
+def test_erase_spans_several_chunks(storage, monkeypatch):
+    monkeypatch.setattr("nand_storage.ERASE_CHUNK", 7)
+    storage.write_range(0, list(range(1, 101)))
+
+    storage.erase(3, 20)
+
+    assert storage.read_range(0, 25) == [1, 2, 3] + [0] * 20 + [24, 25]
@@ -2,6 +2,8 @@ import tempfile
 import pytest
 from pytest_mock import MockerFixture
 from shell import *
+from ssd_driver import SSDDriver
+from ssd import buffer_slot_names
 from shell_cmd_checker import COMMAND_DESCRIPTION
 
 
@@ -92,9 +94,9 @@ def test_shell_cmd_flush_success(shell_app, mocker: MockerFixture, capsys):
     buffer_files = ["1_empty", "2_empty", "3_empty", "4_empty", "5_empty"]
     assert 'INVALID COMMAND' not in captured.out
     assert '[Flush] Done' in captured.out
+    slot_names = buffer_slot_names()
     for buffer_file in buffer_files:
-        full_buffer_file = os.path.join(f"{ROOT_DIR}/buffer", buffer_file)
-        assert os.path.exists(full_buffer_file)
+        assert buffer_file in slot_names
 
 
 def test_shell_write(shell_app, mocker: MockerFixture, capsys):
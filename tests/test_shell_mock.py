@@ -3,6 +3,7 @@ import tempfile
 import pytest
 from pytest_mock import MockerFixture
 from shell import *
+from ssd_driver import SSDDriver
 from shell_cmd_checker import COMMAND_DESCRIPTION
 
 
@@ -252,26 +253,42 @@ def test_shell_help(capsys):
 
 def test_shell_full_read(shell_app, mocker: MockerFixture, capsys):
     # Arrange
-    shell_app._ssd_driver.run_ssd_read.side_effect = [0] * 100
-    shell_app._ssd_driver.get_ssd_output.side_effect = ["0x00000000"] * 100
+    shell_app._ssd_driver.run_ssd_range_read.return_value = ["0x00000000"] * 100
 
     # Act
     ret = shell_app.full_read()
     captured = capsys.readouterr()
     assert ret == READ_SUCCESS
-    assert shell_app._ssd_driver.run_ssd_read.call_count == 100
+    assert "[Read] LBA 99 : 0x00000000" in captured.out
+    # 100 개 LBA 를 range read 한 번으로 수행
+    shell_app._ssd_driver.run_ssd_range_read.assert_called_once_with(start="0", count="100")
+    assert shell_app._ssd_driver.run_ssd_read.call_count == 0
+
+
+def test_shell_full_read_error(shell_app):
+    # Arrange
+    shell_app._ssd_driver.run_ssd_range_read.return_value = None
+
+    # Act
+    ret = shell_app.full_read()
+
+    # Assert
+    assert ret == READ_ERROR
 
 
 def test_shell_full_write(shell_app, mocker: MockerFixture):
     # Arrange
-    shell_app._ssd_driver.run_ssd_write.side_effect = [WRITE_SUCCESS] * 100
+    shell_app._ssd_driver.run_ssd_fill.return_value = WRITE_SUCCESS
 
     # Act
     ret = shell_app.full_write(value="0x12345678")
 
     # Assert
     assert ret == WRITE_SUCCESS
-    assert shell_app._ssd_driver.run_ssd_write.call_count == 100
+    # 100 개 LBA 를 장치의 FILL 명령 한 번으로 채움
+    shell_app._ssd_driver.run_ssd_fill.assert_called_once_with(start="0", count="100",
+                                                                pattern="const", arg="0x12345678")
+    assert shell_app._ssd_driver.run_ssd_write.call_count == 0
 
 
 def test_shell_full_write_wrong_format():
@@ -309,6 +326,60 @@ def test_shell_partial_lba_write(shell_app, mocker: MockerFixture, capsys):
     assert shell_app._ssd_driver.run_ssd_read.call_count == 150
 
 
+def test_shell_write_read_aging(shell_app, mocker: MockerFixture):
+    # Arrange
+    mocker.patch("shell.random.randint", return_value=0x12345678)
+    shell_app._ssd_driver.run_ssd_batch.return_value = SUCCESS
+    shell_app._ssd_driver.get_ssd_outputs.return_value = ["0x12345678"] * 400
+
+    # Act
+    ret = shell_app.write_read_aging()
+
+    # Assert
+    assert ret == SUCCESS
+    assert shell_app._ssd_driver.run_ssd_batch.call_count == 1
+    assert len(shell_app._ssd_driver.run_ssd_batch.call_args.args[0]) == 800
+
+
+def test_shell_erase_write_aging_mismatch(shell_app):
+    # Arrange
+    shell_app._ssd_driver.run_ssd_batch.return_value = SUCCESS
+    shell_app._ssd_driver.get_ssd_outputs.return_value = ["0x12345678"]
+
+    # Act
+    ret = shell_app.erase_write_aging()
+
+    # Assert
+    assert ret == ERROR
+    assert shell_app._ssd_driver.run_ssd_batch.call_count == 1
+
+
+def test_shell_erase_in_chunks(shell_app):
+    # Arrange
+    shell_app._ssd_driver.run_ssd_batch.return_value = ERASE_SUCCESS
+
+    # Act
+    ret = shell_app.erase_range("0", "99")
+
+    # Assert
+    assert ret == ERASE_SUCCESS
+    shell_app._ssd_driver.run_ssd_batch.assert_called_once_with(
+        [['E', start, 10] for start in range(0, 100, 10)])
+
+
+def test_shell_erase_without_size_limit(shell_app, mocker):
+    # Arrange
+    mocker.patch("shell.config.MAX_ERASE_SIZE", 0)
+    shell_app._ssd_driver.run_ssd_batch.return_value = ERASE_SUCCESS
+
+    # Act
+    ret = shell_app.erase_range("0", "99")
+
+    # Assert
+    assert ret == ERASE_SUCCESS
+    shell_app._ssd_driver.run_ssd_batch.assert_called_once_with([['E', 0, 100]])
+
+
 def test_shell_write_read_aging_with_real(shell_app, mocker: MockerFixture, capsys):
     # Arrange
     shell_app = TestShellApp()
@@ -466,3 +537,27 @@ def test_shell_erase_invalid_range(shell_app, mocker, range):
 
     # Assert
     assert ERASE_ERROR == ret_pass
+
+
+def test_shell_exit_closes_driver(shell_app, mocker: MockerFixture):
+    mocker.patch("builtins.input", side_effect=["exit"])
+    mocker.patch("sys.argv", ["shell.py"])
+    shell_app._ssd_driver.close = mocker.Mock()  # 상주 프로세스를 가진 드라이버
+
+    with pytest.raises(SystemExit):
+        shell_app.run()
+
+    shell_app._ssd_driver.close.assert_called_once()  # exit 와 run 종료에서 두 번 닫지 않음
+
+
+def test_shell_runner_closes_driver(shell_app, mocker: MockerFixture, tmp_path):
+    script = tmp_path / "script.txt"
+    script.write_text("1_\n")
+    mocker.patch("sys.argv", ["shell.py", str(script)])
+    shell_app._ssd_driver.close = mocker.Mock()
+    shell_app._ssd_driver.run_ssd_batch.return_value = SUCCESS
+    shell_app._ssd_driver.get_ssd_outputs.side_effect = lambda: []
+
+    shell_app.run()
+
+    shell_app._ssd_driver.close.assert_called_once()
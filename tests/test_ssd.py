@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 from tests.test_read import get_output_file, TEST_VALUE
 from tests.test_ssd_write import read_target
+from ssd import buffer_slot_names
 
 def buffer_flush():
     ssd_path = str(Path(__file__).parent.parent / "ssd.py")
@@ -21,7 +22,6 @@ def test_main_write_called():
     addr, value = '0', TEST_VALUE
     ssd_path = str(Path(__file__).parent.parent / "ssd.py")
     target_file_name = f'1_W_{addr}_{value}'
-    file_path = os.path.join('buffer', target_file_name)
     buffer_flush()
 
     #action
@@ -31,7 +31,7 @@ def test_main_write_called():
         text=True
     )
     #assert
-    assert os.path.isfile(file_path)
+    assert target_file_name in buffer_slot_names()
 
 def test_main_write_and_flush_called():
 
@@ -81,4 +81,14 @@ def test_main_command_buffer_multiple_call():
             )
 
     assert get_output_file() == TEST_VALUE
-"""
\ No newline at end of file
+"""
+
+def test_import_skips_heavy_modules():
+    # ssd.py 는 명령마다 새 프로세스로 실행되므로 시작 때 필요 없는 모듈은 쓰는 곳에서 import
+    result = subprocess.run(
+        [sys.executable, "-c", "import ssd, sys; print(' '.join(m for m in "
+         "('pathlib', 'threading', 'random', 'heapq', 'json', 're') if m in sys.modules))"],
+        cwd=str(Path(__file__).parent.parent), capture_output=True, text=True
+    )
+
+    assert result.stdout.strip() == ""
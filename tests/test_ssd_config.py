@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import shell_cmd_checker as checker
+import ssd_config
+
+SSD_PATH = str(Path(__file__).parent.parent / "ssd.py")
+
+
+def run_ssd(env, *args):
+    return subprocess.run([sys.executable, SSD_PATH, *args], env=env, capture_output=True, text=True)
+
+
+@pytest.fixture
+def large_device_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "LBA_COUNT", 1_000_000)
+    monkeypatch.setattr(ssd_config, "NAND_BACKEND", "binary")
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    return ssd_config.as_env()
+
+
+def test_as_env_exports_geometry(monkeypatch):
+    monkeypatch.setattr(ssd_config, "LBA_COUNT", 4096)
+    monkeypatch.setattr(ssd_config, "MAX_ERASE_SIZE", 64)
+    monkeypatch.setattr(ssd_config, "BUFFER_DEPTH", 32)
+
+    env = ssd_config.as_env()
+
+    assert env["SSD_LBA_COUNT"] == "4096"
+    assert env["SSD_MAX_ERASE_SIZE"] == "64"
+    assert env["SSD_BUFFER_DEPTH"] == "32"
+
+
+@pytest.mark.parametrize("address, expected", [("0", True), ("99", True), ("100", True), ("4095", True),
+                                               ("4096", False), ("-1", False)])
+def test_checker_uses_lba_count(monkeypatch, address, expected):
+    monkeypatch.setattr(ssd_config, "LBA_COUNT", 4096)
+
+    assert checker.is_valid_address(address) == expected
+
+
+def test_large_device_write_and_read(large_device_env, tmp_path):
+    last_lba = str(1_000_000 - 1)
+
+    run_ssd(large_device_env, "W", last_lba, "0x12345678")
+    run_ssd(large_device_env, "F")
+    run_ssd(large_device_env, "R", last_lba)
+
+    assert (tmp_path / "ssd_output.txt").read_text() == "0x12345678"
+    # 바이너리 이미지는 truncate 로 만들어지므로 LBA 개수 * 4 byte
+    assert os.path.getsize(tmp_path / "ssd_nand.bin") == 1_000_000 * 4
+
+
+def test_large_device_rejects_out_of_range(large_device_env, tmp_path):
+    run_ssd(large_device_env, "W", str(1_000_000), "0x12345678")
+
+    assert (tmp_path / "ssd_output.txt").read_text() == "ERROR"
+
+
+def test_large_device_full_erase_without_size_limit(large_device_env, tmp_path):
+    large_device_env["SSD_MAX_ERASE_SIZE"] = "0"
+    last_lba = str(1_000_000 - 1)
+
+    run_ssd(large_device_env, "W", last_lba, "0x12345678")
+    run_ssd(large_device_env, "F")
+    run_ssd(large_device_env, "E", "0", str(1_000_000))
+    run_ssd(large_device_env, "R", last_lba)
+
+    assert (tmp_path / "ssd_output.txt").read_text() == "0x00000000"
+
+
+def test_flush_policy_is_passed_to_ssd(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(ssd_config, "FLUSH_POLICY", "coldest")
+    monkeypatch.setattr(ssd_config, "FLUSH_SIZE", 2)
+    env = ssd_config.as_env()
+
+    assert "flush_policy=coldest" in run_ssd(env, "STATS").stdout
+
+    env["SSD_FLUSH_POLICY"] = "newest"
+    assert run_ssd(env, "STATS").returncode != 0
+
+
+def test_text_backend_rejects_large_device(tmp_path):
+    env = dict(os.environ, SSD_LBA_COUNT=str(ssd_config.TEXT_MAX_LBA_COUNT + 1), SSD_NAND_BACKEND="text",
+               SSD_DATA_DIR=str(tmp_path))
+
+    result = run_ssd(env, "R", "0")
+
+    assert result.returncode != 0
+    assert "binary or mmap" in result.stderr
+    assert not (tmp_path / "ssd_nand.txt").exists()
@@ -0,0 +1,229 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import ssd_config
+from nand_storage import BinaryNandStorage
+from shell import TestShellApp, SUCCESS
+from ssd import SSD, CommandInvoker, MAX_COMMANDS, fill_values
+from ssd_driver import InProcessSSDDriver, SSDDriver, ERROR, create_ssd_driver
+
+SSD_PATH = str(Path(__file__).parent.parent / "ssd.py")
+
+
+@pytest.fixture
+def driver(tmp_path):
+    SSD._instance = None
+    ssd = SSD(BinaryNandStorage(str(tmp_path / "nand.bin"), 100))
+    yield InProcessSSDDriver(ssd, CommandInvoker(ssd, str(tmp_path / "buffer")))
+    SSD._instance = None
+
+
+def test_write_is_buffered_and_fast_read(driver):
+    assert driver.run_ssd_write("3", "0x0000ABCD") == SUCCESS
+    assert driver.run_ssd_read("3") == SUCCESS
+
+    assert driver.get_ssd_output() == "0x0000ABCD"
+    assert driver.invoker.num_commands() == 1
+
+
+def test_ignore_and_merge(driver):
+    driver.run_ssd_write("3", "0x00000001")
+    driver.run_ssd_write("3", "0x00000002")  # 앞의 W 3 은 무시
+    driver.run_ssd_erase("10", "2")
+    driver.run_ssd_erase("12", "3")  # 인접 Erase 병합
+
+    assert driver.invoker.slot_names()[:2] == ["1_W_3_0x00000002", "2_E_10_5"]
+
+
+def test_flush_writes_nand(driver, tmp_path):
+    driver.run_ssd_write("99", "0xFFFFFFFF")
+    driver.run_ssd_flush()
+
+    assert driver.invoker.num_commands() == 0
+    assert BinaryNandStorage(str(tmp_path / "nand.bin"), 100).read(99) == 0xFFFFFFFF
+
+
+def test_buffer_overflow_flushes(driver):
+    for lba in range(MAX_COMMANDS + 1):
+        driver.run_ssd_write(str(lba), "0x00000001")
+
+    assert driver.invoker.num_commands() == 1
+
+
+def test_invalid_arguments(driver):
+    driver.run_ssd_write("100", "0x00000001")
+    with pytest.raises(ValueError):
+        driver.get_ssd_output()  # CLI 와 같이 출력이 ERROR
+
+    assert driver.run_cmd_to_ssd(["X"]) == ERROR
+    assert driver.run_cmd_to_ssd(["R", "abc"]) == ERROR
+
+
+def test_shell_scripts(driver):
+    app = TestShellApp(driver)
+    app._is_runner = True
+
+    assert app.full_write_and_read_compare() == SUCCESS
+    assert app.partial_lba_write() == SUCCESS
+    assert app.write_read_aging() == SUCCESS
+    assert app.erase_write_aging() == SUCCESS
+
+
+def test_create_inprocess_driver():
+    SSD._instance = None
+    try:
+        assert isinstance(create_ssd_driver("inprocess"), InProcessSSDDriver)
+    finally:
+        SSD._instance = None
+
+
+@pytest.fixture
+def batch_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    return ssd_config.as_env()
+
+
+def test_subprocess_batch(batch_env):
+    driver = SSDDriver()
+
+    status = driver.run_ssd_batch([["W", 3, "0x00000003"], ["R", 3], ["E", 3, 1], ["R", 3], ["F"], ["R", 3]])
+
+    assert status == SUCCESS
+    assert driver.get_ssd_outputs() == ["0x00000003", "0x00000000", "0x00000000"]
+
+
+def test_subprocess_batch_unknown_command(batch_env):
+    driver = SSDDriver()
+
+    assert driver.run_ssd_batch([["R", 0], ["X", 1], ["R", 1]]) == ERROR
+    assert driver.get_ssd_outputs() == ["0x00000000"]  # 실패 전까지의 출력은 남음
+
+
+def test_batch_from_file(batch_env, tmp_path):
+    script = tmp_path / "commands.txt"
+    script.write_text("W 1 0x00000001\n\nw 100 0x00000001\nR 1\n")
+
+    subprocess.run([sys.executable, SSD_PATH, "BATCH", str(script)], env=batch_env)
+
+    assert (tmp_path / "ssd_output.txt").read_text() == "ERROR\n0x00000001"
+
+
+def test_batch_accepts_range_fill_and_deallocate(batch_env, tmp_path):
+    script = tmp_path / "commands.txt"
+    script.write_text("FILL 0 4 inc 0x00000001\nD 1 1\nRR 0 3\nR 3\n")
+
+    subprocess.run([sys.executable, SSD_PATH, "BATCH", str(script)], env=batch_env)
+
+    assert (tmp_path / "ssd_output.txt").read_text() == "0x00000001\n0x00000000\n0x00000003\n0x00000004"
+
+
+def test_inprocess_batch(driver):
+    assert driver.run_ssd_batch([["W", 0, "0x0000000A"], ["R", 0], ["R", 1]]) == SUCCESS
+    assert driver.get_ssd_outputs() == ["0x0000000A", "0x00000000"]
+
+
+def test_inprocess_range_read(driver):
+    driver.run_ssd_write("1", "0x00000001")
+    driver.run_ssd_flush()
+    driver.run_ssd_write("2", "0x00000002")
+
+    assert driver.run_ssd_range_read("0", "3") == ["0x00000000", "0x00000001", "0x00000002"]
+    assert driver.run_ssd_range_read("99", "2") is None  # 범위를 넘으면 출력이 ERROR
+
+
+def test_subprocess_range_read(batch_env, tmp_path):
+    driver = SSDDriver()
+    driver.run_ssd_batch([["W", 98, "0x00000098"], ["E", 0, 1]])
+
+    values = driver.run_ssd_range_read("0", "100")
+
+    assert len(values) == 100
+    assert values[98] == "0x00000098"
+    assert (tmp_path / "ssd_output.txt").read_text().count("\n") == 99
+
+
+def test_subprocess_range_read_out_of_range(batch_env):
+    driver = SSDDriver()
+
+    assert driver.run_ssd_range_read("95", "10") is None
+    assert driver.run_ssd_range_read("95", "5") == ["0x00000000"] * 5
+
+
+@pytest.mark.parametrize("size", ["50", "-3", "11"])
+def test_cli_rejects_erase_size_out_of_limit(batch_env, tmp_path, size):
+    def run(*args):
+        (tmp_path / "ssd_output.txt").write_text("")
+        subprocess.run([sys.executable, SSD_PATH, *args], env=batch_env, capture_output=True)
+        return (tmp_path / "ssd_output.txt").read_text()
+
+    run("W", "5", "0x00000005")
+    run("W", "40", "0x00000040")
+    run("F")
+
+    assert run("E", "0", size) == "ERROR"
+    assert run("D", "0", size) == "ERROR"
+    run("F")
+    assert run("R", "5") == "0x00000005"
+    assert run("R", "40") == "0x00000040"
+
+
+def test_fill_values():
+    assert list(fill_values("const", "0x0000000A", 3)) == [10, 10, 10]
+    assert list(fill_values("inc", "0xFFFFFFFE", 3)) == [0xFFFFFFFE, 0xFFFFFFFF, 0]
+    assert list(fill_values("random", "7", 4)) == list(fill_values("random", "7", 4))
+
+
+def test_fill_after_buffered_commands(driver):
+    driver.run_ssd_write("4", "0x00000004")   # fill 범위 안: fill 값으로 덮여야 함
+    driver.run_ssd_write("50", "0x00000050")  # fill 범위 밖: 그대로 버퍼에 남아야 함
+    driver.run_ssd_erase("9", "3")
+
+    assert driver.run_ssd_fill("0", "10", "inc", "0x00000100") == SUCCESS
+    driver.run_ssd_write("5", "0x00000005")  # fill 이후 명령은 fill 값을 덮어씀
+
+    values = driver.run_ssd_range_read("0", "12")
+    assert values[:5] == [f"0x{0x100 + lba:08X}" for lba in range(5)]
+    assert values[5] == "0x00000005"
+    assert values[6:10] == [f"0x{0x100 + lba:08X}" for lba in range(6, 10)]
+    assert values[10:] == ["0x00000000"] * 2
+    assert driver.run_ssd_range_read("50", "1") == ["0x00000050"]
+
+
+def test_fill_keeps_unrelated_buffer(driver):
+    driver.run_ssd_write("50", "0x00000050")
+
+    driver.run_ssd_fill("0", "10", "const", "0x00000001")
+
+    assert driver.invoker.num_commands() == 1  # 겹치지 않으면 flush 하지 않음
+
+
+@pytest.mark.parametrize("args", [["0", "101", "const", "0x00000001"], ["0", "10", "const", "1"],
+                                  ["0", "10", "zigzag", "1"], ["0", "10", "random", "-1"], ["0", "10"]])
+def test_fill_invalid_arguments(driver, args):
+    driver.run_cmd_to_ssd(["FILL", *args])
+
+    with pytest.raises(ValueError):
+        driver.get_ssd_output()
+
+
+def test_subprocess_full_write_uses_fill(batch_env):
+    app = TestShellApp(SSDDriver())
+
+    assert app.full_write("0x0000ABCD") == SUCCESS
+    assert app.full_read() == SUCCESS
+    assert app._ssd_output_cache == "0x0000ABCD"
+
+
+def test_unlimited_erase_is_one_buffered_command(driver, monkeypatch):
+    monkeypatch.setattr("ssd.MAX_ERASE_SIZE", 100)
+    driver.run_ssd_fill("0", "100", "const", "0x00000001")
+
+    driver.run_ssd_erase("0", "30")
+    driver.run_cmd_to_ssd(["D", "30", "70"])  # deallocate 는 erase 와 같음
+
+    assert driver.invoker.slot_names()[0] == "1_E_0_100"
+    assert driver.invoker.num_commands() == 1
+    assert driver.run_ssd_range_read("0", "100") == ["0x00000000"] * 100
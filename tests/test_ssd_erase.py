@@ -88,3 +88,22 @@ def test_erase_invalid_range(ssd, addr, size):
 def test_erase_invalid_type(ssd, addr, size):
     ssd.erase(addr, size)
     assert read_output() == ERROR_STRING
+
+
+def test_erase_without_size_limit(ssd, monkeypatch):
+    monkeypatch.setattr("ssd.MAX_ERASE_SIZE", 100)  # SSD_MAX_ERASE_SIZE=0 (제한 없음)
+    ssd.erase(0, 100)
+    assert read_target() == [BLANK_STRING] * 100
+
+
+def test_batched_erase_keeps_interval(ssd):
+    ssd.begin_batch()
+    ssd.write(10, 0x11111111)   # 뒤의 Erase 가 지움
+    ssd.erase(10, 5)
+    ssd.write(12, 0x22222222)   # Erase 뒤의 Write 는 남음
+    ssd.erase(15, 5)            # 맞닿은 Erase 는 한 구간으로 합쳐 지움
+    assert ssd._pending == {12: 0x22222222}  # Erase 는 LBA 별 항목으로 펼치지 않음
+    ssd.end_batch()
+
+    lines = read_target()
+    assert lines[10:20] == [BLANK_STRING] * 2 + ["0x22222222"] + [BLANK_STRING] * 7
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+import ssd_config
+from shell import TestShellApp
+from ssd_driver import ForkServerSSDDriver, SSDDriver, create_ssd_driver, SUCCESS, ERROR, SSD_COMMAND
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork 필요")
+
+
+@pytest.fixture
+def fork_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def driver(fork_env):
+    driver = ForkServerSSDDriver()
+    yield driver
+    driver.close()
+
+
+def test_write_read_flush(driver, fork_env):
+    assert driver.run_ssd_write("3", "0x0000ABCD") == SUCCESS
+    assert driver.run_ssd_read("3") == SUCCESS
+    assert driver.get_ssd_output() == "0x0000ABCD"
+
+    assert driver.run_ssd_flush() == SUCCESS
+    assert "0x0000ABCD" in (fork_env / "ssd_nand.txt").read_text()
+
+
+def test_exit_codes_match_cli(driver):
+    subprocess_driver = SSDDriver()
+
+    for args in (["X"], ["R", "abc"], ["W", "100", "0x00000001"], ["RR", "0", "2"]):
+        command = [*SSD_COMMAND, *args]
+        assert driver._run(command) == subprocess_driver._run(command)
+
+
+def test_launcher_is_reused_and_survives_failures(driver):
+    driver.run_ssd_write("0", "0x00000001")
+    pid = driver._server.pid
+
+    assert driver.run_cmd_to_ssd([*SSD_COMMAND, "R", "abc"]) == ERROR  # 자식에서 ValueError
+    assert driver.run_ssd_read("0") == SUCCESS
+
+    assert driver._server.pid == pid
+    assert driver.get_ssd_output() == "0x00000001"
+
+
+def test_batch_input(driver):
+    assert driver.run_ssd_batch([["W", 1, "0x00000001"], ["R", 1], ["R", 2]]) == SUCCESS
+    assert driver.get_ssd_outputs() == ["0x00000001", "0x00000000"]
+
+
+def test_config_change_restarts_launcher(driver, tmp_path, monkeypatch):
+    driver.run_ssd_write("0", "0x00000001")
+    pid = driver._server.pid
+
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path / "other"))
+    os.makedirs(tmp_path / "other")
+    driver.run_ssd_read("0")
+
+    assert driver._server.pid != pid
+    assert (tmp_path / "other" / "ssd_output.txt").read_text() == "0x00000000"
+
+
+def test_dead_launcher_falls_back_to_subprocess(driver):
+    driver.run_ssd_write("0", "0x00000001")
+    driver._server._proc.kill()
+    driver._server._proc.wait()
+
+    assert driver.run_ssd_read("0") == SUCCESS
+    assert driver.get_ssd_output() == "0x00000001"
+
+
+def test_shell_scripts(driver):
+    app = TestShellApp(driver)
+    app._is_runner = True
+
+    assert app.full_write_and_read_compare() == SUCCESS
+    assert app.partial_lba_write() == SUCCESS
+
+
+def test_create_forkserver_driver():
+    assert isinstance(create_ssd_driver("forkserver"), ForkServerSSDDriver)
@@ -0,0 +1,139 @@
+import io
+import os
+
+import pytest
+
+import ssd_config
+from nand_storage import BinaryNandStorage
+from shell import TestShellApp
+from ssd import SSD
+from ssd_driver import PipeSSDDriver, create_ssd_driver, SUCCESS, ERROR
+from ssd_server import serve_pipe
+
+
+@pytest.fixture
+def pipe_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def driver(pipe_env):
+    driver = PipeSSDDriver()
+    yield driver
+    driver.close()
+
+
+def test_serve_pipe_one_line_per_response(pipe_env, monkeypatch):
+    # 프로젝트 루트의 NAND / 버퍼 대신 tmp 디렉토리를 쓰도록 SSD 싱글톤과 버퍼 위치를 미리 잡음
+    SSD._instance = None
+    SSD(BinaryNandStorage(str(pipe_env / "nand.bin"), 100))
+    monkeypatch.setattr("ssd.BUFFER_DIR", str(pipe_env / "buffer"))
+    stdout = io.StringIO()
+
+    serve_pipe(io.StringIO("W 3 0x00000001\nR 3\nRR 2 2\nX\n"), stdout)
+
+    assert stdout.getvalue().split("\n") == [
+        "OK", "OK 0x00000001", "OK 0x00000000\t0x00000001", "FAIL Unknown command: X", ""]
+    SSD._instance = None
+
+
+def test_write_read_flush(driver, pipe_env):
+    assert driver.run_ssd_write("3", "0x0000ABCD") == SUCCESS
+    assert driver.run_ssd_read("3") == SUCCESS
+    assert driver.get_ssd_output() == "0x0000ABCD"
+    assert not (pipe_env / "ssd_output.txt").exists()
+
+    assert driver.run_ssd_flush() == SUCCESS
+    assert "0x0000ABCD" in (pipe_env / "ssd_nand.txt").read_text()
+
+
+def test_range_read(driver):
+    driver.run_ssd_write("1", "0x00000001")
+
+    assert driver.run_ssd_range_read("0", "3") == ["0x00000000", "0x00000001", "0x00000000"]
+
+
+def test_unknown_command_fails(driver):
+    assert driver.run_cmd_to_ssd(["X"]) == ERROR
+    assert driver.run_ssd_read("0") == SUCCESS
+
+
+def test_batch_is_pipelined(driver, monkeypatch):
+    monkeypatch.setattr(PipeSSDDriver, "PIPELINE_DEPTH", 4)
+    commands = [["W", lba, f"0x{lba:08X}"] for lba in range(10)] + [["R", lba] for lba in range(10)]
+
+    assert driver.run_ssd_batch(commands) == SUCCESS
+    assert driver.get_ssd_outputs() == [f"0x{lba:08X}" for lba in range(10)]
+
+
+def test_batch_failure_keeps_responses_in_step(driver):
+    assert driver.run_ssd_batch([["R", 0], ["X"], ["W", 1, "0x00000001"], ["R", 1]]) == ERROR
+    assert driver.get_ssd_outputs() == ["0x00000000"]
+
+    # 실패 뒤에 이미 보낸 명령의 응답이 다음 요청에 섞이지 않음
+    assert driver.run_ssd_read("2") == SUCCESS
+    assert driver.get_ssd_output() == "0x00000000"
+
+
+def test_child_is_reused_and_restarted(driver):
+    driver.run_ssd_write("0", "0x00000001")
+    pid = driver._channel.pid
+    driver.run_ssd_read("0")
+    assert driver._channel.pid == pid
+
+    driver._channel.kill()
+    driver._channel.wait()
+
+    assert driver.run_ssd_read("0") == SUCCESS
+    assert driver._channel.pid != pid
+    assert driver.get_ssd_output() == "0x00000001"  # 버퍼는 저널로 복구
+
+
+def test_config_change_restarts_child(driver, tmp_path, monkeypatch):
+    driver.run_ssd_write("0", "0x00000001")
+    pid = driver._channel.pid
+
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path / "other"))
+    os.makedirs(tmp_path / "other")
+    driver.run_ssd_read("0")
+
+    assert driver._channel.pid != pid
+    assert driver.get_ssd_output() == "0x00000000"
+
+
+def test_close_lets_child_exit_cleanly(driver, pipe_env):
+    driver.run_ssd_write("0", "0x00000001")
+    proc = driver._channel
+
+    driver.close()
+
+    assert proc.returncode == 0
+    assert (pipe_env / "buffer" / "journal.log.clean").exists()
+
+
+def test_shell_scripts(driver):
+    app = TestShellApp(driver)
+    app._is_runner = True
+
+    assert app.full_write_and_read_compare() == SUCCESS
+    assert app.partial_lba_write() == SUCCESS
+
+
+def test_create_pipe_driver():
+    assert isinstance(create_ssd_driver("pipe"), PipeSSDDriver)
+
+
+@pytest.mark.parametrize("command, response", [
+    (["W", "3"], "OK ERROR"), (["W"], "OK ERROR"), (["E", "1"], "OK ERROR"), (["RR", "1"], "OK ERROR"),
+    (["FILL", "0"], "OK ERROR"), (["R"], "FAIL R needs an LBA"),
+])
+def test_short_request_keeps_child_alive(driver, command, response):
+    driver.run_ssd_write("3", "0x00000001")
+    pid = driver._channel.pid
+
+    assert driver._execute(command) == response  # 인자가 모자란 요청도 CLI 처럼 ERROR / FAIL 로 응답
+
+    assert driver.run_ssd_read("3") == SUCCESS
+    assert driver._channel.pid == pid  # 잘못된 요청이 자식을 죽이지 않음
+    assert driver.get_ssd_output() == "0x00000001"
@@ -0,0 +1,158 @@
+import os
+
+import pytest
+
+import ssd_config
+import ssd_ring
+from shell import TestShellApp
+from ssd_driver import RingSSDDriver, create_ssd_driver, SUCCESS, ERROR
+
+
+@pytest.fixture
+def ring_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def driver(ring_env):
+    driver = RingSSDDriver()
+    yield driver
+    driver.close()
+
+
+def test_write_read_flush(driver, ring_env):
+    assert driver.run_ssd_write("3", "0x0000ABCD") == SUCCESS
+    assert driver.run_ssd_read("3") == SUCCESS
+    assert driver.get_ssd_output() == "0x0000ABCD"
+    assert not (ring_env / "ssd_output.txt").exists()
+
+    assert driver.run_ssd_flush() == SUCCESS
+    assert "0x0000ABCD" in (ring_env / "ssd_nand.txt").read_text()
+
+
+def test_range_read_uses_payload_area(driver):
+    driver.run_ssd_write("99", "0x00000063")
+
+    outputs = driver.run_ssd_range_read("0", "100")
+
+    assert len(outputs) == 100
+    assert outputs[-1] == "0x00000063"
+
+
+def test_pipelined_range_reads_share_one_payload(driver):
+    commands = []
+    for lba in range(8):
+        commands += [["W", lba, f"0x{lba + 1:08X}"], ["RR", 0, 100], ["R", lba]]
+
+    assert driver.run_ssd_batch(commands) == SUCCESS  # 큰 응답이 payload 를 차례로 넘겨받음
+
+    expected = []
+    for lba in range(8):
+        written = [f"0x{x + 1:08X}" if x <= lba else "0x00000000" for x in range(100)]
+        expected += written + [written[lba]]
+    assert driver.get_ssd_outputs() == expected
+
+
+def test_ring_size_does_not_scale_with_depth(ring_env, monkeypatch):
+    monkeypatch.setattr(ssd_config, "LBA_COUNT", 200000)
+    driver = RingSSDDriver()
+    try:
+        assert len(driver.run_ssd_range_read("0", "200000")) == 200000
+        size = driver._channel._shm.size
+    finally:
+        driver.close()
+
+    # 장치 전체 RR 도 payload 하나로 돌려주고, CQ 슬롯마다 RR 크기를 잡지 않음 (예전에는 DEPTH 배)
+    assert size < ssd_ring.PAYLOAD_OFFSET + 11 * 200000 + 4096 * 2
+
+
+def test_unknown_command_fails(driver):
+    assert driver.run_cmd_to_ssd(["X"]) == ERROR
+    assert driver.run_ssd_read("0") == SUCCESS
+
+
+def test_short_write_is_answered(driver):
+    assert driver.run_ssd_write("3", "0x00000001") == SUCCESS
+    pid = driver._channel.pid
+
+    assert driver._execute(["W", "3"]) == "OK ERROR"  # 값이 없는 Write 가 서버를 죽이지 않음
+    assert driver.run_ssd_read("3") == SUCCESS
+    assert driver._channel.pid == pid
+    assert driver.get_ssd_output() == "0x00000001"
+
+
+def test_oversized_request_fails_without_desync(driver):
+    long_value = "0x" + "0" * ssd_ring.SQ_SLOT  # SQ 레코드에 들어가지 않는 요청
+
+    assert driver.run_ssd_write("1", long_value) == ERROR
+    assert driver.run_ssd_batch([["W", 2, "0x00000002"], ["W", 3, long_value], ["R", 2]]) == ERROR
+    assert driver.get_ssd_outputs() == []
+
+    assert driver.run_ssd_read("2") == SUCCESS  # 거절 전에 보낸 명령은 수행되고, 응답 짝은 그대로
+    assert driver.get_ssd_output() == "0x00000002"
+
+
+def test_batch_wraps_around_the_ring(driver):
+    count = ssd_ring.DEPTH * 3
+    commands = [["W", lba % 100, f"0x{lba:08X}"] for lba in range(count)] + [["R", (count - 1) % 100]]
+
+    assert driver.run_ssd_batch(commands) == SUCCESS
+    assert driver.get_ssd_outputs() == [f"0x{count - 1:08X}"]
+
+
+def test_blocking_wait_is_woken_by_doorbell(driver, monkeypatch):
+    monkeypatch.setattr(ssd_ring, "SPIN_COUNT", 0)  # 드라이버 쪽은 바로 doorbell 에서 잠듦
+
+    for lba in range(5):
+        assert driver.run_ssd_write(str(lba), f"0x{lba:08X}") == SUCCESS
+    assert driver.run_ssd_read("4") == SUCCESS
+    assert driver.get_ssd_output() == "0x00000004"
+
+
+def test_server_restarted_after_exit(driver):
+    driver.run_ssd_write("0", "0x00000001")
+    pid = driver._channel.pid
+
+    driver._channel._proc.kill()
+    driver._channel._proc.wait()
+
+    assert driver.run_ssd_read("0") == SUCCESS
+    assert driver._channel.pid != pid
+    assert driver.get_ssd_output() == "0x00000001"  # 버퍼는 저널로 복구
+
+
+def test_config_change_restarts_server(driver, tmp_path, monkeypatch):
+    driver.run_ssd_write("0", "0x00000001")
+    pid = driver._channel.pid
+
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path / "other"))
+    os.makedirs(tmp_path / "other")
+    driver.run_ssd_read("0")
+
+    assert driver._channel.pid != pid
+    assert driver.get_ssd_output() == "0x00000000"
+
+
+def test_close_stops_server_and_frees_memory(driver, ring_env):
+    driver.run_ssd_write("0", "0x00000001")
+    ring = driver._channel
+
+    driver.close()
+
+    assert ring._proc.returncode == 0
+    assert (ring_env / "buffer" / "journal.log.clean").exists()
+    with pytest.raises(FileNotFoundError):
+        ssd_ring.shared_memory.SharedMemory(ring._shm.name)
+
+
+def test_shell_scripts(driver):
+    app = TestShellApp(driver)
+    app._is_runner = True
+
+    assert app.full_write_and_read_compare() == SUCCESS
+    assert app.partial_lba_write() == SUCCESS
+
+
+def test_create_ring_driver():
+    assert isinstance(create_ssd_driver("ring"), RingSSDDriver)
@@ -0,0 +1,130 @@
+import os
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import ssd_config
+from shell import TestShellApp
+from ssd_driver import SocketSSDDriver, SSDDriver, create_ssd_driver, SUCCESS, ERROR
+from ssd_server import send_frame, recv_frame, MAX_FRAME_SIZE
+
+SSD_PATH = str(Path(__file__).parent.parent / "ssd.py")
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain socket 필요")
+
+
+@pytest.fixture
+def daemon_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ssd_config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(ssd_config, "SOCKET_PATH", str(tmp_path / "ssd.sock"))
+    return ssd_config.as_env()
+
+
+@pytest.fixture
+def driver(daemon_env, tmp_path):
+    proc = subprocess.Popen([sys.executable, SSD_PATH, "serve"], env=daemon_env)
+    socket_path = tmp_path / "ssd.sock"
+    for _ in range(500):
+        # bind 와 listen 사이에는 socket 파일만 있고 접속은 안 되므로 실제로 접속해 봄
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex(str(socket_path)) == 0:
+                break
+        time.sleep(0.01)
+
+    driver = SocketSSDDriver(str(socket_path))
+    yield driver
+    driver.shutdown_server()
+    proc.wait(timeout=10)
+
+
+def test_frame_round_trip():
+    left, right = socket.socketpair()
+    send_frame(left, "W 3 0x00000001")
+    send_frame(left, "")
+
+    assert recv_frame(right) == "W 3 0x00000001"
+    assert recv_frame(right) == ""
+    left.close()
+    assert recv_frame(right) is None
+    right.close()
+
+
+def test_frame_limit_fits_full_range_read(monkeypatch):
+    monkeypatch.setattr(ssd_config, "LBA_COUNT", 200000)
+    response = "OK " + "\n".join(["0x00000000"] * 200000)
+    left, right = socket.socketpair()
+    sender = threading.Thread(target=send_frame, args=(left, response))
+    sender.start()
+
+    assert recv_frame(right) == response
+    sender.join()
+    left.close()
+    right.close()
+
+
+def test_bad_frame_drops_connection():
+    driver = SocketSSDDriver("unused.sock")
+    left, right = socket.socketpair()
+    driver._sock = left
+    right.sendall(struct.pack(">I", MAX_FRAME_SIZE * 64) + b"garbage")
+
+    assert driver.request("R", 0) is None
+    assert driver._sock is None  # 어긋난 스트림은 다시 쓰지 않음
+    right.close()
+
+
+def test_write_read_flush(driver, tmp_path):
+    assert driver.run_ssd_write("3", "0x0000ABCD") == SUCCESS
+    assert driver.run_ssd_read("3") == SUCCESS
+    assert driver.get_ssd_output() == "0x0000ABCD"  # 버퍼에서 fast read
+
+    assert driver.run_ssd_erase("3", "1") == SUCCESS
+    assert driver.run_ssd_flush() == SUCCESS
+    driver.run_ssd_read("3")
+    assert driver.get_ssd_output() == "0x00000000"
+
+
+def test_invalid_arguments_report_error(driver):
+    assert driver.run_ssd_write("100", "0x00000001") == SUCCESS  # CLI 와 같이 출력으로 ERROR
+    with pytest.raises(ValueError):
+        driver.get_ssd_output()
+
+    assert driver.run_cmd_to_ssd(["X", "1"]) == ERROR
+
+
+def test_buffer_survives_daemon_restart(daemon_env, driver, tmp_path):
+    driver.run_ssd_write("7", "0x12345678")
+    driver.shutdown_server()
+
+    subprocess.run([sys.executable, SSD_PATH, "R", "7"], env=daemon_env)
+    assert (tmp_path / "ssd_output.txt").read_text() == "0x12345678"
+
+
+def test_shell_with_socket_driver(driver):
+    app = TestShellApp(driver)
+
+    assert app.full_write("0xAAAABBBB") == SUCCESS
+    assert app._read_and_compare("99", "0xAAAABBBB")
+
+
+def test_stats_reports_durability(driver):
+    assert driver.request("STATS").startswith(f"OK durability={ssd_config.DURABILITY}")
+
+
+def test_unavailable_daemon(tmp_path):
+    driver = SocketSSDDriver(str(tmp_path / "missing.sock"))
+
+    assert driver.run_ssd_read("0") == ERROR
+
+
+def test_create_ssd_driver():
+    assert type(create_ssd_driver("subprocess")) is SSDDriver
+    assert isinstance(create_ssd_driver("socket"), SocketSSDDriver)
+    with pytest.raises(ValueError):
+        create_ssd_driver("carrier-pigeon")